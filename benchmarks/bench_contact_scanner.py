@@ -0,0 +1,58 @@
+"""
+Benchmark : repérage des coordonnées dans le texte d'une page
+
+Compare l'ancienne méthode (un re.findall par motif, 15 passages sur le
+texte) au scanner en un passage (modules.contact_scanner), et vérifie que
+les candidats sont identiques.
+
+Usage : python benchmarks/bench_contact_scanner.py [dossier_de_pages_html | --synthetique]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from benchmarks.corpus import corpus_args, load_pages
+from modules import contact_scanner
+
+
+def legacy(text):
+    return {(field, rule): pattern.findall(text)
+            for field, patterns in contact_scanner.PATTERNS.items()
+            for rule, pattern in enumerate(patterns)}
+
+
+def timed(func, text, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    corpus_dir, synthetic = corpus_args()
+    pages = load_pages(corpus_dir, count=30, synthetic=synthetic)
+    texts = [BeautifulSoup(html, 'html.parser').get_text() for _, html in pages]
+    total_kb = sum(len(text) for text in texts) / 1024
+    print(f"{len(texts)} pages, {total_kb:.0f} Ko de texte{' (pages synthétiques)' if synthetic else ''}")
+
+    for text in texts:
+        matches = contact_scanner.scan(text)
+        for (field, rule), values in legacy(text).items():
+            assert matches.values(field, rule) == values, (field, rule)
+
+    old = [timed(legacy, text) for text in texts]
+    new = [timed(contact_scanner.scan, text) for text in texts]
+    print(f"{'re.findall par motif (ancien)':32s} médiane {statistics.median(old):7.2f} ms/page  total {sum(old):8.1f} ms")
+    print(f"{'scanner en un passage':32s} médiane {statistics.median(new):7.2f} ms/page  total {sum(new):8.1f} ms"
+          f"  x{sum(old) / sum(new):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark : filtrage d'une grande liste d'URLs candidates
+
+Compare l'ancien filtrage de _is_relevant_website (recherche de chaque domaine
+de la liste noire et de chaque extension étrangère dans toute l'URL) au
+DomainFilter (nom d'hôte extrait une fois, recherche dans des ensembles), et
+compte les URLs sur lesquelles les deux méthodes divergent.
+
+Usage : python benchmarks/bench_domain_filter.py [fichier_d_urls] [nombre]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import WORDS
+from modules.domain_filter import BLACKLIST, FOREIGN_TLDS, DomainFilter
+
+LEGACY_BLACKLIST = [
+    'facebook.com', 'linkedin.com', 'twitter.com', 'instagram.com',
+    'youtube.com', 'google.com', 'wikipedia.org', 'pages-jaunes.fr',
+    'societe.com', 'verif.com', 'infogreffe.fr', 'company.com',
+    'glassdoor.com', 'indeed.com', 'jobijoba.com', 'monster.fr'
+]
+LEGACY_FOREIGN = ['.us', '.uk', '.de', '.es', '.it', '.ca', '.au', '.be', '.nl']
+
+
+def legacy_allows(url):
+    url_lower = url.lower()
+    for blocked in LEGACY_BLACKLIST:
+        if blocked in url_lower:
+            return False
+    for foreign in LEGACY_FOREIGN:
+        if foreign in url_lower:
+            return False
+    return True
+
+
+def synthetic_urls(count, seed=42):
+    rng = random.Random(seed)
+    tlds = ['fr'] * 6 + ['com'] * 3 + ['net', 'org', 'eu', 'de', 'be', 'co.uk', 'es']
+    paths = ['', '/', '/contact', '/about.us', '/fr/news.html', '/infos.be', '/blog/2024/article-detail.html']
+    urls = []
+    for _ in range(count):
+        if rng.random() < 0.15:
+            host = rng.choice(BLACKLIST)
+            host = rng.choice(['www.', 'fr.', '']) + host
+        else:
+            host = f"{rng.choice(['www.', ''])}{rng.choice(WORDS)}-{rng.choice(WORDS)}.{rng.choice(tlds)}"
+        urls.append(f"https://{host}{rng.choice(paths)}")
+    return urls
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 and os.path.exists(sys.argv[1]) else None
+    count = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 100000
+    if source:
+        with open(source, 'r', encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip()]
+    else:
+        urls = synthetic_urls(count)
+    print(f"{len(urls)} URLs candidates{'' if source else ' synthétiques'}")
+
+    domain_filter = DomainFilter(BLACKLIST, FOREIGN_TLDS)
+    legacy, legacy_ms = timed(lambda: [url for url in urls if legacy_allows(url)])
+    kept, filter_ms = timed(lambda: domain_filter.filter(urls))
+
+    print(f"{'sous-chaînes (ancien)':28s} {legacy_ms:8.1f} ms  {legacy_ms * 1000 / len(urls):6.2f} µs/URL  {len(legacy)} gardées")
+    print(f"{'DomainFilter':28s} {filter_ms:8.1f} ms  {filter_ms * 1000 / len(urls):6.2f} µs/URL  {len(kept)} gardées"
+          f"  x{legacy_ms / filter_ms:.1f}")
+
+    # Liste noire de 500 domaines : l'ancien coût croît avec la liste, pas celui des ensembles
+    extra = [f"annuaire-{i}.fr" for i in range(500 - len(LEGACY_BLACKLIST))]
+    LEGACY_BLACKLIST.extend(extra)
+    large_filter = DomainFilter(BLACKLIST + extra, FOREIGN_TLDS)
+    _, legacy_large_ms = timed(lambda: [url for url in urls if legacy_allows(url)])
+    _, large_ms = timed(lambda: large_filter.filter(urls))
+    del LEGACY_BLACKLIST[-len(extra):]
+    print(f"Liste noire de 500 domaines : ancien {legacy_large_ms:.1f} ms, DomainFilter {large_ms:.1f} ms"
+          f"  x{legacy_large_ms / large_ms:.1f}")
+
+    legacy_set, kept_set = set(legacy), set(kept)
+    recovered = [url for url in kept if url not in legacy_set]
+    dropped = [url for url in legacy if url not in kept_set]
+    print(f"Rejetées à tort par l'ancien filtre (chemin ou sous-chaîne) : {len(recovered)}, ex. {recovered[:3]}")
+    print(f"Rejetées en plus par DomainFilter : {len(dropped)}, ex. {dropped[:3]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark : score de pertinence d'une page (mots-clés)
+
+Compare l'ancienne méthode (un `in` par mot-clé sur toute la page en
+minuscules) au KeywordScorer en un passage (automate pyahocorasick si installé,
+sinon repli par sous-chaînes) et à la RelevanceCheck en flux (arrêt anticipé).
+
+Usage : python benchmarks/bench_keyword_scorer.py [dossier_de_pages_html | --synthetique]
+(par défaut les pages réelles de benchmarks/pages)
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import corpus_args, load_pages
+from modules import keyword_scorer
+from modules.keyword_scorer import KeywordScorer
+from modules.relevance import BUSINESS_INDICATORS, FOREIGN_INDICATORS, FRENCH_INDICATORS, RelevanceCheck
+
+COMPANY = "Entreprise Durand Menuiserie"
+
+
+def legacy(html):
+    """Méthode d'origine de _verify_website_relevance"""
+    html_lower = html.lower()
+    company_words = [word.lower() for word in COMPANY.split() if len(word) > 2]
+    return (
+        sum(1 for word in company_words if word in html_lower),
+        sum(1 for indicator in FRENCH_INDICATORS if indicator in html_lower),
+        sum(1 for indicator in BUSINESS_INDICATORS if indicator in html_lower),
+        any(indicator in html_lower for indicator in FOREIGN_INDICATORS),
+    )
+
+
+def scorer_for(backend):
+    def run(html):
+        scorer = KeywordScorer({
+            'company': [word for word in COMPANY.split() if len(word) > 2],
+            'french': FRENCH_INDICATORS,
+            'business': BUSINESS_INDICATORS,
+            'foreign': FOREIGN_INDICATORS,
+        }, backend=backend)
+        return scorer.counts(html)
+    return run
+
+
+def streaming(backend):
+    def run(html):
+        return RelevanceCheck('https://www.exemple.fr', COMPANY, strict=True, backend=backend).scan(html)
+    return run
+
+
+def bench(func, pages, repeat=5):
+    """Temps médian par page (ms)"""
+    timings = []
+    for _, html in pages:
+        best = min(_timed(func, html) for _ in range(repeat))
+        timings.append(best)
+    return statistics.median(timings) * 1000, sum(timings) * 1000
+
+
+def _timed(func, html):
+    start = time.perf_counter()
+    func(html)
+    return time.perf_counter() - start
+
+
+def main():
+    corpus_dir, synthetic = corpus_args()
+    pages = load_pages(corpus_dir, synthetic=synthetic)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"{len(pages)} pages ({total_kb:.0f} Ko){' synthétiques' if synthetic else ''}")
+
+    candidates = [('ancienne méthode (un `in` par mot-clé)', legacy),
+                  ('KeywordScorer substring', scorer_for('substring'))]
+    if keyword_scorer.ahocorasick is not None:
+        candidates.append(('KeywordScorer ahocorasick', scorer_for('ahocorasick')))
+    else:
+        print("pyahocorasick absent : backend automate non mesuré")
+    candidates.append(('RelevanceCheck en flux (auto)', streaming('auto')))
+
+    baseline = None
+    for label, func in candidates:
+        median_ms, total_ms = bench(func, pages)
+        baseline = baseline or total_ms
+        print(f"{label:45s} médiane {median_ms:7.3f} ms/page  total {total_ms:8.1f} ms  x{baseline / total_ms:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark : texte et requêtes CSS des extracteurs de coordonnées
+
+Avant le PageDocument, chacun des six extracteurs recalculait soup.get_text()
+et lançait ses requêtes CSS (jusqu'à 24 soup.select au total quand les motifs
+de texte échouent). Le PageDocument calcule le texte une fois et répond à
+ces mêmes sélecteurs depuis un index construit en un parcours de l'arbre.
+Les deux cas sont mesurés : motifs trouvés dans le texte (texte seul) et
+repli sur les balises (texte + sélecteurs).
+
+Usage : python benchmarks/bench_page_document.py [dossier_de_pages_html | --synthetique]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from benchmarks.corpus import corpus_args, load_pages
+from modules.page_document import PageDocument
+
+# Sélecteurs des anciens extracteurs : (itemprop, [class*=...], [id*=...])
+LOOKUPS = [
+    ('streetAddress', ('address', 'adresse'), ('address', 'adresse')),
+    ('postalCode', ('postal', 'cp'), ('postal',)),
+    ('addressLocality', ('city', 'ville'), ('city', 'ville')),
+    ('email', ('email',), ('email',)),
+    ('telephone', ('phone', 'tel'), ('phone', 'tel')),
+]
+SELECTORS = ['a[href^="mailto:"]', 'a[href^="tel:"]'] + [
+    selector
+    for itemprop, classes, ids in LOOKUPS
+    for selector in [f'[itemprop="{itemprop}"]'] + [f'[class*="{c}"]' for c in classes] + [f'[id*="{i}"]' for i in ids]
+]
+
+
+def legacy(soup, selectors):
+    for _ in range(6):
+        soup.get_text()
+    if selectors:
+        for selector in SELECTORS:
+            soup.select(selector)
+
+
+def shared(soup, selectors):
+    doc = PageDocument(soup)
+    doc.text
+    if selectors:
+        doc.mailto_links, doc.tel_links
+        for lookup in LOOKUPS:
+            doc.lookup(*lookup)
+
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    corpus_dir, synthetic = corpus_args()
+    pages = load_pages(corpus_dir, count=30, synthetic=synthetic)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"{len(pages)} pages ({total_kb:.0f} Ko){' synthétiques' if synthetic else ''}")
+
+    soups = [BeautifulSoup(html, 'html.parser') for _, html in pages]
+    for selectors, label in ((False, 'texte seul'), (True, 'texte + sélecteurs')):
+        old = [timed(lambda: legacy(soup, selectors)) for soup in soups]
+        new = [timed(lambda: shared(soup, selectors)) for soup in soups]
+        print(f"{label:20s} par extracteur {statistics.median(old):7.2f} ms/page, "
+              f"PageDocument {statistics.median(new):7.2f} ms/page  x{sum(old) / sum(new):.1f}  "
+              f"(économie {(sum(old) - sum(new)) / len(soups):.1f} ms/entreprise)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark : analyse partielle des pages (pied de page, contact, mentions
+légales, schema.org) contre l'arbre complet
+
+Pour chaque page : temps et pic mémoire (tracemalloc) de l'analyse complète
+html.parser (ancien comportement), de l'analyse partielle (RegionStrainer,
+lxml si installé) et du chemin réel de scrape_website_data (partiel, puis
+complet si les coordonnées sont incomplètes), taux de repli et concordance
+des champs extraits avec l'analyse complète.
+
+Usage : python benchmarks/bench_partial_parse.py [dossier_de_pages_html | --synthetique]
+"""
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import corpus_args, load_pages
+from modules.company_scraper import CompanyScraper
+from modules.page_document import PageDocument, parser_backend
+
+
+def measure(func):
+    """(ms, pic mémoire en Ko, résultat) ; le temps est mesuré sans tracemalloc, qui le fausse"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    corpus_dir, synthetic = corpus_args()
+    pages = load_pages(corpus_dir, count=30, synthetic=synthetic)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    parser = parser_backend('lxml')
+    print(f"{len(pages)} pages ({total_kb:.0f} Ko){' synthétiques' if synthetic else ''}, arbre partiel: {parser}")
+
+    # Extracteurs sans état : pas besoin de session ni de caches
+    scraper = CompanyScraper.__new__(CompanyScraper)
+
+    def full(html):
+        return scraper._extract_contact_data(PageDocument.parse(html))
+
+    def partial(html):
+        return scraper._extract_contact_data(PageDocument.parse_regions(html, parser))
+
+    def with_fallback(html):
+        data = partial(html)
+        return data if scraper._has_contact_block(data) else full(html)
+
+    rows = {'complet (html.parser)': [], 'partiel seul': [], 'partiel + repli': []}
+    fallbacks = agree = fields = 0
+    for _, html in pages:
+        full_ms, full_kb, full_data = measure(lambda: full(html))
+        part_ms, part_kb, part_data = measure(lambda: partial(html))
+        real_ms, real_kb, real_data = measure(lambda: with_fallback(html))
+        rows['complet (html.parser)'].append((full_ms, full_kb))
+        rows['partiel seul'].append((part_ms, part_kb))
+        rows['partiel + repli'].append((real_ms, real_kb))
+        fallbacks += not scraper._has_contact_block(part_data)
+        fields += len(full_data)
+        agree += sum(1 for key in full_data if full_data[key] == real_data[key])
+
+    for label, values in rows.items():
+        times = [value[0] for value in values]
+        peaks = [value[1] for value in values]
+        print(f"{label:24s} médiane {statistics.median(times):7.2f} ms/page  total {sum(times):8.1f} ms  "
+              f"pic mémoire médian {statistics.median(peaks):8.0f} Ko")
+    print(f"Repli sur l'analyse complète : {fallbacks}/{len(pages)} pages")
+    print(f"Champs identiques à l'analyse complète : {agree}/{fields}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark : extraction des résultats d'une page Bing
+
+Compare l'ancienne extraction (arbre BeautifulSoup html.parser de toute la
+page, parcours de chaque <a>) au parseur ciblé modules.serp_parser
+(blocs li.b_algo, lien du titre, dédoublonnage par domaine).
+
+Usage : python benchmarks/bench_serp_parser.py [dossier_de_pages_bing_html]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import load_bing_pages
+from modules import serp_parser
+
+
+def legacy(html):
+    """Ancienne méthode _extract_urls_from_bing_html"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    urls = []
+    for link in soup.find_all('a', href=True):
+        href = link.get('href')
+        if href and href.startswith('http') and 'bing.com' not in href and 'microsoft.com' not in href:
+            urls.append(href)
+    return urls
+
+
+def bench(func, pages, repeat=5):
+    timings = []
+    for _, html in pages:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(html)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+    return statistics.median(timings) * 1000, sum(timings) * 1000
+
+
+def main():
+    corpus_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    pages = load_bing_pages(corpus_dir)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"{len(pages)} pages Bing ({total_kb:.0f} Ko){'' if corpus_dir else ' synthétiques'}")
+
+    _, sample = pages[0]
+    print(f"Ancienne extraction : {len(legacy(sample))} liens, ex. {legacy(sample)[:2]}")
+    print(f"Parseur ciblé       : {len(serp_parser.extract_urls(sample))} résultats, "
+          f"ex. {serp_parser.extract_urls(sample)[:2]}")
+
+    baseline = None
+    for label, func in (('BeautifulSoup (toute la page)', legacy), ('serp_parser (li.b_algo)', serp_parser.extract_urls)):
+        median_ms, total_ms = bench(func, pages)
+        baseline = baseline or total_ms
+        print(f"{label:32s} médiane {median_ms:8.3f} ms/page  total {total_ms:8.1f} ms  x{baseline / total_ms:.1f}")
+
+
+if __name__ == '__main__':
+    main()
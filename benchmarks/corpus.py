@@ -0,0 +1,119 @@
+"""
+Pages de test des benchmarks
+Par défaut, les pages réelles enregistrées dans benchmarks/pages (voir
+SOURCES.md, complétées par benchmarks/fetch_pages.py) ; un autre dossier de
+pages *.html peut être passé en argument. Les pages synthétiques de taille
+réaliste ne sont générées qu'à la demande (--synthetique) : résultats
+indicatifs seulement
+"""
+
+import os
+import random
+import sys
+from typing import List, Optional, Tuple
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+WORDS = (
+    "notre entreprise accompagne ses clients depuis vingt ans dans la conception "
+    "et la réalisation de projets sur mesure artisan qualité devis gratuit "
+    "intervention rapide équipe expérimentée région atelier fabrication "
+    "installation rénovation maintenance conseil solutions professionnels "
+    "particuliers engagement satisfaction garantie"
+).split()
+
+
+def synthetic_homepage(rng: random.Random, company: str, size_kb: int) -> str:
+    """Page d'accueil factice : navigation, scripts, styles, contenu et pied de page légal"""
+    parts = [
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">',
+        f'<title>{company} - Accueil</title>',
+        '<style>' + '.c{margin:0;padding:0}' * 200 + '</style>',
+        '<script>' + 'var a=function(b){return b*2};' * 300 + '</script></head><body>',
+        '<nav><ul>' + ''.join(f'<li><a href="/{w}">{w.title()}</a></li>' for w in WORDS[:8]) + '</ul></nav>',
+    ]
+    while sum(len(p) for p in parts) < size_kb * 1024:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+        parts.append(f'<div class="c"><p>{sentence.capitalize()}.</p></div>')
+    parts.append(
+        f'<footer><a href="/mentions-legales">Mentions légales</a> {company} SAS - '
+        f'12 rue de la Paix 75002 Paris - Tél. 01 23 45 67 89 - SIRET 123 456 789 00012 - '
+        f'TVA FR12123456789</footer></body></html>'
+    )
+    return ''.join(parts)
+
+
+def corpus_args(argv: Optional[List[str]] = None) -> Tuple[Optional[str], bool]:
+    """Lit la ligne de commande d'un benchmark : (dossier de pages, pages synthétiques demandées)"""
+    argv = sys.argv[1:] if argv is None else argv
+    synthetic = '--synthetique' in argv
+    paths = [arg for arg in argv if arg != '--synthetique']
+    return (paths[0] if paths else None), synthetic
+
+
+def load_pages(corpus_dir: Optional[str] = None, count: int = 50, seed: int = 42,
+               synthetic: bool = False) -> List[Tuple[str, str]]:
+    """Retourne [(nom, html)] depuis un dossier (par défaut benchmarks/pages), ou des pages synthétiques"""
+    if not synthetic:
+        corpus_dir = corpus_dir or PAGES_DIR
+        pages = []
+        for name in sorted(os.listdir(corpus_dir)) if os.path.isdir(corpus_dir) else []:
+            if name.endswith(('.html', '.htm')):
+                with open(os.path.join(corpus_dir, name), 'r', encoding='utf-8', errors='replace') as f:
+                    pages.append((name, f.read()))
+        if not pages:
+            raise SystemExit(f"Aucune page .html dans {corpus_dir} (pages synthétiques : --synthetique)")
+        return pages
+
+    rng = random.Random(seed)
+    return [
+        (f"synthetique-{i}", synthetic_homepage(rng, f"Entreprise {i}", rng.choice([30, 80, 150, 400])))
+        for i in range(count)
+    ]
+
+
+def synthetic_bing_page(rng: random.Random, query: str, results: int = 10) -> str:
+    """Page de résultats Bing factice : en-tête, encarts, publicité, résultats naturels (liens /ck/a)"""
+    import base64
+    from urllib.parse import quote
+
+    def tracked(url: str) -> str:
+        encoded = base64.urlsafe_b64encode(url.encode()).decode().rstrip('=')
+        return f"https://www.bing.com/ck/a?!&amp;&amp;p={'ab12' * 30}&amp;ptn=3&amp;u=a1{encoded}&amp;ntb=1"
+
+    parts = [
+        f'<!DOCTYPE html><html lang="fr"><head><title>{query} - Recherche</title>',
+        '<style>' + '.b_algo h2{font-size:20px}' * 400 + '</style>',
+        '<script>' + '_G.lsUrl="/fd/ls/l?IG=1";var x=function(){return 1};' * 800 + '</script></head><body>',
+        '<header><nav>' + ''.join(
+            f'<a href="https://www.bing.com/{w}?q={quote(query)}">{w}</a>' for w in ('images', 'videos', 'maps', 'news')
+        ) + '<a href="https://www.microsoft.com/fr-fr/">Microsoft</a></nav></header><ol id="b_results">',
+        '<li class="b_ad"><ul><li><div class="b_title"><h2><a href="https://www.bing.com/aclk?ld=e8">Annonce</a></h2>'
+        '<a href="https://annonceur.example.com/promo">promo</a></div></li></ul></li>',
+    ]
+    for i in range(results):
+        domain = f"{rng.choice(WORDS)}-{i % 7}.{rng.choice(['fr', 'com', 'fr', 'net'])}"
+        url = f"https://www.{domain}/{rng.choice(WORDS)}"
+        parts.append(
+            f'<li class="b_algo" data-id="{i}"><div class="b_tpcn"><a class="tilk" href="{tracked(url)}">'
+            f'<div class="tpic"><img src="data:image/png;base64,{"iVBORw0KGgo" * 40}"></div></a></div>'
+            f'<h2><a href="{tracked(url)}" h="ID=SERP,{5000 + i}">{query} <strong>{domain}</strong></a></h2>'
+            f'<div class="b_caption"><p>' + ' '.join(rng.choice(WORDS) for _ in range(40)) + '</p>'
+            f'<div class="b_attribution"><cite>{url}</cite></div></div>'
+            f'<div class="b_deep"><a href="{tracked(url + "/contact")}">Contact</a></div></li>'
+        )
+    parts.append(
+        '<li class="b_ans"><div class="b_rs"><h2>Recherches associées</h2>' + ''.join(
+            f'<a href="https://www.bing.com/search?q={quote(query)}+{w}">{w}</a>' for w in WORDS[:8]
+        ) + '</div></li></ol><footer><a href="https://go.microsoft.com/fwlink/?LinkId=521839">Confidentialité</a>'
+        '<a href="https://support.microsoft.com/">Aide</a></footer></body></html>'
+    )
+    return ''.join(parts)
+
+
+def load_bing_pages(corpus_dir: Optional[str] = None, count: int = 30, seed: int = 42) -> List[Tuple[str, str]]:
+    """Pages de résultats Bing enregistrées (*.html), ou pages synthétiques"""
+    if corpus_dir:
+        return load_pages(corpus_dir)
+    rng = random.Random(seed)
+    return [(f"serp-{i}", synthetic_bing_page(rng, f"Entreprise {i} Paris")) for i in range(count)]
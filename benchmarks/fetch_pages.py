@@ -0,0 +1,55 @@
+"""
+Enregistre des pages d'accueil réelles pour les benchmarks
+
+Télécharge chaque URL (arguments, ou une URL par ligne dans un fichier) dans
+benchmarks/pages/<domaine>.html ; les benchmarks utilisent ensuite ces pages
+à la place des pages synthétiques.
+
+Usage : python benchmarks/fetch_pages.py https://www.exemple.fr [...]
+        python benchmarks/fetch_pages.py -f urls.txt
+"""
+
+import os
+import sys
+from urllib.parse import urlparse
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import PAGES_DIR
+from config import Config
+
+
+def read_urls(argv):
+    if argv[:1] == ['-f'] and len(argv) == 2:
+        with open(argv[1], 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return argv
+
+
+def main():
+    urls = read_urls(sys.argv[1:])
+    if not urls:
+        raise SystemExit(__doc__)
+
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    headers = {'User-Agent': Config().USER_AGENT}
+    for url in urls:
+        if not url.startswith('http'):
+            url = f"https://{url}"
+        try:
+            response = requests.get(url, headers=headers, timeout=15)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"❌ {url}: {str(e)}")
+            continue
+        host = urlparse(response.url).hostname or urlparse(url).hostname
+        path = os.path.join(PAGES_DIR, f"{host}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"✅ {url} -> {path} ({len(response.content) // 1024} Ko)")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,8 @@ Configuration du système de scrapping
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement depuis le fichier .env
@@ -16,6 +17,8 @@ class Config:
     AIRTABLE_BASE_ID: str = os.getenv('AIRTABLE_BASE_ID', '')
     AIRTABLE_TABLE_NAME: str = os.getenv('AIRTABLE_TABLE_NAME', 'Base Client Contact')
     AIRTABLE_VIEW_NAME: str = os.getenv('AIRTABLE_VIEW_NAME', 'Scrapping')
+    # Champ date/heure de la dernière vérification (ex: 'Dernière Vérif Solvabilité'), vide = non écrit
+    AIRTABLE_LAST_CHECK_FIELD: str = os.getenv('AIRTABLE_LAST_CHECK_FIELD', '')
     
     # Configuration OpenAI
     OPENAI_API_KEY: str = os.getenv('OPENAI_API_KEY', '')
@@ -33,6 +36,84 @@ class Config:
     MAX_RETRIES: int = 3
     TIMEOUT: int = 30
     MAX_COMPANIES: int = int(os.getenv('MAX_COMPANIES', '120'))  # Limite du nombre d'entreprises par exécution
+    CONCURRENT_COMPANIES: int = int(os.getenv('CONCURRENT_COMPANIES', '8'))  # Entreprises traitées en parallèle
+
+    # Pipeline par étapes ('staged') ou pool d'entreprises traitées de bout en bout ('pool')
+    PIPELINE_MODE: str = os.getenv('PIPELINE_MODE', 'staged')
+    WEB_WORKERS: int = int(os.getenv('WEB_WORKERS', '8'))  # Recherche web (Bing + sites d'entreprises)
+    LEGAL_WORKERS: int = int(os.getenv('LEGAL_WORKERS', '4'))  # APIs légales (recherche-entreprises, Pappers, INSEE)
+    SOLVABILITY_WORKERS: int = int(os.getenv('SOLVABILITY_WORKERS', '4'))  # BODACC, API gouv, InfoGreffe
+    AIRTABLE_WORKERS: int = int(os.getenv('AIRTABLE_WORKERS', '10'))  # Écritures Airtable en attente (regroupées par lots)
+    PIPELINE_REPORT_INTERVAL: float = float(os.getenv('PIPELINE_REPORT_INTERVAL', '30'))  # Secondes entre deux rapports des files
+
+    # Recherche des sites web (URLs directes, Bing, variantes du nom)
+    DIRECT_URL_CONCURRENCY: int = int(os.getenv('DIRECT_URL_CONCURRENCY', '3'))  # URLs directes testées en parallèle par entreprise
+    BING_CANDIDATE_CONCURRENCY: int = int(os.getenv('BING_CANDIDATE_CONCURRENCY', '3'))  # Résultats Bing testés en parallèle par entreprise
+    SEARCH_HEDGE_ENABLED: bool = os.getenv('SEARCH_HEDGE_ENABLED', 'true').lower() == 'true'  # Bing lancé pendant le test des URLs directes
+    SEARCH_HEDGE_DELAY: float = float(os.getenv('SEARCH_HEDGE_DELAY', '2'))  # Secondes avant de lancer Bing en parallèle
+    NAME_VARIANTS_TOP_K: int = int(os.getenv('NAME_VARIANTS_TOP_K', '2'))  # Variantes du nom testées quand le nom exact échoue
+    NAME_VARIANTS_WORDLIST: str = os.getenv('NAME_VARIANTS_WORDLIST', '')  # Fréquences de mots français (mot [occurrences] par ligne)
+
+    # Téléchargement et analyse des pages d'entreprises
+    PAGE_CACHE_MAX_MB: float = float(os.getenv('PAGE_CACHE_MAX_MB', '64'))  # Pages gardées en mémoire pendant une exécution
+    RELEVANCE_MAX_KB: int = int(os.getenv('RELEVANCE_MAX_KB', '256'))  # Lecture max d'une page pour juger sa pertinence
+    PAGE_MAX_KB: int = int(os.getenv('PAGE_MAX_KB', '2048'))  # Lecture max d'une page jugée pertinente
+    KEYWORD_BACKEND: str = os.getenv('KEYWORD_BACKEND', 'auto')  # 'ahocorasick' (pyahocorasick), 'substring' ou 'auto'
+    PARTIAL_PARSE: bool = os.getenv('PARTIAL_PARSE', 'true').lower() == 'true'  # N'analyser que pied de page / contact / mentions légales
+    PARTIAL_PARSE_MIN_CHARS: int = int(os.getenv('PARTIAL_PARSE_MIN_CHARS', '200'))  # Texte minimal des régions pour la raison sociale
+    HTML_PARSER: str = os.getenv('HTML_PARSER', 'lxml')  # Analyseur de l'arbre partiel ('lxml' ou 'html.parser')
+
+    # Écritures Airtable regroupées (jusqu'à 10 enregistrements par PATCH)
+    AIRTABLE_BATCH_WRITES: bool = os.getenv('AIRTABLE_BATCH_WRITES', 'true').lower() == 'true'
+    AIRTABLE_BATCH_SIZE: int = int(os.getenv('AIRTABLE_BATCH_SIZE', '10'))  # 10 maximum côté Airtable
+    AIRTABLE_BATCH_DELAY: float = float(os.getenv('AIRTABLE_BATCH_DELAY', '0.5'))  # Attente max avant envoi d'un lot incomplet
+
+    # Limites de débit par hôte : (requêtes/seconde, rafale). '*' = autres hôtes (sites d'entreprises)
+    RATE_LIMITS: Dict[str, Tuple[float, int]] = field(default_factory=lambda: {
+        'recherche-entreprises.api.gouv.fr': (6.0, 7),
+        'bodacc-datainfogreffe.opendatasoft.com': (2.0, 4),
+        'opendata.datainfogreffe.fr': (2.0, 4),
+        'api.pappers.fr': (1.0, 2),
+        'api.insee.fr': (0.5, 2),
+        'api.airtable.com': (5.0, 5),
+        'bing.com': (1.0, 2),
+        '*': (5.0, 5)
+    })
+    RATE_LIMITS_OVERRIDE: str = os.getenv('RATE_LIMITS', '')  # Ex: "bing.com=0.5:2,api.airtable.com=4:4"
+
+    # Pool de connexions HTTP partagé
+    HTTP_POOL_LIMIT: int = int(os.getenv('HTTP_POOL_LIMIT', '100'))  # Connexions simultanées au total
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10'))  # Connexions simultanées par hôte
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))  # Durée du cache DNS (secondes)
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))  # Durée de vie des connexions inactives
+
+    # Caches persistants (conservés d'une exécution à l'autre)
+    CACHE_DIR: str = os.getenv('CACHE_DIR', '.cache')
+    LEGAL_CACHE_ENABLED: bool = os.getenv('LEGAL_CACHE_ENABLED', 'true').lower() == 'true'
+    LEGAL_CACHE_TTL_DAYS: float = float(os.getenv('LEGAL_CACHE_TTL_DAYS', '30'))  # Résultats trouvés
+    LEGAL_CACHE_NEGATIVE_TTL_DAYS: float = float(os.getenv('LEGAL_CACHE_NEGATIVE_TTL_DAYS', '3'))  # Entreprises introuvables
+    LEGAL_CACHE_MAX_ENTRIES: int = int(os.getenv('LEGAL_CACHE_MAX_ENTRIES', '50000'))
+    HTTP_CACHE_ENABLED: bool = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'  # Pages des sites d'entreprises (ETag / Last-Modified)
+    HTTP_CACHE_MAX_MB: float = float(os.getenv('HTTP_CACHE_MAX_MB', '256'))  # Taille max des pages compressées stockées
+    SERP_CACHE_ENABLED: bool = os.getenv('SERP_CACHE_ENABLED', 'true').lower() == 'true'  # Résultats Bing par requête
+    SERP_CACHE_TTL_DAYS: float = float(os.getenv('SERP_CACHE_TTL_DAYS', '60'))
+    SERP_CACHE_NEGATIVE_TTL_DAYS: float = float(os.getenv('SERP_CACHE_NEGATIVE_TTL_DAYS', '7'))  # Requêtes sans résultat
+    SERP_CACHE_MAX_ENTRIES: int = int(os.getenv('SERP_CACHE_MAX_ENTRIES', '50000'))
+    RESOLUTION_STORE_ENABLED: bool = os.getenv('RESOLUTION_STORE_ENABLED', 'true').lower() == 'true'  # Entreprise -> site déjà trouvé
+    RESOLUTION_TTL_DAYS: float = float(os.getenv('RESOLUTION_TTL_DAYS', '180'))  # Oubli d'un site non revérifié depuis N jours
+    RESOLUTION_MIN_CONFIDENCE: float = float(os.getenv('RESOLUTION_MIN_CONFIDENCE', '0.5'))  # Les devinettes OpenAI (0.4) sont recherchées à nouveau
+    DNS_CACHE_ENABLED: bool = os.getenv('DNS_CACHE_ENABLED', 'true').lower() == 'true'
+    DNS_CACHE_TTL_HOURS: float = float(os.getenv('DNS_CACHE_TTL_HOURS', '24'))  # Domaines existants
+    DNS_NEGATIVE_TTL_HOURS: float = float(os.getenv('DNS_NEGATIVE_TTL_HOURS', '72'))  # Domaines inexistants (NXDOMAIN)
+    DNS_CACHE_MAX_ENTRIES: int = int(os.getenv('DNS_CACHE_MAX_ENTRIES', '100000'))
+    DNS_TIMEOUT: float = float(os.getenv('DNS_TIMEOUT', '2'))  # Au-delà, le domaine est testé normalement en HTTP
+
+    # Exécutions incrémentales : uniquement les enregistrements nouveaux, modifiés ou à revérifier
+    INCREMENTAL_RUNS: bool = os.getenv('INCREMENTAL_RUNS', 'false').lower() == 'true'
+    STALE_AFTER_DAYS: int = int(os.getenv('STALE_AFTER_DAYS', '30'))  # Revérifier la solvabilité tous les N jours (0 = jamais)
+
+    # Journal de progression (reprise après crash avec --resume <run-id>)
+    JOURNAL_KEEP: int = int(os.getenv('JOURNAL_KEEP', '10'))  # Nombre de journaux d'exécution conservés
     
     # User Agent pour les requêtes
     USER_AGENT: str = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36' 
\ No newline at end of file
@@ -7,8 +7,10 @@ Bot de scrapping complet - Version avec planification automatique et vérificati
 4. Planification automatique → Tous les jours à 10h heure de Paris
 """
 
+import argparse
 import asyncio
 import logging
+import os
 import schedule
 import time
 import threading
@@ -19,6 +21,11 @@ from modules.airtable_client import AirtableClient
 from modules.company_scraper import CompanyScraper
 from modules.api_legal_scraper import APILegalScraper
 from modules.solvability_checker import SolvabilityChecker
+from modules.pipeline import Pipeline, Stage, iterate
+from modules.http_client import close_http_pool
+from modules.dns_cache import get_dns_cache
+from modules.run_state import RunState, utc_now_iso
+from modules.run_journal import RunJournal
 
 def setup_logging():
     """Configure le système de logging"""
@@ -36,7 +43,352 @@ def get_paris_time():
     paris_tz = timezone('Europe/Paris')
     return datetime.now(paris_tz)
 
-async def run_scrapping():
+class CompanyProcessor:
+    """Étapes de traitement d'une entreprise (web → API légale → solvabilité → Airtable)
+
+    Chaque étape reçoit et retourne un dictionnaire « job » ; une étape qui
+    retourne None signifie qu'il n'y a plus rien à faire pour cette entreprise.
+    Les étapes peuvent être enchaînées directement (mode pool) ou réparties
+    dans un pipeline à files séparées (mode staged). Avec un journal, chaque
+    étape terminée est enregistrée et sautée lors d'une reprise.
+    """
+
+    def __init__(self, company_scraper, api_legal_scraper, solvability_checker, airtable_client,
+                 journal=None):
+        self.company_scraper = company_scraper
+        self.api_legal_scraper = api_legal_scraper
+        self.solvability_checker = solvability_checker
+        self.airtable_client = airtable_client
+        self.journal = journal
+        self.logger = logging.getLogger(__name__)
+
+    def new_job(self, company, index, total):
+        """Prépare le job d'une entreprise"""
+        company_name = company.get('name', 'Nom non défini')
+        job = {
+            'index': index,
+            'total': total,
+            'name': company_name,
+            'record_id': company.get('id'),
+            'start_time': None,
+            'website_data': {},
+            'official_name': company_name,
+            'legal_data': {},
+            'solvability_data': {},
+            'done_stages': set()
+        }
+        
+        # Reprise : restaurer les résultats des étapes déjà journalisées
+        if self.journal:
+            for stage, data in self.journal.completed_stages(job['record_id']).items():
+                job['done_stages'].add(stage)
+                job.update(data)
+        return job
+
+    def checkpoint(self, job, stage, data=None):
+        """Enregistre la fin d'une étape dans le journal"""
+        job['done_stages'].add(stage)
+        if self.journal:
+            self.journal.record_stage(job['record_id'], stage, data)
+
+    def finish(self, job):
+        """Marque l'entreprise comme entièrement traitée dans le journal"""
+        if self.journal:
+            self.journal.record_done(job['record_id'])
+
+    async def process(self, company, index, total):
+        """Traite une entreprise de bout en bout
+
+        Les erreurs sont isolées : une exception ne stoppe jamais le traitement
+        des autres entreprises.
+        """
+        job = self.new_job(company, index, total)
+        try:
+            for step in (self.web_step, self.legal_step, self.solvability_step, self.airtable_step):
+                job = await step(job)
+                if job is None:
+                    break
+        except Exception as e:
+            self.on_error('process', job, e)
+
+    def on_error(self, stage_name, job, error):
+        """Journalise une erreur critique sans interrompre les autres entreprises"""
+        company_name = job.get('name') if isinstance(job, dict) else job
+        self.logger.error(f"❌ Erreur critique pour {company_name}: {str(error)}")
+        self.say(job, f"❌ Erreur critique: {str(error)}")
+
+    def say(self, job, message):
+        """Affiche un message préfixé par l'entreprise (plusieurs sont traitées en même temps)"""
+        if isinstance(job, dict):
+            progress = f"{job['index']}/{job['total']}" if job['total'] else job['index']
+            print(f"[{progress}] {job['name']}: {message}")
+        else:
+            print(f"{job}: {message}")
+
+    async def web_step(self, job):
+        """ÉTAPE 1: Scrapping web pour trouver la raison sociale"""
+        company_name = job['name']
+        
+        self.logger.info(f"🏢 Traitement de: {company_name}")
+        self.say(job, f"🏢 Début du traitement (ID: {job['record_id']})")
+        
+        # Timeout global par entreprise (3 minutes max)
+        job['start_time'] = asyncio.get_event_loop().time()
+        
+        if 'web' in job['done_stages']:
+            self.say(job, "⏭️ ÉTAPE 1 déjà effectuée (reprise)")
+            return job
+        
+        self.say(job, "🌐 ÉTAPE 1: Scrapping web...")
+        
+        try:
+            # Timeout optimisé pour le scrapping web (1 minute max)
+            website_data = await asyncio.wait_for(
+                self.company_scraper.scrape_company_website(company_name, record_id=job['record_id']),
+                timeout=60  # 1 minute
+            )
+        except asyncio.TimeoutError:
+            self.say(job, "⏰ Timeout scrapping web - Passage à l'étape suivante...")
+            website_data = {'error': 'Timeout scrapping web'}
+        except Exception as e:
+            self.say(job, f"❌ Erreur scrapping web: {str(e)}")
+            website_data = {'error': str(e)}
+        
+        # Déterminer le nom à utiliser pour l'API légale
+        if website_data and not website_data.get('error'):
+            self.say(job, f"✅ Données web récupérées: {website_data}")
+            
+            # Extraire la raison sociale officielle
+            official_name = website_data.get('raison_sociale', company_name)
+            if official_name != company_name:
+                self.say(job, f"🎯 Raison sociale officielle trouvée: {official_name}")
+            else:
+                self.say(job, "⚠️ Raison sociale identique au nom commercial")
+        else:
+            self.say(job, f"⚠️ Scrapping web échoué: {website_data.get('error', 'Erreur inconnue')}")
+            self.say(job, "🔄 FALLBACK: Utilisation du nom commercial pour l'API légale")
+            website_data = {}  # Pas de données web
+            official_name = company_name  # Utiliser le nom commercial
+        
+        job['website_data'] = website_data
+        job['official_name'] = official_name
+        self.checkpoint(job, 'web', {'website_data': website_data, 'official_name': official_name})
+        return job
+
+    async def legal_step(self, job):
+        """ÉTAPE 2: Scrapping API légale avec le nom déterminé"""
+        company_name = job['name']
+        official_name = job['official_name']
+        
+        if 'legal' in job['done_stages']:
+            self.say(job, "⏭️ ÉTAPE 2 déjà effectuée (reprise)")
+            return job
+        
+        self.say(job, f"🏛️ ÉTAPE 2: Scrapping API légale avec: {official_name}")
+        
+        try:
+            # Timeout pour l'API légale (1 minute max)
+            legal_data = await asyncio.wait_for(
+                self.api_legal_scraper.scrape_legal_info(official_name),
+                timeout=60  # 1 minute
+            )
+        except asyncio.TimeoutError:
+            self.say(job, "⏰ Timeout API légale - Passage à l'étape suivante...")
+            legal_data = {'error': 'Timeout API légale'}
+        except Exception as e:
+            self.say(job, f"❌ Erreur API légale: {str(e)}")
+            legal_data = {'error': str(e)}
+        
+        if legal_data and not legal_data.get('error'):
+            self.say(job, f"✅ Données légales récupérées: {legal_data}")
+        else:
+            self.say(job, f"❌ Erreur API légale: {legal_data}")
+            self.logger.error(f"❌ Erreur API légale pour {company_name}: {legal_data}")
+            
+            # Même si l'API légale échoue, sauver les données web si disponibles
+            # et essayer quand même la vérification de solvabilité avec le nom
+            if not job['website_data']:
+                self.say(job, "❌ Aucune donnée à sauvegarder")
+                self.finish(job)
+                return None
+            self.say(job, "🔄 Sauvegarde des données web et tentative de vérification solvabilité...")
+        
+        job['legal_data'] = legal_data
+        self.checkpoint(job, 'legal', {'legal_data': legal_data})
+        return job
+
+    async def solvability_step(self, job):
+        """ÉTAPE 3: Vérification de solvabilité"""
+        company_name = job['name']
+        legal_data = job['legal_data']
+        website_data = job['website_data']
+        
+        if 'solvability' in job['done_stages']:
+            self.say(job, "⏭️ ÉTAPE 3 déjà effectuée (reprise)")
+            return job
+        
+        if legal_data and not legal_data.get('error'):
+            self.say(job, "🏦 ÉTAPE 3: Vérification de solvabilité...")
+            # Préparer les données pour la vérification
+            company_data_for_check = {
+                'siren': legal_data.get('siren'),
+                'siret': legal_data.get('siret'),
+                'raison_sociale': legal_data.get('raison_sociale'),
+                'name': company_name
+            }
+            
+            try:
+                # Timeout pour la solvabilité (2 minutes max)
+                solvability_data = await asyncio.wait_for(
+                    self.solvability_checker.check_company_solvability(company_data_for_check),
+                    timeout=120  # 2 minutes
+                )
+            except asyncio.TimeoutError:
+                self.say(job, "⏰ Timeout vérification solvabilité - Données partielles sauvegardées...")
+                solvability_data = {
+                    'error': 'Timeout vérification solvabilité',
+                    'is_solvent': None,
+                    'status': 'unknown',
+                    'risk_level': 'unknown'
+                }
+            except Exception as e:
+                self.say(job, f"❌ Erreur solvabilité: {str(e)}")
+                solvability_data = {'error': str(e)}
+            
+            if solvability_data and not solvability_data.get('error'):
+                self.say(job, f"✅ Solvabilité vérifiée: {self.solvability_checker.get_solvability_summary(solvability_data)}")
+                self.say(job, f"📊 Détails: {solvability_data.get('details', [])}")
+            else:
+                self.say(job, f"⚠️ Vérification solvabilité échouée: {solvability_data.get('error', 'Erreur inconnue')}")
+                if not solvability_data:
+                    solvability_data = {}  # Pas de données de solvabilité
+        else:
+            # Essayer la vérification de solvabilité avec les données web disponibles
+            company_data_for_check = {
+                'siren': None,  # Pas de SIREN disponible
+                'siret': None,  # Pas de SIRET disponible
+                'raison_sociale': website_data.get('raison_sociale'),
+                'name': company_name
+            }
+            
+            try:
+                solvability_data = await asyncio.wait_for(
+                    self.solvability_checker.check_company_solvability(company_data_for_check),
+                    timeout=120  # 2 minutes
+                )
+            except asyncio.TimeoutError:
+                self.say(job, "⏰ Timeout vérification solvabilité (mode dégradé)...")
+                solvability_data = {}
+            except Exception as e:
+                self.say(job, f"❌ Erreur solvabilité: {str(e)}")
+                solvability_data = {}
+            
+            if solvability_data and not solvability_data.get('error'):
+                self.say(job, f"✅ Solvabilité vérifiée (mode dégradé): {self.solvability_checker.get_solvability_summary(solvability_data)}")
+            else:
+                self.say(job, f"⚠️ Vérification solvabilité échouée: {solvability_data.get('error', 'Erreur inconnue')}")
+                solvability_data = {}
+        
+        job['solvability_data'] = solvability_data
+        self.checkpoint(job, 'solvability', {'solvability_data': solvability_data})
+        return job
+
+    async def airtable_step(self, job):
+        """ÉTAPE 4: Mise à jour Airtable avec toutes les données"""
+        company_name = job['name']
+        legal_data = job['legal_data']
+        
+        if legal_data and not legal_data.get('error'):
+            self.say(job, "💾 ÉTAPE 4: Mise à jour Airtable...")
+            written = await self.airtable_client.update_company_data(job['record_id'], {
+                'legal_data': legal_data,
+                'website_data': job['website_data'],  # Peut être vide si échec web
+                'solvability_data': job['solvability_data']
+            })
+            if written:
+                self.say(job, "✅ Mise à jour Airtable réussie")
+                self.logger.info(f"✅ Entreprise {company_name} traitée avec succès")
+        else:
+            written = await self.airtable_client.update_company_data(job['record_id'], {
+                'legal_data': {},
+                'website_data': job['website_data'],
+                'solvability_data': job['solvability_data']
+            })
+            if written:
+                self.say(job, "✅ Données web et solvabilité sauvegardées")
+        
+        if written:
+            self.checkpoint(job, 'written')
+            self.finish(job)
+        else:
+            # Non journalisé : l'écriture sera retentée par une reprise
+            self.say(job, "❌ Échec de la mise à jour Airtable")
+        
+        # Vérifier le temps total écoulé
+        max_time_per_company = 180  # 3 minutes
+        elapsed_time = asyncio.get_event_loop().time() - job['start_time']
+        if elapsed_time > max_time_per_company:
+            self.say(job, f"⏰ Temps maximum dépassé ({elapsed_time:.1f}s)")
+        return job
+
+async def run_worker_pool(processor, companies, config):
+    """Mode pool : N entreprises traitées en parallèle, chacune de bout en bout"""
+    logger = logging.getLogger(__name__)
+    total = len(companies) if isinstance(companies, list) else None
+    concurrency = max(1, min(config.CONCURRENT_COMPANIES, total or config.CONCURRENT_COMPANIES))
+    print(f"⚡ Traitement parallèle: {concurrency} entreprise(s) à la fois")
+    logger.info(f"⚡ Pool de {concurrency} workers")
+    
+    # File bornée : les pages Airtable ne sont lues qu'au rythme des workers
+    queue = asyncio.Queue(maxsize=2 * concurrency)
+    
+    async def feed():
+        i = 0
+        async for company in iterate(companies):
+            i += 1
+            await queue.put((i, company))
+        for _ in range(concurrency):
+            await queue.put(None)
+    
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            i, company = item
+            await processor.process(company, i, total)
+    
+    await asyncio.gather(feed(), *(worker() for _ in range(concurrency)))
+
+async def run_staged_pipeline(processor, companies, config):
+    """Mode staged : une file et un nombre de workers par étape
+
+    Une recherche web lente ne bloque plus les appels aux APIs légales
+    des entreprises déjà résolues.
+    """
+    logger = logging.getLogger(__name__)
+    pipeline = Pipeline([
+        Stage('web', processor.web_step, workers=config.WEB_WORKERS),
+        Stage('legal', processor.legal_step, workers=config.LEGAL_WORKERS),
+        Stage('solvabilite', processor.solvability_step, workers=config.SOLVABILITY_WORKERS),
+        Stage('airtable', processor.airtable_step, workers=config.AIRTABLE_WORKERS),
+    ], on_error=processor.on_error, report_interval=config.PIPELINE_REPORT_INTERVAL)
+    
+    workers = ", ".join(f"{stage.name}={stage.workers}" for stage in pipeline.stages)
+    print(f"⚡ Pipeline par étapes: {workers}")
+    logger.info(f"⚡ Pipeline par étapes ({workers})")
+    
+    total = len(companies) if isinstance(companies, list) else None
+    
+    async def jobs():
+        i = 0
+        async for company in iterate(companies):
+            i += 1
+            yield processor.new_job(company, i, total)
+    
+    await pipeline.run(jobs())
+
+async def run_scrapping(resume_run_id=None):
     """Fonction principale du scrappeur"""
     logger = logging.getLogger(__name__)
     paris_time = get_paris_time()
@@ -53,13 +405,64 @@ async def run_scrapping():
         airtable_client = AirtableClient()
         print("✅ Connexion Airtable OK")
         
-        # Récupération des entreprises
-        print("📥 Récupération des entreprises depuis Airtable...")
-        companies = await airtable_client.get_companies()
-        print(f"✅ {len(companies)} entreprises récupérées")
+        journal_dir = os.path.join(config.CACHE_DIR, 'journal')
+        run_state = None
+        
+        if resume_run_id:
+            # Reprise : les entreprises incomplètes viennent du journal, pas d'Airtable
+            if resume_run_id == 'latest':
+                resume_run_id = RunJournal.latest_run_id(journal_dir)
+            journal = RunJournal(journal_dir, resume_run_id)
+            if not resume_run_id or not journal.exists():
+                print(f"❌ Journal d'exécution introuvable: {resume_run_id}")
+                logger.error(f"❌ Journal d'exécution introuvable: {resume_run_id}")
+                return
+            journal.load()
+            companies = journal.pending_companies()
+            run_started_at = journal.meta.get('started_at') or utc_now_iso()
+            if journal.meta.get('incremental'):
+                run_state = RunState(os.path.join(config.CACHE_DIR, 'run_state.json'))
+            # Liste incomplète (crash pendant la pagination) : le high-water mark ne doit pas avancer
+            fetch_complete = bool(journal.meta.get('fetch_complete'))
+            if not fetch_complete:
+                print("⚠️ Récupération Airtable interrompue dans l'exécution d'origine : high-water mark conservé")
+                logger.warning(f"⚠️ Journal {journal.run_id} sans fin de récupération Airtable, high-water mark conservé")
+            print(f"♻️ Reprise de l'exécution {journal.run_id}: {len(companies)}/{len(journal.records)} entreprises restantes")
+            logger.info(f"♻️ Reprise de l'exécution {journal.run_id}: {len(companies)} entreprises restantes")
+        else:
+            # Récupération des entreprises (toutes, ou seulement les nouvelles/modifiées/à revérifier)
+            print("📥 Récupération des entreprises depuis Airtable...")
+            filter_formula = None
+            run_started_at = utc_now_iso()
+            if config.INCREMENTAL_RUNS:
+                run_state = RunState(os.path.join(config.CACHE_DIR, 'run_state.json'))
+                since = run_state.get('high_water_mark')
+                filter_formula = airtable_client.build_incremental_formula(since, config.STALE_AFTER_DAYS)
+                if filter_formula:
+                    print(f"🔁 Mode incrémental: modifications depuis {since}, revérification après {config.STALE_AFTER_DAYS} jours")
+                    logger.info(f"🔁 Formule incrémentale: {filter_formula}")
+                else:
+                    print("🔁 Mode incrémental: première exécution, traitement complet")
+                    logger.warning(f"⚠️ Aucun high-water mark dans {run_state.path} : traitement complet")
+            
+            # Journal de progression de cette exécution
+            RunJournal.prune(journal_dir, config.JOURNAL_KEEP - 1)
+            journal = RunJournal(journal_dir)
+            journal.start(started_at=run_started_at, incremental=config.INCREMENTAL_RUNS)
+            print(f"📓 Journal d'exécution {journal.run_id} (reprise: python main.py --resume {journal.run_id})")
+            
+            # Les entreprises arrivent page par page : le traitement démarre dès la première
+            async def stream_companies():
+                async for company in airtable_client.iter_companies(filter_formula=filter_formula):
+                    journal.add_company(company, len(journal.records) + 1)
+                    yield company
+                if airtable_client.last_fetch_complete:
+                    journal.record_fetch_complete()
+            companies = stream_companies()
+            fetch_complete = False
         
         # Traiter toutes les entreprises sans limite
-        logger.info(f"🎯 Traitement de {len(companies)} entreprises (toutes les entreprises disponibles)")
+        logger.info("🎯 Traitement de toutes les entreprises disponibles")
         
         # Initialisation des scrappeurs
         print("⚙️ Initialisation des scrappeurs...")
@@ -68,182 +471,41 @@ async def run_scrapping():
         solvability_checker = SolvabilityChecker()
         print("✅ Scrappeurs initialisés")
         
-        # Traitement des entreprises
-        for i, company in enumerate(companies, 1):
-            print(f"\n📋 === Entreprise {i}/{len(companies)} ===")
-            
-            company_name = company.get('name', 'Nom non défini')
-            record_id = company.get('id')
-            
-            logger.info(f"🏢 Traitement de: {company_name}")
-            print(f"🏢 Entreprise: {company_name}")
-            print(f"🆔 ID: {record_id}")
-            
-            try:
-                # Timeout global par entreprise (3 minutes max)
-                start_time = asyncio.get_event_loop().time()
-                max_time_per_company = 180  # 3 minutes
-                
-                # ÉTAPE 1: Scrapping web pour trouver la raison sociale
-                print("🌐 ÉTAPE 1: Scrapping web...")
-                
-                try:
-                    # Timeout optimisé pour le scrapping web (1 minute max)
-                    website_data = await asyncio.wait_for(
-                        company_scraper.scrape_company_website(company_name),
-                        timeout=60  # 1 minute
-                    )
-                except asyncio.TimeoutError:
-                    print("⏰ Timeout scrapping web - Passage à l'étape suivante...")
-                    website_data = {'error': 'Timeout scrapping web'}
-                except Exception as e:
-                    print(f"❌ Erreur scrapping web: {str(e)}")
-                    website_data = {'error': str(e)}
-                
-                # Déterminer le nom à utiliser pour l'API légale
-                if website_data and not website_data.get('error'):
-                    print(f"✅ Données web récupérées: {website_data}")
-                    
-                    # Extraire la raison sociale officielle
-                    official_name = website_data.get('raison_sociale', company_name)
-                    if official_name != company_name:
-                        print(f"🎯 Raison sociale officielle trouvée: {official_name}")
-                    else:
-                        print(f"⚠️ Raison sociale identique au nom commercial")
-                else:
-                    print(f"⚠️ Scrapping web échoué: {website_data.get('error', 'Erreur inconnue')}")
-                    print("🔄 FALLBACK: Utilisation du nom commercial pour l'API légale")
-                    website_data = {}  # Pas de données web
-                    official_name = company_name  # Utiliser le nom commercial
-                    
-                # ÉTAPE 2: Scrapping API légale avec le nom déterminé
-                print(f"🏛️ ÉTAPE 2: Scrapping API légale avec: {official_name}")
-                
-                try:
-                    # Timeout pour l'API légale (1 minute max)
-                    legal_data = await asyncio.wait_for(
-                        api_legal_scraper.scrape_legal_info(official_name),
-                        timeout=60  # 1 minute
-                    )
-                except asyncio.TimeoutError:
-                    print("⏰ Timeout API légale - Passage à l'étape suivante...")
-                    legal_data = {'error': 'Timeout API légale'}
-                except Exception as e:
-                    print(f"❌ Erreur API légale: {str(e)}")
-                    legal_data = {'error': str(e)}
-                
-                if legal_data and not legal_data.get('error'):
-                    print(f"✅ Données légales récupérées: {legal_data}")
-                    
-                    # ÉTAPE 3: Vérification de solvabilité
-                    print("🏦 ÉTAPE 3: Vérification de solvabilité...")
-                    # Préparer les données pour la vérification
-                    company_data_for_check = {
-                        'siren': legal_data.get('siren'),
-                        'siret': legal_data.get('siret'),
-                        'raison_sociale': legal_data.get('raison_sociale'),
-                        'name': company_name
-                    }
-                    
-                    try:
-                        # Timeout pour la solvabilité (2 minutes max)
-                        solvability_data = await asyncio.wait_for(
-                            solvability_checker.check_company_solvability(company_data_for_check),
-                            timeout=120  # 2 minutes
-                        )
-                    except asyncio.TimeoutError:
-                        print("⏰ Timeout vérification solvabilité - Données partielles sauvegardées...")
-                        solvability_data = {
-                            'error': 'Timeout vérification solvabilité',
-                            'is_solvent': None,
-                            'status': 'unknown',
-                            'risk_level': 'unknown'
-                        }
-                    except Exception as e:
-                        print(f"❌ Erreur solvabilité: {str(e)}")
-                        solvability_data = {'error': str(e)}
-                    
-                    if solvability_data and not solvability_data.get('error'):
-                        print(f"✅ Solvabilité vérifiée: {solvability_checker.get_solvability_summary(solvability_data)}")
-                        print(f"📊 Détails: {solvability_data.get('details', [])}")
-                    else:
-                        print(f"⚠️ Vérification solvabilité échouée: {solvability_data.get('error', 'Erreur inconnue')}")
-                        if not solvability_data:
-                            solvability_data = {}  # Pas de données de solvabilité
-                    
-                    # ÉTAPE 4: Mise à jour Airtable avec toutes les données
-                    print("💾 ÉTAPE 4: Mise à jour Airtable...")
-                    await airtable_client.update_company_data(record_id, {
-                        'legal_data': legal_data,
-                        'website_data': website_data,  # Peut être vide si échec web
-                        'solvability_data': solvability_data
-                    })
-                    print(f"✅ Mise à jour Airtable réussie")
-                    
-                    logger.info(f"✅ Entreprise {company_name} traitée avec succès")
-                else:
-                    print(f"❌ Erreur API légale: {legal_data}")
-                    logger.error(f"❌ Erreur API légale pour {company_name}: {legal_data}")
-                    
-                    # Même si l'API légale échoue, sauver les données web si disponibles
-                    # et essayer quand même la vérification de solvabilité avec le nom
-                    if website_data and not website_data.get('error'):
-                        print("🔄 Sauvegarde des données web et tentative de vérification solvabilité...")
-                        
-                        # Essayer la vérification de solvabilité avec les données disponibles
-                        company_data_for_check = {
-                            'siren': None,  # Pas de SIREN disponible
-                            'siret': None,  # Pas de SIRET disponible
-                            'raison_sociale': website_data.get('raison_sociale'),
-                            'name': company_name
-                        }
-                        
-                        try:
-                            solvability_data = await asyncio.wait_for(
-                                solvability_checker.check_company_solvability(company_data_for_check),
-                                timeout=120  # 2 minutes
-                            )
-                        except asyncio.TimeoutError:
-                            print("⏰ Timeout vérification solvabilité (mode dégradé)...")
-                            solvability_data = {}
-                        except Exception as e:
-                            print(f"❌ Erreur solvabilité: {str(e)}")
-                            solvability_data = {}
-                        
-                        if solvability_data and not solvability_data.get('error'):
-                            print(f"✅ Solvabilité vérifiée (mode dégradé): {solvability_checker.get_solvability_summary(solvability_data)}")
-                        else:
-                            print(f"⚠️ Vérification solvabilité échouée: {solvability_data.get('error', 'Erreur inconnue')}")
-                            solvability_data = {}
-                        
-                        await airtable_client.update_company_data(record_id, {
-                            'legal_data': {},
-                            'website_data': website_data,
-                            'solvability_data': solvability_data
-                        })
-                        print("✅ Données web et solvabilité sauvegardées")
-                    else:
-                        print("❌ Aucune donnée à sauvegarder")
-                
-                # Vérifier le temps total écoulé
-                elapsed_time = asyncio.get_event_loop().time() - start_time
-                if elapsed_time > max_time_per_company:
-                    print(f"⏰ Temps maximum dépassé pour {company_name} ({elapsed_time:.1f}s)")
-                
-            except Exception as e:
-                logger.error(f"❌ Erreur critique pour {company_name}: {str(e)}")
-                print(f"❌ Erreur critique pour {company_name}: {str(e)}")
-                # Continuer avec l'entreprise suivante
-                continue
-            
-            # Pause minimale entre les entreprises
-            await asyncio.sleep(1)
+        processor = CompanyProcessor(company_scraper, api_legal_scraper, solvability_checker, airtable_client,
+                                     journal=journal)
+        
+        # Traitement des entreprises en parallèle
+        if config.PIPELINE_MODE == 'staged':
+            await run_staged_pipeline(processor, companies, config)
+        else:
+            await run_worker_pool(processor, companies, config)
+        
+        if not resume_run_id:
+            fetch_complete = airtable_client.last_fetch_complete
+            print(f"✅ {len(journal.records)} entreprises récupérées depuis Airtable")
+        
+        if api_legal_scraper.cache:
+            logger.info(f"💾 Cache légal: {api_legal_scraper.cache.stats()}")
+        logger.info(f"🌐 Cache DNS: {get_dns_cache().stats()}")
+        logger.info(f"📄 Cache des pages: {company_scraper.page_cache.stats()}")
+        logger.info(f"🏁 Stratégies de recherche: {company_scraper.web_searcher.stats()}")
+        if company_scraper.resolutions:
+            logger.info(f"♻️ Sites déjà résolus: {company_scraper.resolutions.stats()}")
+        
+        # Avancer le high-water mark seulement après une exécution complète
+        if run_state and journal.records and fetch_complete:
+            run_state.set('high_water_mark', run_started_at)
+            logger.info(f"🔁 High-water mark mis à jour: {run_started_at}")
+        
+        journal.finish()
+        journal.close()
         
         # Fermer les sessions
         print("\n🔧 Fermeture des sessions...")
         await company_scraper.close_session()
         await api_legal_scraper.close_session()
         await solvability_checker.close_session()
+        await airtable_client.close_session()
         print("✅ Sessions fermées")
         
         end_time = get_paris_time()
@@ -255,11 +517,14 @@ async def run_scrapping():
         print(f"❌ Erreur critique: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Libérer le pool de connexions partagé de cette exécution
+        await close_http_pool()
 
-def job_wrapper():
+def job_wrapper(resume_run_id=None):
     """Wrapper pour exécuter la fonction async dans le scheduler"""
     print(f"\n🕙 Début de l'exécution planifiée - {get_paris_time().strftime('%Y-%m-%d %H:%M:%S')} (Paris)")
-    asyncio.run(run_scrapping())
+    asyncio.run(run_scrapping(resume_run_id))
 
 def run_scheduler():
     """Exécute le scheduler dans un thread séparé"""
@@ -269,6 +534,13 @@ def run_scheduler():
 
 def main():
     """Fonction principale avec planification"""
+    parser = argparse.ArgumentParser(description="Scrappeur complet avec vérification de solvabilité")
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help="Reprendre une exécution interrompue depuis son journal ('latest' pour la dernière)")
+    parser.add_argument('--once', action='store_true',
+                        help="Une seule exécution puis arrêt, sans planification (CI, cron)")
+    args = parser.parse_args()
+    
     print("=== SCRAPPEUR COMPLET - VERSION PLANIFIÉE AVEC SOLVABILITÉ ===")
     print("🕙 Planification: Tous les jours à 10h00 (heure de Paris)")
     print("📊 Traitement: Toutes les entreprises disponibles")
@@ -278,6 +550,13 @@ def main():
     setup_logging()
     logger = logging.getLogger(__name__)
     
+    if args.once:
+        # Exécution unique : le processus se termine (les caches sont sauvegardés par la CI)
+        print("🚀 Exécution unique (--once)")
+        job_wrapper(args.resume)
+        logger.info("🏁 Exécution unique terminée")
+        return
+    
     # Planifier la tâche pour 10h00 heure de Paris
     schedule.every().day.at("10:00").do(job_wrapper)
     
@@ -300,7 +579,7 @@ def main():
     try:
         # Exécution immédiate
         print("\n🚀 Exécution immédiate en cours...")
-        job_wrapper()
+        job_wrapper(args.resume)
         
         # Démarrer le scheduler dans un thread séparé
         print("\n📅 Démarrage du scheduler pour les prochaines exécutions...")
@@ -3,10 +3,13 @@ Client Airtable pour récupérer les noms d'entreprises
 """
 
 import aiohttp
-import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from datetime import datetime, timezone
 from config import Config
+from .rate_limiter import get_rate_limiter
+from .http_client import create_session
+from .write_buffer import WriteBehindBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -18,50 +21,123 @@ class AirtableClient:
             'Authorization': f'Bearer {self.config.AIRTABLE_API_KEY}',
             'Content-Type': 'application/json'
         }
+        self.rate_limiter = get_rate_limiter()
+        self.session = None
+        self.last_fetch_complete = False  # Dernière lecture de la table allée jusqu'à la dernière page
+        
+        # Écritures regroupées par lots de 10 (limite Airtable par requête)
+        self.write_buffer = None
+        if self.config.AIRTABLE_BATCH_WRITES:
+            self.write_buffer = WriteBehindBuffer(
+                self._send_batch,
+                batch_size=min(10, self.config.AIRTABLE_BATCH_SIZE),
+                delay=self.config.AIRTABLE_BATCH_DELAY
+            )
     
-    async def get_companies(self) -> List[Dict[str, Any]]:
-        """Récupère la liste des entreprises depuis Airtable"""
+    async def get_session(self):
+        """Crée ou retourne la session HTTP (connexions empruntées au pool partagé)"""
+        if not self.session or self.session.closed:
+            self.session = create_session(
+                timeout=aiohttp.ClientTimeout(total=self.config.TIMEOUT),
+                headers=self.headers
+            )
+        return self.session
+    
+    async def close_session(self):
+        """Envoie les écritures en attente puis ferme la session HTTP"""
+        if self.write_buffer:
+            await self.write_buffer.close()
+            if self.write_buffer.records:
+                logger.info(f"💾 Écritures Airtable groupées: {self.write_buffer.stats()}")
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.session = None
+    
+    def build_incremental_formula(self, since: Optional[str], stale_after_days: int) -> Optional[str]:
+        """Formule filterByFormula des exécutions incrémentales
+
+        Sélectionne les enregistrements jamais traités (Get Scrapped ? est écrit
+        pour tout enregistrement traité, même sans résultat), ceux dont le nom a été
+        modifié depuis `since` (high-water mark de la dernière exécution) et ceux
+        dont la vérification date de plus de `stale_after_days` jours. Sans
+        high-water mark (première exécution), aucun filtre n'est appliqué.
+        """
+        if not since:
+            return None
+        
+        # LAST_MODIFIED_TIME({Nom}) ignore nos propres écritures sur les autres champs
+        conditions = [
+            "NOT({Get Scrapped ?})",
+            f"IS_AFTER(LAST_MODIFIED_TIME({{Nom}}), DATETIME_PARSE('{since}'))"
+        ]
+        
+        if stale_after_days > 0:
+            cutoff = f"DATEADD(NOW(), -{int(stale_after_days)}, 'days')"
+            check_field = self.config.AIRTABLE_LAST_CHECK_FIELD
+            if check_field:
+                conditions.append(f"NOT({{{check_field}}})")
+                conditions.append(f"IS_BEFORE({{{check_field}}}, {cutoff})")
+            else:
+                conditions.append(f"IS_BEFORE(LAST_MODIFIED_TIME(), {cutoff})")
+        
+        return f"OR({', '.join(conditions)})"
+    
+    async def iter_companies(self, filter_formula: Optional[str] = None,
+                             fields: Tuple[str, ...] = ('Nom',)) -> AsyncIterator[Dict[str, Any]]:
+        """Parcourt les entreprises Airtable page par page (100 enregistrements)
+        
+        Seuls les champs `fields` sont demandés : le traitement peut commencer dès
+        la première page, sans télécharger toute la table en mémoire.
+        last_fetch_complete indique ensuite si toutes les pages ont été lues.
+        """
+        self.last_fetch_complete = False
+        url = f"{self.base_url}/{self.config.AIRTABLE_TABLE_NAME}"
+        count = 0
+        
         try:
-            companies = []
-            url = f"{self.base_url}/{self.config.AIRTABLE_TABLE_NAME}"
+            session = await self.get_session()
+            offset = None
+            while True:
+                params = [('pageSize', '100')]
+                params.extend(('fields[]', name) for name in fields)
+                if self.config.AIRTABLE_VIEW_NAME:
+                    params.append(('view', self.config.AIRTABLE_VIEW_NAME))
+                if filter_formula:
+                    params.append(('filterByFormula', filter_formula))
+                if offset:
+                    params.append(('offset', offset))
+                
+                await self.rate_limiter.acquire(url)
+                async with session.get(url, headers=self.headers, params=params) as response:
+                    self.rate_limiter.observe(url, response)
+                    if response.status != 200:
+                        logger.error(f"Erreur API Airtable: {response.status}")
+                        return
+                    data = await response.json()
+                
+                for record in data.get('records', []):
+                    record_fields = record.get('fields', {})
+                    count += 1
+                    yield {
+                        'id': record.get('id'),
+                        'name': record_fields.get('Nom', ''),
+                        'airtable_record_id': record.get('id')
+                    }
+                
+                # Vérifier s'il y a plus de données à récupérer
+                offset = data.get('offset')
+                if not offset:
+                    break
             
-            async with aiohttp.ClientSession() as session:
-                offset = None
-                while True:
-                    params = {}
-                    if self.config.AIRTABLE_VIEW_NAME:
-                        params['view'] = self.config.AIRTABLE_VIEW_NAME
-                    if offset:
-                        params['offset'] = offset
-                    
-                    async with session.get(url, headers=self.headers, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            records = data.get('records', [])
-                            
-                            for record in records:
-                                fields = record.get('fields', {})
-                                company_data = {
-                                    'id': record.get('id'),
-                                    'name': fields.get('Nom', ''),
-                                    'airtable_record_id': record.get('id')
-                                }
-                                companies.append(company_data)
-                            
-                            # Vérifier s'il y a plus de données à récupérer
-                            offset = data.get('offset')
-                            if not offset:
-                                break
-                        else:
-                            logger.error(f"Erreur API Airtable: {response.status}")
-                            break
-            
-            logger.info(f"✅ {len(companies)} entreprises récupérées depuis Airtable")
-            return companies
+            self.last_fetch_complete = True
+            logger.info(f"✅ {count} entreprises récupérées depuis Airtable")
             
         except Exception as e:
             logger.error(f"❌ Erreur lors de la récupération des entreprises: {str(e)}")
-            return []
+    
+    async def get_companies(self, filter_formula: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Récupère la liste des entreprises depuis Airtable (filtrée par une formule si fournie)"""
+        return [company async for company in self.iter_companies(filter_formula)]
     
     async def update_company_status(self, record_id: str, status: str, data: Dict[str, Any] = None):
         """Met à jour le statut d'une entreprise dans Airtable"""
@@ -74,115 +150,193 @@ class AirtableClient:
             
             payload = {'fields': fields}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(url, headers=self.headers, json=payload) as response:
-                    if response.status == 200:
-                        logger.info(f"✅ Statut mis à jour pour l'entreprise {record_id}")
-                    else:
-                        logger.error(f"❌ Erreur mise à jour Airtable: {response.status}")
-                        
+            session = await self.get_session()
+            await self.rate_limiter.acquire(url)
+            async with session.patch(url, headers=self.headers, json=payload) as response:
+                self.rate_limiter.observe(url, response)
+                if response.status == 200:
+                    logger.info(f"✅ Statut mis à jour pour l'entreprise {record_id}")
+                else:
+                    logger.error(f"❌ Erreur mise à jour Airtable: {response.status}")
+                    
         except Exception as e:
             logger.error(f"❌ Erreur lors de la mise à jour du statut: {str(e)}")
 
     async def update_company_data(self, record_id: str, scraped_data: Dict[str, Any]):
-        """Met à jour les données de scrapping d'une entreprise dans Airtable"""
+        """Met à jour les données de scrapping d'une entreprise dans Airtable
+        
+        Avec les écritures groupées, la mise à jour part dans le prochain lot :
+        le retour indique le succès de cet enregistrement une fois le lot envoyé.
+        """
         try:
-            url = f"{self.base_url}/{self.config.AIRTABLE_TABLE_NAME}/{record_id}"
-            
-            # Préparer les champs pour Airtable (utilisation des champs existants)
-            fields = {}
-            
-            # Données du site web
-            if 'website_data' in scraped_data:
-                website = scraped_data['website_data']
-                if website.get('website'):
-                    fields['Site'] = website['website']
-                if website.get('adresse'):
-                    fields['Adresse de facturation'] = website['adresse']
-                if website.get('telephone'):
-                    fields['Tel Principal'] = website['telephone']
-                if website.get('mobile'):
-                    fields['Portable'] = website['mobile']
-            
-            # Données légales
-            if 'legal_data' in scraped_data:
-                legal = scraped_data['legal_data']
-                if legal.get('siren'):
-                    fields['SIREN'] = legal['siren']
-                if legal.get('siret'):
-                    fields['SIRET'] = legal['siret']
-                if legal.get('numero_tva') or legal.get('tva'):
-                    fields['TVA Intracom'] = legal.get('numero_tva') or legal.get('tva')
-                if legal.get('adresse') or legal.get('adresse_legale'):
-                    fields['Adresse'] = legal.get('adresse') or legal.get('adresse_legale')
-                if legal.get('code_postal') or legal.get('code_postal_legal'):
-                    fields['Code Postal'] = legal.get('code_postal') or legal.get('code_postal_legal')
-                if legal.get('ville') or legal.get('ville_legale'):
-                    fields['Ville'] = legal.get('ville') or legal.get('ville_legale')
-            
-            # Données de solvabilité (utiliser seulement les champs existants)
-            if 'solvability_data' in scraped_data:
-                solvability = scraped_data['solvability_data']
-                if solvability.get('is_solvent') is not None:
-                    fields['État de la société'] = "Fermé/Insolvable" if solvability.get('is_solvent') is False else "OK"
-                # Note: Le champ 'Statut Entreprise' n'existe pas dans Airtable
-                # if solvability.get('status'):
-                #     fields['Statut Entreprise'] = solvability['status']
-                if solvability.get('risk_level'):
-                    fields['Niveau de Risque'] = solvability['risk_level']
-                if solvability.get('details'):
-                    # Joindre les détails en une seule chaîne
-                    details_text = "; ".join([str(detail) for detail in solvability['details']])
-                    fields['Détails Solvabilité'] = details_text[:1000]  # Limiter la taille
+            fields = self.build_update_fields(scraped_data)
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la mise à jour des données: {str(e)}")
+            return False
+        
+        if self.write_buffer:
+            return await self.write_buffer.submit(record_id, fields)
+        return await self._patch_record(record_id, fields, scraped_data.get('company_name', record_id))
+    
+    def build_update_fields(self, scraped_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convertit les données scrappées en champs Airtable"""
+        # Préparer les champs pour Airtable (utilisation des champs existants)
+        fields = {}
+        
+        # Données du site web
+        if 'website_data' in scraped_data:
+            website = scraped_data['website_data']
+            if website.get('website'):
+                fields['Site'] = website['website']
+            if website.get('adresse'):
+                fields['Adresse de facturation'] = website['adresse']
+            if website.get('telephone'):
+                fields['Tel Principal'] = website['telephone']
+            if website.get('mobile'):
+                fields['Portable'] = website['mobile']
+        
+        # Données légales
+        if 'legal_data' in scraped_data:
+            legal = scraped_data['legal_data']
+            if legal.get('siren'):
+                fields['SIREN'] = legal['siren']
+            if legal.get('siret'):
+                fields['SIRET'] = legal['siret']
+            if legal.get('numero_tva') or legal.get('tva'):
+                fields['TVA Intracom'] = legal.get('numero_tva') or legal.get('tva')
+            if legal.get('adresse') or legal.get('adresse_legale'):
+                fields['Adresse'] = legal.get('adresse') or legal.get('adresse_legale')
+            if legal.get('code_postal') or legal.get('code_postal_legal'):
+                fields['Code Postal'] = legal.get('code_postal') or legal.get('code_postal_legal')
+            if legal.get('ville') or legal.get('ville_legale'):
+                fields['Ville'] = legal.get('ville') or legal.get('ville_legale')
+        
+        # Données de solvabilité (utiliser seulement les champs existants)
+        if 'solvability_data' in scraped_data:
+            solvability = scraped_data['solvability_data']
+            if solvability.get('is_solvent') is not None:
+                fields['État de la société'] = "Fermé/Insolvable" if solvability.get('is_solvent') is False else "OK"
+            # Note: Le champ 'Statut Entreprise' n'existe pas dans Airtable
+            # if solvability.get('status'):
+            #     fields['Statut Entreprise'] = solvability['status']
+            if solvability.get('risk_level'):
+                fields['Niveau de Risque'] = solvability['risk_level']
+            if solvability.get('details'):
+                # Joindre les détails en une seule chaîne
+                details_text = "; ".join([str(detail) for detail in solvability['details']])
+                fields['Détails Solvabilité'] = details_text[:1000]  # Limiter la taille
 
-            # Marquer comme scrappé si des données ont été récupérées
-            if 'website_data' in scraped_data or 'legal_data' in scraped_data or 'solvability_data' in scraped_data:
-                fields['Get Scrapped ?'] = True
-            
+        # Date de la vérification (sert à la politique de fraîcheur des exécutions incrémentales)
+        if self.config.AIRTABLE_LAST_CHECK_FIELD:
+            fields[self.config.AIRTABLE_LAST_CHECK_FIELD] = datetime.now(timezone.utc).isoformat()
+        
+        # Toujours marquer comme traité, même sans aucune donnée trouvée : sinon
+        # NOT({Get Scrapped ?}) resélectionnerait l'enregistrement à chaque exécution
+        # incrémentale (il ne redevient candidat qu'une fois la vérification périmée)
+        fields['Get Scrapped ?'] = True
+        
+        return fields
+    
+    async def _patch_record(self, record_id: str, fields: Dict[str, Any], label: str = None) -> bool:
+        """PATCH d'un seul enregistrement"""
+        try:
+            url = f"{self.base_url}/{self.config.AIRTABLE_TABLE_NAME}/{record_id}"
             payload = {'fields': fields}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(url, headers=self.headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.info(f"✅ Données de scrapping mises à jour dans Airtable pour {scraped_data.get('company_name', record_id)}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Erreur mise à jour Airtable {response.status}: {error_text}")
-                        return False
-                        
+            session = await self.get_session()
+            await self.rate_limiter.acquire(url)
+            async with session.patch(url, headers=self.headers, json=payload) as response:
+                self.rate_limiter.observe(url, response)
+                if response.status == 200:
+                    logger.info(f"✅ Données de scrapping mises à jour dans Airtable pour {label or record_id}")
+                    return True
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Erreur mise à jour Airtable {response.status}: {error_text}")
+                    return False
+                    
         except Exception as e:
             logger.error(f"❌ Erreur lors de la mise à jour des données: {str(e)}")
-            return False 
+            return False
+    
+    async def _send_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, bool]:
+        """PATCH groupé (10 enregistrements max) ; succès par enregistrement
+        
+        Un 429, une erreur 5xx ou réseau est retenté sur le même lot, après la
+        pause imposée au limiteur de débit (Retry-After pour un 429). Seul un
+        refus de validation (422 à cause d'un seul champ invalide) fait renvoyer
+        les enregistrements un par un, pour ne pas tous les perdre.
+        """
+        url = f"{self.base_url}/{self.config.AIRTABLE_TABLE_NAME}"
+        payload = {'records': [{'id': record_id, 'fields': fields} for record_id, fields in items]}
+        failed = {record_id: False for record_id, _ in items}
+        
+        for attempt in range(1, self.config.MAX_RETRIES + 1):
+            try:
+                session = await self.get_session()
+                await self.rate_limiter.acquire(url)
+                async with session.patch(url, headers=self.headers, json=payload) as response:
+                    self.rate_limiter.observe(url, response)
+                    if response.status == 200:
+                        data = await response.json()
+                        updated = {record.get('id') for record in data.get('records', [])}
+                        logger.info(f"✅ Lot Airtable: {len(updated)}/{len(items)} enregistrements mis à jour")
+                        return {record_id: record_id in updated for record_id, _ in items}
+                    status = response.status
+                    error_text = await response.text()
+                logger.error(f"❌ Erreur mise à jour Airtable groupée {status}: {error_text}")
+            except Exception as e:
+                status = None
+                logger.error(f"❌ Erreur lors de la mise à jour groupée: {str(e)}")
+            
+            if status == 422 and len(items) > 1:
+                logger.warning(f"⚠️ Lot de {len(items)} refusé, envoi enregistrement par enregistrement")
+                results = {}
+                for record_id, fields in items:
+                    results[record_id] = await self._patch_record(record_id, fields)
+                return results
+            
+            if status is not None and status != 429 and status < 500:
+                # Autre refus (401, 403, 404...) : renvoyer le lot n'y changerait rien
+                return failed
+            
+            if attempt < self.config.MAX_RETRIES:
+                if status != 429:
+                    # 5xx ou erreur réseau : pause croissante (un 429 est déjà suspendu par observe)
+                    self.rate_limiter.penalize(url, 2 ** attempt)
+                logger.warning(f"🔄 Lot Airtable renvoyé ({attempt + 1}/{self.config.MAX_RETRIES})")
+        
+        return failed
 
     async def get_company_by_id(self, record_id: str) -> Dict[str, Any]:
         """Récupère une entreprise spécifique par son record ID"""
         try:
             url = f"{self.base_url}/{self.config.AIRTABLE_TABLE_NAME}/{record_id}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"📊 Réponse Airtable brute: {data}")
-                        
-                        # Airtable retourne directement l'enregistrement, pas dans 'records'
-                        fields = data.get('fields', {})
-                        company_data = {
-                            'id': data.get('id'),
-                            'name': fields.get('Nom', ''),  # Chercher le champ "Nom"
-                            'airtable_record_id': data.get('id'),
-                            'fields': fields
-                        }
-                        logger.info(f"✅ Entreprise récupérée par ID: {record_id}")
-                        logger.info(f"📋 Champs trouvés: {list(fields.keys())}")
-                        logger.info(f"📋 Nom trouvé: '{company_data['name']}'")
-                        return company_data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Erreur API Airtable: {response.status} - {error_text}")
-                        return {}
+            session = await self.get_session()
+            await self.rate_limiter.acquire(url)
+            async with session.get(url, headers=self.headers) as response:
+                self.rate_limiter.observe(url, response)
+                if response.status == 200:
+                    data = await response.json()
+                    logger.info(f"📊 Réponse Airtable brute: {data}")
+                    
+                    # Airtable retourne directement l'enregistrement, pas dans 'records'
+                    fields = data.get('fields', {})
+                    company_data = {
+                        'id': data.get('id'),
+                        'name': fields.get('Nom', ''),  # Chercher le champ "Nom"
+                        'airtable_record_id': data.get('id'),
+                        'fields': fields
+                    }
+                    logger.info(f"✅ Entreprise récupérée par ID: {record_id}")
+                    logger.info(f"📋 Champs trouvés: {list(fields.keys())}")
+                    logger.info(f"📋 Nom trouvé: '{company_data['name']}'")
+                    return company_data
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Erreur API Airtable: {response.status} - {error_text}")
+                    return {}
         except Exception as e:
             logger.error(f"❌ Erreur lors de la récupération de l'entreprise par ID: {str(e)}")
             return {} 
\ No newline at end of file
@@ -3,12 +3,15 @@ Module utilisant les APIs publiques françaises pour récupérer les information
 Plus fiable que le scraping de sites web
 """
 
-import asyncio
 import aiohttp
 import logging
+import os
 from typing import Dict, Any, Optional, List
 from config import Config
 import urllib.parse
+from .rate_limiter import get_rate_limiter
+from .http_client import create_session
+from .ttl_cache import PersistentTTLCache, normalize_company_name
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,7 @@ class APILegalScraper:
     def __init__(self):
         self.config = Config()
         self.session = None
+        self.rate_limiter = get_rate_limiter()
         
         # URLs des APIs publiques françaises
         self.apis = {
@@ -23,11 +27,22 @@ class APILegalScraper:
             'recherche_entreprise': 'https://recherche-entreprises.api.gouv.fr/search',
             'pappers': 'https://api.pappers.fr/v2/entreprise',  # API gratuite avec limite
         }
+        
+        # Cache disque des résultats (évite de réinterroger les APIs d'un jour à l'autre)
+        self.cache = None
+        if self.config.LEGAL_CACHE_ENABLED:
+            self.cache = PersistentTTLCache(
+                os.path.join(self.config.CACHE_DIR, 'legal_cache.sqlite'),
+                table='legal_info',
+                ttl=self.config.LEGAL_CACHE_TTL_DAYS * 86400,
+                negative_ttl=self.config.LEGAL_CACHE_NEGATIVE_TTL_DAYS * 86400,
+                max_entries=self.config.LEGAL_CACHE_MAX_ENTRIES
+            )
     
     async def get_session(self):
         """Crée ou retourne la session HTTP"""
         if not self.session:
-            self.session = aiohttp.ClientSession(
+            self.session = create_session(
                 timeout=aiohttp.ClientTimeout(total=self.config.TIMEOUT),
                 headers={'User-Agent': self.config.USER_AGENT}
             )
@@ -40,7 +55,30 @@ class APILegalScraper:
             self.session = None
     
     async def scrape_legal_info(self, company_name: str) -> Dict[str, Any]:
-        """Récupère les informations légales via les APIs publiques"""
+        """Récupère les informations légales via les APIs publiques (avec cache disque)"""
+        cache_key = normalize_company_name(company_name)
+        if self.cache and cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"💾 Données légales en cache pour {company_name}")
+                return cached
+        
+        result, definitive = await self._scrape_legal_info(company_name)
+        
+        if self.cache and cache_key:
+            if not result.get('error'):
+                self.cache.set(cache_key, result)
+            elif definitive:
+                # Résultat négatif confirmé par l'API : mis en cache moins longtemps
+                self.cache.set(cache_key, result, negative=True)
+        return result
+    
+    async def _scrape_legal_info(self, company_name: str):
+        """Interroge les APIs publiques
+
+        Retourne (résultat, définitif) : définitif vaut True quand le résultat
+        peut être mis en cache, c'est-à-dire hors erreurs réseau ou de quota.
+        """
         try:
             logger.info(f"🔍 Recherche API pour: {company_name}")
             
@@ -49,27 +87,30 @@ class APILegalScraper:
             
             if result and not result.get('error'):
                 logger.info(f"✅ Données trouvées via API gouvernementale pour {company_name}")
-                return result
+                return result, True
+            
+            # L'API gouvernementale a répondu sans aucun résultat : absence confirmée
+            not_found = bool(result and result.get('not_found'))
             
             # Fallback: essayer avec l'API Pappers (gratuite avec limite)
             result = await self._search_via_pappers_api(company_name)
             
             if result and not result.get('error'):
                 logger.info(f"✅ Données trouvées via API Pappers pour {company_name}")
-                return result
+                return result, True
             
             # Fallback: recherche manuelle dans les données ouvertes
             result = await self._search_manual_fallback(company_name)
             
             if result and not result.get('error'):
                 logger.info(f"✅ Données trouvées via recherche manuelle pour {company_name}")
-                return result
+                return result, True
             
-            return {'error': f'Aucune donnée trouvée pour {company_name}'}
+            return {'error': f'Aucune donnée trouvée pour {company_name}'}, not_found
             
         except Exception as e:
             logger.error(f"❌ Erreur lors de la recherche API pour {company_name}: {e}")
-            return {'error': str(e)}
+            return {'error': str(e)}, False
     
     async def _search_via_gouv_api(self, company_name: str) -> Dict[str, Any]:
         """Recherche via l'API gouvernementale recherche-entreprises"""
@@ -80,7 +121,9 @@ class APILegalScraper:
             encoded_name = urllib.parse.quote(company_name)
             url = f"{self.apis['recherche_entreprise']}?q={encoded_name}&limite=10"
             
+            await self.rate_limiter.acquire(url)
             async with session.get(url) as response:
+                self.rate_limiter.observe(url, response)
                 if response.status == 200:
                     data = await response.json()
                     logger.info(f"📊 API gouv réponse pour {company_name}: {len(data.get('results', []))} résultats")
@@ -98,6 +141,7 @@ class APILegalScraper:
                             logger.warning(f"⚠️ Aucun match trouvé pour {company_name} dans {len(results)} résultats")
                     else:
                         logger.warning(f"⚠️ Aucun résultat dans la réponse API pour {company_name}")
+                        return {'error': 'API gouv: aucun résultat', 'not_found': True}
                 
                 logger.warning(f"⚠️ API gouv: {response.status} pour {company_name}")
                 return {'error': f'API gouv error: {response.status}'}
@@ -118,7 +162,9 @@ class APILegalScraper:
                 'format': 'json'
             }
             
+            await self.rate_limiter.acquire(url)
             async with session.get(url, params=params) as response:
+                self.rate_limiter.observe(url, response)
                 if response.status == 200:
                     data = await response.json()
                     
@@ -151,7 +197,9 @@ class APILegalScraper:
                 'nombre': 10
             }
             
+            await self.rate_limiter.acquire(search_url)
             async with session.get(search_url, headers=headers, params=params) as response:
+                self.rate_limiter.observe(search_url, response)
                 if response.status == 200:
                     data = await response.json()
                     
@@ -7,12 +7,19 @@ import aiohttp
 import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, Optional, Union
 from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin, urlparse
 from config import Config
 from .web_search import WebSearcher
+from .http_client import create_session
+from .page_cache import PageCache
+from .http_cache import HTTPCache
+from .resolution_store import ResolutionStore
+from .page_document import PageDocument
+from . import contact_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +27,31 @@ class CompanyScraper:
     def __init__(self):
         self.config = Config()
         self.session = None
-        self.web_searcher = WebSearcher()
+        # Pages téléchargées partagées avec la recherche web : une seule requête par URL,
+        # revalidée d'une exécution à l'autre par le cache HTTP disque
+        self.http_cache = None
+        if self.config.HTTP_CACHE_ENABLED:
+            self.http_cache = HTTPCache(
+                os.path.join(self.config.CACHE_DIR, 'http_cache.sqlite'),
+                max_bytes=int(self.config.HTTP_CACHE_MAX_MB * 1024 * 1024)
+            )
+        self.page_cache = PageCache(int(self.config.PAGE_CACHE_MAX_MB * 1024 * 1024), http_cache=self.http_cache,
+                                    max_page_bytes=self.config.PAGE_MAX_KB * 1024)
+        self.web_searcher = WebSearcher(page_cache=self.page_cache)
+        
+        # Sites déjà trouvés lors des exécutions précédentes (simple revérification)
+        self.resolutions = None
+        if self.config.RESOLUTION_STORE_ENABLED:
+            self.resolutions = ResolutionStore(
+                os.path.join(self.config.CACHE_DIR, 'resolutions.sqlite'),
+                ttl=self.config.RESOLUTION_TTL_DAYS * 86400,
+                min_confidence=self.config.RESOLUTION_MIN_CONFIDENCE
+            )
     
     async def get_session(self):
         """Crée ou retourne la session HTTP"""
         if not self.session:
-            self.session = aiohttp.ClientSession(
+            self.session = create_session(
                 timeout=aiohttp.ClientTimeout(total=self.config.TIMEOUT),
                 headers={'User-Agent': self.config.USER_AGENT}
             )
@@ -40,19 +66,41 @@ class CompanyScraper:
         # Fermer aussi la session du web searcher
         await self.web_searcher.close_session()
     
-    async def find_company_website(self, company_name: str) -> Optional[str]:
+    async def find_company_website(self, company_name: str, record_id: Optional[str] = None) -> Optional[str]:
         """
         Trouve le site web d'une entreprise via recherche web réelle
         puis OpenAI en fallback
+        
+        Un site déjà trouvé lors d'une exécution précédente (par record ID ou
+        nom normalisé) est seulement revérifié.
         """
+        # Méthode 0: Site déjà résolu, simple vérification qu'il répond toujours
+        stored = self.resolutions.get(company_name, record_id) if self.resolutions else None
+        if stored:
+            if await self._revalidate_website(stored['url']):
+                logger.info(f"♻️ Site connu revérifié pour {company_name}: {stored['url']}")
+                self.resolutions.confirm(company_name, stored, record_id)
+                return stored['url']
+            logger.info(f"⚠️ Site connu injoignable pour {company_name} ({stored['url']}), nouvelle recherche")
+            self.resolutions.forget(company_name, record_id)
+        
         # Méthode 1: Recherche web réelle (Google/DuckDuckGo)
-        website_url = await self.web_searcher.search_company_website(company_name)
-        if website_url:
-            return website_url
+        website_url, strategy = await self.web_searcher.search_company_website_with_strategy(company_name)
         
         # Méthode 2: Fallback OpenAI (comme avant mais amélioré)
-        logger.info(f"🔄 Fallback OpenAI pour {company_name}")
-        return await self._find_website_via_openai(company_name)
+        if not website_url:
+            logger.info(f"🔄 Fallback OpenAI pour {company_name}")
+            website_url, strategy = await self._find_website_via_openai(company_name), 'openai'
+        
+        if website_url and self.resolutions:
+            self.resolutions.save(company_name, website_url, strategy, record_id)
+        return website_url
+    
+    async def _revalidate_website(self, url: str) -> bool:
+        """Vérification légère d'un site connu (requête conditionnelle via le cache HTTP)"""
+        session = await self.get_session()
+        page = await self.page_cache.fetch(session, url, timeout=aiohttp.ClientTimeout(total=10))
+        return bool(page) and page.status == 200
     
     async def _find_website_via_openai(self, company_name: str) -> Optional[str]:
         """Utilise OpenAI pour trouver le site web de l'entreprise (méthode fallback)"""
@@ -113,14 +161,13 @@ class CompanyScraper:
                         logger.info(f"🔍 Site trouvé pour {company_name}: {website_url}")
                         
                         # Vérifier que le site existe vraiment
-                        try:
-                            async with session.get(website_url, timeout=aiohttp.ClientTimeout(total=10)) as test_response:
-                                if test_response.status == 200:
-                                    return website_url
-                                else:
-                                    logger.warning(f"⚠️ Site non accessible ({test_response.status}): {website_url}")
-                                    return None
-                        except:
+                        page = await self.page_cache.fetch(session, website_url, timeout=aiohttp.ClientTimeout(total=10))
+                        if page and page.status == 200:
+                            return website_url
+                        elif page:
+                            logger.warning(f"⚠️ Site non accessible ({page.status}): {website_url}")
+                            return None
+                        else:
                             logger.warning(f"⚠️ Site non accessible: {website_url}")
                             return None
                     else:
@@ -134,11 +181,11 @@ class CompanyScraper:
             logger.error(f"❌ Erreur lors de la recherche du site pour {company_name}: {str(e)}")
             return None
     
-    async def scrape_company_website(self, company_name: str) -> Dict[str, Any]:
+    async def scrape_company_website(self, company_name: str, record_id: Optional[str] = None) -> Dict[str, Any]:
         """Scrappe les informations d'une entreprise depuis son site web"""
         try:
             # Trouver le site web
-            website_url = await self.find_company_website(company_name)
+            website_url = await self.find_company_website(company_name, record_id)
             if not website_url:
                 return {'error': 'Site web non trouvé'}
             
@@ -162,47 +209,53 @@ class CompanyScraper:
         """Scrappe les données d'un site web"""
         try:
             session = await self.get_session()
-            async with session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Extraire les informations
-                    data = {
-                        'adresse': self.extract_address(soup),
-                        'code_postal': self.extract_postal_code(soup),
-                        'ville': self.extract_city(soup),
-                        'email': self.extract_email(soup),
-                        'telephone': self.extract_phone(soup),
-                        'mobile': self.extract_mobile(soup)
-                    }
-                    
-                    logger.info(f"✅ Données extraites du site: {url}")
-                    return data
-                else:
-                    logger.error(f"❌ Erreur HTTP {response.status} pour {url}")
-                    return {'error': f'HTTP {response.status}'}
-                    
+            page = await self.page_cache.fetch(session, url)
+            if page is None:
+                logger.error(f"❌ Site inaccessible: {url}")
+                return {'error': 'Site inaccessible'}
+            if page.status == 200:
+                data = None
+                if self.config.PARTIAL_PARSE:
+                    # Pied de page, contact, mentions légales... sans construire tout l'arbre
+                    data = self._extract_contact_data(PageDocument.parse_regions(page.text, self.config.HTML_PARSER))
+                    if not self._has_contact_block(data):
+                        logger.debug(f"Coordonnées incomplètes dans les régions ciblées, analyse complète: {url}")
+                        data = None
+                if data is None:
+                    data = self._extract_contact_data(PageDocument.parse(page.text))
+                
+                logger.info(f"✅ Données extraites du site: {url}")
+                return data
+            else:
+                logger.error(f"❌ Erreur HTTP {page.status} pour {url}")
+                return {'error': f'HTTP {page.status}'}
+                
         except Exception as e:
             logger.error(f"❌ Erreur lors du scrapping de {url}: {str(e)}")
             return {'error': str(e)}
     
-    def extract_address(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_contact_data(self, doc: PageDocument) -> Dict[str, Optional[str]]:
+        """Toutes les coordonnées d'une page ; texte et index partagés par les extracteurs"""
+        return {
+            'adresse': self.extract_address(doc),
+            'code_postal': self.extract_postal_code(doc),
+            'ville': self.extract_city(doc),
+            'email': self.extract_email(doc),
+            'telephone': self.extract_phone(doc),
+            'mobile': self.extract_mobile(doc)
+        }
+    
+    @staticmethod
+    def _has_contact_block(data: Dict[str, Optional[str]]) -> bool:
+        """Un moyen de contact et une localisation : sinon, le reste de la page est analysé"""
+        return bool((data['email'] or data['telephone'] or data['mobile']) and (data['adresse'] or data['code_postal']))
+    
+    def extract_address(self, page: Union[PageDocument, BeautifulSoup]) -> Optional[str]:
         """Extrait l'adresse du site avec méthodes améliorées"""
-        text = soup.get_text()
+        doc = PageDocument.of(page)
         
-        # Patterns plus précis pour les adresses françaises
-        patterns = [
-            # Numéro + type de voie + nom
-            r'\b\d{1,4}[\s,]*(?:bis|ter|quater)?\s*(?:rue|avenue|boulevard|place|allée|chemin|impasse|cours|quai|square|passage|villa|cité)\s+[A-Za-zÀ-ÿ\s\-\'\.]{2,50}',
-            # Type de voie + numéro + nom
-            r'\b(?:rue|avenue|boulevard|place|allée|chemin|impasse|cours|quai|square|passage|villa|cité)\s+[A-Za-zÀ-ÿ\s\-\'\.]*\s*\d{1,4}[\s,]*(?:bis|ter|quater)?',
-            # Recherche dans les balises spécifiques
-            r'(?i)(?:adresse|address)[\s:]*([^\n\r]{10,100})'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        # Candidats de chaque motif (numéro + voie, voie + numéro, label), par priorité
+        for matches in doc.contacts.by_rule('address'):
             if matches:
                 # Nettoyer et valider l'adresse
                 address = matches[0].strip()
@@ -210,38 +263,21 @@ class CompanyScraper:
                     return address
         
         # Chercher aussi dans les balises HTML spécifiques
-        address_selectors = [
-            '[itemprop="streetAddress"]',
-            '[class*="address"]',
-            '[class*="adresse"]',
-            '[id*="address"]',
-            '[id*="adresse"]'
-        ]
-        
-        for selector in address_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().strip()
-                if len(text) > 8 and len(text) < 100:
-                    return text
+        for element in doc.lookup('streetAddress', ('address', 'adresse'), ('address', 'adresse')):
+            text = element.get_text().strip()
+            if len(text) > 8 and len(text) < 100:
+                return text
         
         return None
     
-    def extract_postal_code(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_postal_code(self, page: Union[PageDocument, BeautifulSoup]) -> Optional[str]:
         """Extrait le code postal avec méthodes améliorées"""
-        text = soup.get_text()
+        doc = PageDocument.of(page)
         
-        # Patterns pour codes postaux français
-        patterns = [
-            r'\b\d{5}\b',  # 5 chiffres
-            r'(?i)(?:code postal|cp)[\s:]*(\d{5})',  # Avec label
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        # Candidats : 5 chiffres, puis avec label
+        for matches in doc.contacts.by_rule('postal_code'):
+            for code in matches:
                 # Vérifier que c'est un vrai code postal français
-                code = match if isinstance(match, str) else match
                 if code.isdigit() and len(code) == 5:
                     # Codes postaux français commencent par 01-95 ou 2A/2B pour Corse
                     first_two = int(code[:2])
@@ -249,34 +285,19 @@ class CompanyScraper:
                         return code
         
         # Chercher dans les balises spécifiques
-        postal_selectors = [
-            '[itemprop="postalCode"]',
-            '[class*="postal"]',
-            '[class*="cp"]',
-            '[id*="postal"]'
-        ]
-        
-        for selector in postal_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().strip()
-                if re.match(r'^\d{5}$', text):
-                    return text
+        for element in doc.lookup('postalCode', ('postal', 'cp'), ('postal',)):
+            text = element.get_text().strip()
+            if re.match(r'^\d{5}$', text):
+                return text
         
         return None
     
-    def extract_city(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_city(self, page: Union[PageDocument, BeautifulSoup]) -> Optional[str]:
         """Extrait la ville avec méthodes améliorées"""
-        text = soup.get_text()
-        
-        # Patterns pour villes françaises
-        patterns = [
-            r'\b\d{5}\s+([A-Za-zÀ-ÿ\s\-\']{2,30})',  # Après code postal
-            r'(?i)(?:ville|city)[\s:]*([A-Za-zÀ-ÿ\s\-\']{2,30})',  # Avec label
-        ]
+        doc = PageDocument.of(page)
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
+        # Candidats : après un code postal, puis avec label
+        for matches in doc.contacts.by_rule('city'):
             for match in matches:
                 city = match.strip()
                 # Vérifier que c'est une ville valide (pas de chiffres, longueur raisonnable)
@@ -284,30 +305,20 @@ class CompanyScraper:
                     return city
         
         # Chercher dans les balises spécifiques
-        city_selectors = [
-            '[itemprop="addressLocality"]',
-            '[class*="city"]',
-            '[class*="ville"]',
-            '[id*="city"]',
-            '[id*="ville"]'
-        ]
-        
-        for selector in city_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                city = element.get_text().strip()
-                if len(city) > 2 and len(city) < 30 and not re.search(r'\d', city):
-                    return city
+        for element in doc.lookup('addressLocality', ('city', 'ville'), ('city', 'ville')):
+            city = element.get_text().strip()
+            if len(city) > 2 and len(city) < 30 and not re.search(r'\d', city):
+                return city
         
         return None
     
-    def extract_email(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_email(self, page: Union[PageDocument, BeautifulSoup]) -> Optional[str]:
         """Extrait l'email avec méthodes améliorées"""
-        text = soup.get_text()
+        doc = PageDocument.of(page)
         
-        # Pattern pour emails
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
+        # Candidats trouvés dans le texte
+        email_pattern = contact_scanner.PATTERNS['email'][0]
+        matches = doc.contacts.values('email', 0)
         
         # Filtrer les emails non pertinents
         excluded_domains = [
@@ -323,46 +334,25 @@ class CompanyScraper:
             if not is_excluded and '.' in email and len(email) < 50:
                 return email
         
-        # Chercher dans les balises spécifiques
-        email_selectors = [
-            'a[href^="mailto:"]',
-            '[itemprop="email"]',
-            '[class*="email"]',
-            '[id*="email"]'
-        ]
+        # Chercher dans les balises spécifiques (liens mailto: d'abord)
+        for href in doc.mailto_links:
+            email = href.replace('mailto:', '').strip()
+            if re.match(email_pattern, email):
+                return email
         
-        for selector in email_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                if selector == 'a[href^="mailto:"]':
-                    href = element.get('href', '')
-                    if href.startswith('mailto:'):
-                        email = href.replace('mailto:', '').strip()
-                        if re.match(email_pattern, email):
-                            return email
-                else:
-                    email = element.get_text().strip()
-                    if re.match(email_pattern, email):
-                        return email
+        for element in doc.lookup('email', ('email',), ('email',)):
+            email = element.get_text().strip()
+            if re.match(email_pattern, email):
+                return email
         
         return None
     
-    def extract_phone(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_phone(self, page: Union[PageDocument, BeautifulSoup]) -> Optional[str]:
         """Extrait le numéro de téléphone fixe avec méthodes améliorées"""
-        text = soup.get_text()
+        doc = PageDocument.of(page)
         
-        # Patterns pour téléphones français (fixes)
-        patterns = [
-            # Formats standards français
-            r'\b0[1-5](?:[-.\s]?\d{2}){4}\b',  # 01 23 45 67 89
-            r'\b\+33[1-5](?:[-.\s]?\d{2}){4}\b',  # +33 1 23 45 67 89
-            r'\b(?:33|0033)[1-5](?:[-.\s]?\d{2}){4}\b',  # 0033 1 23 45 67 89
-            # Avec labels
-            r'(?i)(?:tél|tel|téléphone|telephone|fixe)[\s:]*([0-9\s\.\-\+]{10,20})',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
+        # Candidats : 01..05, +33, 0033 / 33, puis avec label
+        for matches in doc.contacts.by_rule('phone'):
             for match in matches:
                 phone = re.sub(r'[^\d\+]', '', match)  # Garder seulement chiffres et +
                 
@@ -373,57 +363,35 @@ class CompanyScraper:
                     phone = '+33' + phone[2:]
                 
                 # Vérifier que c'est un numéro français valide
-                if phone.startswith('+33') and len(phone) == 12:
-                    return '+33 ' + phone[3:4] + ' ' + phone[4:6] + ' ' + phone[6:8] + ' ' + phone[8:10] + ' ' + phone[10:12]
-                elif phone.startswith('0') and len(phone) == 10:
-                    return phone[:2] + ' ' + phone[2:4] + ' ' + phone[4:6] + ' ' + phone[6:8] + ' ' + phone[8:10]
+                if (phone.startswith('+33') and len(phone) == 12) or (phone.startswith('0') and len(phone) == 10):
+                    return self._format_phone_number(phone)
         
-        # Chercher dans les balises spécifiques
-        phone_selectors = [
-            'a[href^="tel:"]',
-            '[itemprop="telephone"]',
-            '[class*="phone"]',
-            '[class*="tel"]',
-            '[id*="phone"]',
-            '[id*="tel"]'
-        ]
+        # Chercher dans les balises spécifiques (liens tel: d'abord)
+        for href in doc.tel_links:
+            phone = re.sub(r'[^\d\+]', '', href.replace('tel:', ''))
+            if len(phone) >= 10:
+                return self._format_phone_number(phone)
         
-        for selector in phone_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                if selector == 'a[href^="tel:"]':
-                    href = element.get('href', '')
-                    if href.startswith('tel:'):
-                        phone = re.sub(r'[^\d\+]', '', href.replace('tel:', ''))
-                        if len(phone) >= 10:
-                            return self._format_phone_number(phone)
-                else:
-                    phone_text = element.get_text().strip()
-                    phone = re.sub(r'[^\d\+]', '', phone_text)
-                    if len(phone) >= 10:
-                        return self._format_phone_number(phone)
+        for element in doc.lookup('telephone', ('phone', 'tel'), ('phone', 'tel')):
+            phone_text = element.get_text().strip()
+            phone = re.sub(r'[^\d\+]', '', phone_text)
+            if len(phone) >= 10:
+                return self._format_phone_number(phone)
         
         return None
     
-    def extract_mobile(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_mobile(self, page: Union[PageDocument, BeautifulSoup]) -> Optional[str]:
         """Extrait le numéro de téléphone mobile avec méthodes améliorées"""
-        text = soup.get_text()
+        doc = PageDocument.of(page)
         
-        # Patterns pour mobiles français
-        patterns = [
-            r'\b0[67](?:[-.\s]?\d{2}){4}\b',  # 06/07 XX XX XX XX
-            r'\b\+33[67](?:[-.\s]?\d{2}){4}\b',  # +33 6/7 XX XX XX XX
-            r'(?i)(?:mobile|portable|cell)[\s:]*([0-9\s\.\-\+]{10,20})',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
+        # Candidats : 06 / 07, +33 6 / 7, puis avec label
+        for matches in doc.contacts.by_rule('mobile'):
             for match in matches:
                 phone = re.sub(r'[^\d\+]', '', match)
                 
                 # Vérifier que c'est un mobile français valide
                 if phone.startswith('0') and len(phone) == 10 and phone[1] in ['6', '7']:
-                    return phone[:2] + ' ' + phone[2:4] + ' ' + phone[4:6] + ' ' + phone[6:8] + ' ' + phone[8:10]
+                    return self._format_phone_number(phone)
                 elif phone.startswith('+336') or phone.startswith('+337'):
                     return self._format_phone_number(phone)
         
@@ -447,16 +415,20 @@ class CompanyScraper:
         try:
             # D'abord récupérer le contenu du site
             session = await self.get_session()
-            async with session.get(website_url) as response:
-                if response.status != 200:
-                    return None
-                    
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extraire le texte principal (limiter pour éviter le token limit)
-                text_content = soup.get_text()[:3000]  # Limiter à 3000 caractères
-                
+            page = await self.page_cache.fetch(session, website_url)
+            if not page or page.status != 200:
+                return None
+            
+            # Mentions légales et pied de page d'abord : c'est là que figure la raison sociale
+            text_content = ''
+            if self.config.PARTIAL_PARSE:
+                text_content = PageDocument.parse_regions(page.text, self.config.HTML_PARSER).text.strip()
+            if len(text_content) < self.config.PARTIAL_PARSE_MIN_CHARS:
+                text_content = PageDocument.parse(page.text).text
+            
+            # Limiter le texte envoyé (token limit)
+            text_content = text_content[:3000]  # Limiter à 3000 caractères
+            
             # Utiliser OpenAI pour extraire la raison sociale
             headers = {
                 'Authorization': f'Bearer {self.config.OPENAI_API_KEY}',
@@ -0,0 +1,44 @@
+"""
+Outils de concurrence partagés par les recherches web
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+async def first_by_priority(candidates: Sequence[Any], check: Callable[[Any], Awaitable[Optional[Any]]],
+                            concurrency: int = 3) -> Optional[Any]:
+    """Teste les candidats en parallèle et retourne le premier résultat par ordre de priorité
+
+    `check(candidat)` retourne une valeur (acceptée) ou None (rejetée). Au plus
+    `concurrency` tests tournent en même temps, lancés dans l'ordre de la liste.
+    Un résultat est accepté dès que tous les candidats mieux classés ont été
+    rejetés ; les tests restants sont alors annulés.
+    """
+    if not candidates:
+        return None
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(candidate):
+        async with semaphore:
+            return await check(candidate)
+
+    tasks = [asyncio.create_task(run(candidate)) for candidate in candidates]
+    try:
+        for candidate, task in zip(candidates, tasks):
+            try:
+                result = await task
+            except Exception as e:
+                logger.debug(f"Candidat {candidate} en erreur: {str(e)}")
+                continue
+            if result is not None:
+                return result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,173 @@
+"""
+Repérage en un passage des coordonnées dans le texte d'une page
+Les extracteurs lançaient chacun plusieurs re.findall sur tout le texte
+(adresse, code postal, ville, email, téléphone fixe, mobile : 15 passages).
+Le scanner parcourt le texte une fois avec une expression de déclenchement
+(début de nombre, « + », « @ », mots-clés : rue, adresse, tél...) et n'essaie
+les motifs de chaque champ qu'à ces positions. Les candidats obtenus sont,
+pour chaque motif, exactement ceux que re.findall aurait retournés, dans le
+même ordre : la validation propre à chaque champ s'applique ensuite
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STREET_TYPES = 'rue|avenue|boulevard|place|allée|chemin|impasse|cours|quai|square|passage|villa|cité'
+_ADDRESS_LABELS = 'adresse|address'
+_POSTAL_LABELS = 'code postal|cp'
+_CITY_LABELS = 'ville|city'
+_PHONE_LABELS = 'tél|tel|téléphone|telephone|fixe'
+_MOBILE_LABELS = 'mobile|portable|cell'
+
+# Motifs par champ, par ordre de priorité (même sémantique que re.findall : le
+# groupe capturant s'il existe, sinon la correspondance entière)
+PATTERNS: Dict[str, List[re.Pattern]] = {
+    'address': [
+        # Numéro + type de voie + nom
+        re.compile(r'\b\d{1,4}[\s,]*(?:bis|ter|quater)?\s*(?:' + _STREET_TYPES + r')\s+[A-Za-zÀ-ÿ\s\-\'\.]{2,50}',
+                   re.IGNORECASE),
+        # Type de voie + numéro + nom
+        re.compile(r'\b(?:' + _STREET_TYPES + r')\s+[A-Za-zÀ-ÿ\s\-\'\.]*\s*\d{1,4}[\s,]*(?:bis|ter|quater)?',
+                   re.IGNORECASE),
+        # Avec label
+        re.compile(r'(?i)(?:' + _ADDRESS_LABELS + r')[\s:]*([^\n\r]{10,100})', re.IGNORECASE),
+    ],
+    'postal_code': [
+        re.compile(r'\b\d{5}\b'),  # 5 chiffres
+        re.compile(r'(?i)(?:' + _POSTAL_LABELS + r')[\s:]*(\d{5})'),  # Avec label
+    ],
+    'city': [
+        re.compile(r'\b\d{5}\s+([A-Za-zÀ-ÿ\s\-\']{2,30})'),  # Après code postal
+        re.compile(r'(?i)(?:' + _CITY_LABELS + r')[\s:]*([A-Za-zÀ-ÿ\s\-\']{2,30})'),  # Avec label
+    ],
+    'email': [
+        re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ],
+    'phone': [
+        re.compile(r'\b0[1-5](?:[-.\s]?\d{2}){4}\b'),  # 01 23 45 67 89
+        re.compile(r'\b\+33[1-5](?:[-.\s]?\d{2}){4}\b'),  # +33 1 23 45 67 89
+        re.compile(r'\b(?:33|0033)[1-5](?:[-.\s]?\d{2}){4}\b'),  # 0033 1 23 45 67 89
+        re.compile(r'(?i)(?:' + _PHONE_LABELS + r')[\s:]*([0-9\s\.\-\+]{10,20})'),  # Avec label
+    ],
+    'mobile': [
+        re.compile(r'\b0[67](?:[-.\s]?\d{2}){4}\b'),  # 06/07 XX XX XX XX
+        re.compile(r'\b\+33[67](?:[-.\s]?\d{2}){4}\b'),  # +33 6/7 XX XX XX XX
+        re.compile(r'(?i)(?:' + _MOBILE_LABELS + r')[\s:]*([0-9\s\.\-\+]{10,20})'),
+    ],
+}
+
+# Motifs essayés selon le déclencheur, (champ, rang) ; un motif n'est essayé
+# qu'aux positions où il peut commencer
+_DIGIT_RULES = {
+    # Longueur de la suite de chiffres -> motifs possibles (hors téléphones)
+    'short': [('address', 0)],  # 1 à 4 chiffres
+    'five': [('postal_code', 0), ('city', 0)],
+}
+_PLUS_RULES = [('phone', 1), ('mobile', 1)]
+_KEYWORD_RULES = [('address', 1), ('address', 2), ('postal_code', 1), ('city', 1), ('phone', 3), ('mobile', 2)]
+_EMAIL_RULE = ('email', 0)
+
+_KEYWORDS = '|'.join([_STREET_TYPES, _ADDRESS_LABELS, _POSTAL_LABELS, _CITY_LABELS, _PHONE_LABELS, _MOBILE_LABELS])
+
+# Déclencheurs de largeur nulle : aucune position n'est masquée par une autre.
+# Ils sont cherchés sans IGNORECASE (3 fois plus lent) dans le texte en minuscules
+_TRIGGERS = re.compile(r'(?=(?P<digits>\b\d+)|(?P<plus>\b\+)|(?P<at>@)|(?P<keyword>' + _KEYWORDS + r'))')
+_TRIGGERS_IGNORECASE = re.compile(
+    r'(?=(?P<digits>\b\d+)|(?P<plus>\b\+)|(?P<at>@)|(?P<keyword>(?i:' + _KEYWORDS + r')))'
+)
+# Lettres que IGNORECASE rapproche de s / i mais que str.lower() ne change pas
+_CASE_FOLD = {0x17F: 's', 0x131: 'i'}
+_EMAIL_LOCAL_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+
+
+@dataclass
+class ContactCandidate:
+    field: str  # 'address', 'postal_code', 'city', 'email', 'phone', 'mobile'
+    rule: int  # Rang du motif dans PATTERNS[field] (0 = prioritaire)
+    value: str
+    start: int
+    end: int
+
+
+class ContactMatches:
+    def __init__(self, candidates: List[ContactCandidate]):
+        self.candidates = candidates
+        self._by_rule: Dict[Tuple[str, int], List[str]] = {}
+        for candidate in candidates:
+            self._by_rule.setdefault((candidate.field, candidate.rule), []).append(candidate.value)
+
+    def values(self, field: str, rule: int) -> List[str]:
+        """Valeurs trouvées par un motif, dans l'ordre du texte (comme re.findall)"""
+        return self._by_rule.get((field, rule), [])
+
+    def by_rule(self, field: str) -> List[List[str]]:
+        """Valeurs de chaque motif d'un champ, par ordre de priorité"""
+        return [self.values(field, rule) for rule in range(len(PATTERNS[field]))]
+
+
+def scan(text: str) -> ContactMatches:
+    """Candidats de tous les champs, en un passage sur le texte"""
+    candidates: List[ContactCandidate] = []
+    # Fin de la dernière correspondance par motif : comme re.findall, pas de recouvrement
+    last_end: Dict[Tuple[str, int], int] = {}
+
+    def attempt(rule: Tuple[str, int], position: int) -> bool:
+        if position < last_end.get(rule, 0):
+            return False
+        match = PATTERNS[rule[0]][rule[1]].match(text, position)
+        if match is None:
+            return False
+        last_end[rule] = match.end() if match.end() > match.start() else match.end() + 1
+        value = match.group(1) if match.re.groups else match.group(0)
+        candidates.append(ContactCandidate(rule[0], rule[1], value, match.start(), match.end()))
+        return True
+
+    lowered = text.lower().translate(_CASE_FOLD)
+    if len(lowered) == len(text):
+        triggers = _TRIGGERS.finditer(lowered)
+    else:
+        # Minuscule de longueur différente (ex: İ) : positions décalées
+        triggers = _TRIGGERS_IGNORECASE.finditer(text)
+
+    for trigger in triggers:
+        position = trigger.start()
+        kind = trigger.lastgroup
+        if kind == 'digits':
+            digits = trigger.group('digits')
+            if len(digits) <= 4:
+                for rule in _DIGIT_RULES['short']:
+                    attempt(rule, position)
+            elif len(digits) == 5:
+                for rule in _DIGIT_RULES['five']:
+                    attempt(rule, position)
+            # Téléphones : 0[1-5]..., 33 / 0033..., 0[67]...
+            if digits[0] == '0' and len(digits) > 1:
+                if digits[1] in '12345':
+                    attempt(('phone', 0), position)
+                elif digits[1] in '67':
+                    attempt(('mobile', 0), position)
+            if digits.startswith(('33', '0033')):
+                attempt(('phone', 2), position)
+        elif kind == 'plus':
+            for rule in _PLUS_RULES:
+                attempt(rule, position)
+        elif kind == 'keyword':
+            for rule in _KEYWORD_RULES:
+                attempt(rule, position)
+        elif kind == 'at':
+            # Début de la partie locale : la correspondance la plus à gauche, comme re.findall
+            start = position
+            lower = last_end.get(_EMAIL_RULE, 0)
+            while start > lower and text[start - 1] in _EMAIL_LOCAL_CHARS:
+                start -= 1
+            for candidate_start in range(start, position):
+                if attempt(_EMAIL_RULE, candidate_start):
+                    break
+
+    # Un passage, mais les candidats de motifs différents peuvent se chevaucher
+    candidates.sort(key=lambda candidate: candidate.start)
+    return ContactMatches(candidates)
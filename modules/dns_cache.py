@@ -0,0 +1,121 @@
+"""
+Pré-résolution DNS asynchrone des domaines candidats
+La plupart des domaines devinés à partir du nom d'une entreprise n'existent
+pas : une résolution DNS (quelques millisecondes) les écarte avant toute
+tentative de connexion HTTP. Les réponses positives et NXDOMAIN sont gardées
+en cache disque d'une exécution à l'autre
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from config import Config
+from .ttl_cache import PersistentTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Erreurs getaddrinfo signifiant que le domaine n'existe pas (les autres, comme
+# EAI_AGAIN, sont temporaires : on laisse alors la requête HTTP se faire)
+_NOT_FOUND_ERRORS = {socket.EAI_NONAME}
+if hasattr(socket, 'EAI_NODATA'):
+    _NOT_FOUND_ERRORS.add(socket.EAI_NODATA)
+
+
+class DNSCache:
+    def __init__(self):
+        self.config = Config()
+        self.memory: Dict[str, Tuple[bool, float]] = {}  # hôte -> (existe, expiration)
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self.lookups = 0
+        self.dropped = 0
+
+        self.cache = None
+        if self.config.DNS_CACHE_ENABLED:
+            self.cache = PersistentTTLCache(
+                os.path.join(self.config.CACHE_DIR, 'dns_cache.sqlite'),
+                table='dns',
+                ttl=self.config.DNS_CACHE_TTL_HOURS * 3600,
+                negative_ttl=self.config.DNS_NEGATIVE_TTL_HOURS * 3600,
+                max_entries=self.config.DNS_CACHE_MAX_ENTRIES
+            )
+
+    async def resolves(self, host: str) -> bool:
+        """Indique si un nom d'hôte existe (True en cas de doute)"""
+        host = (host or '').lower().rstrip('.')
+        if not host:
+            return False
+        known = self.memory.get(host)
+        if known and known[1] > time.time():
+            return known[0]
+
+        if self.cache:
+            cached = self.cache.get(host)
+            if cached is not None:
+                self._remember(host, cached['exists'])
+                return cached['exists']
+
+        # Une seule résolution en cours par hôte
+        task = self.in_flight.get(host)
+        if task is None:
+            task = self.in_flight[host] = asyncio.ensure_future(self._lookup(host))
+            task.add_done_callback(lambda _: self.in_flight.pop(host, None))
+        exists = await asyncio.shield(task)
+        return exists if exists is not None else True
+
+    async def _lookup(self, host: str) -> Optional[bool]:
+        """Résout l'hôte ; None si la réponse n'est pas concluante (délai, erreur temporaire)"""
+        self.lookups += 1
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(
+                loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM),
+                timeout=self.config.DNS_TIMEOUT
+            )
+            exists = True
+        except socket.gaierror as e:
+            if e.errno not in _NOT_FOUND_ERRORS:
+                logger.debug(f"Résolution DNS non concluante pour {host}: {str(e)}")
+                return None
+            exists = False
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug(f"Résolution DNS non concluante pour {host}: {str(e)}")
+            return None
+
+        self._remember(host, exists)
+        if self.cache:
+            self.cache.set(host, {'exists': exists}, negative=not exists)
+        return exists
+
+    def _remember(self, host: str, exists: bool):
+        hours = self.config.DNS_CACHE_TTL_HOURS if exists else self.config.DNS_NEGATIVE_TTL_HOURS
+        self.memory[host] = (exists, time.time() + hours * 3600)
+
+    async def filter_urls(self, urls: List[str]) -> List[str]:
+        """Garde les URLs dont le domaine existe, dans leur ordre d'origine"""
+        results = await asyncio.gather(*(self.resolves(urlparse(url).hostname) for url in urls))
+        kept = [url for url, exists in zip(urls, results) if exists]
+        if len(kept) < len(urls):
+            self.dropped += len(urls) - len(kept)
+            logger.debug(f"🌐 DNS: {len(urls) - len(kept)}/{len(urls)} domaines inexistants écartés")
+        return kept
+
+    def stats(self) -> Dict[str, int]:
+        stats = {'lookups': self.lookups, 'dropped': self.dropped}
+        if self.cache:
+            stats.update(self.cache.stats())
+        return stats
+
+
+_dns_cache: Optional[DNSCache] = None
+
+
+def get_dns_cache() -> DNSCache:
+    """Cache DNS unique pour tout le processus"""
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = DNSCache()
+    return _dns_cache
@@ -0,0 +1,97 @@
+"""
+Filtrage des URLs candidates par nom de domaine
+Le nom d'hôte est extrait une fois par URL puis comparé à des ensembles : un
+domaine bloqué (annuaires, réseaux sociaux, moteurs de recherche) l'est avec
+tous ses sous-domaines (fr.linkedin.com), une extension étrangère est lue sur
+le dernier label du nom d'hôte. Le chemin de l'URL n'est plus pris en compte
+(« /contact.be » ou « /news.us » ne font plus rejeter un site)
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Annuaires et réseaux sociaux : jamais le site officiel d'une entreprise
+BLACKLIST = [
+    'facebook.com', 'linkedin.com', 'twitter.com', 'instagram.com',
+    'youtube.com', 'google.com', 'wikipedia.org', 'pages-jaunes.fr', 'pagesjaunes.fr',
+    'societe.com', 'verif.com', 'infogreffe.fr', 'company.com',
+    'glassdoor.com', 'indeed.com', 'jobijoba.com', 'monster.fr'
+]
+
+# Pages internes des moteurs de recherche
+SEARCH_ENGINE_DOMAINS = [
+    'google.com', 'bing.com', 'duckduckgo.com', 'yahoo.com',
+    'startpage.com', 'searx.be', 'yandex.com'
+]
+
+# Extensions de pays étrangers évidents
+FOREIGN_TLDS = ['us', 'uk', 'de', 'es', 'it', 'ca', 'au', 'be', 'nl']
+
+
+# Nom d'hôte d'une URL absolue (une seule recherche en C ; urlparse coûte plusieurs µs par URL)
+_HOST = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*://(?:[^@/?#]*@)?(\[[^\]]*\]|[^:/?#]*)')
+
+
+def hostname(url: str) -> str:
+    """Nom d'hôte en minuscules, sans www. ni point final ('' si l'URL n'en a pas)"""
+    match = _HOST.match(url)
+    if match is None:
+        return ''
+    host = match.group(1).lower().rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+class DomainFilter:
+    def __init__(self, blocked_domains: Iterable[str] = (), blocked_tlds: Iterable[str] = ()):
+        """
+        blocked_domains: domaines refusés, sous-domaines compris
+        blocked_tlds: extensions refusées (sans le point)
+        """
+        self.blocked_domains = {domain.lower().lstrip('.') for domain in blocked_domains}
+        self.blocked_tlds = {tld.lower().lstrip('.') for tld in blocked_tlds}
+        self.rejected: Dict[str, int] = {'blacklist': 0, 'foreign': 0, 'invalid': 0}
+        self.decisions: Dict[str, Optional[str]] = {}  # Décision par nom d'hôte (les mêmes reviennent souvent)
+
+    def reason(self, url: str) -> Optional[str]:
+        """Motif de rejet d'une URL ('blacklist', 'foreign', 'invalid'), None si elle est acceptée"""
+        host = hostname(url)
+        if host not in self.decisions:
+            if len(self.decisions) >= 10000:
+                self.decisions.clear()
+            self.decisions[host] = self._host_reason(host)
+        return self.decisions[host]
+
+    def _host_reason(self, host: str) -> Optional[str]:
+        if not host:
+            return 'invalid'
+        last_dot = host.rfind('.')
+        if host[last_dot + 1:] in self.blocked_tlds:
+            return 'foreign'
+        # Le domaine et chacun de ses suffixes (a.b.linkedin.com -> b.linkedin.com -> linkedin.com)
+        position = 0
+        while position < last_dot:
+            if host[position:] in self.blocked_domains:
+                return 'blacklist'
+            position = host.index('.', position) + 1
+        return None
+
+    def allows(self, url: str) -> bool:
+        reason = self.reason(url)
+        if reason:
+            self.rejected[reason] += 1
+        return reason is None
+
+    def filter(self, urls: Iterable[str]) -> List[str]:
+        """URLs acceptées, dans leur ordre d'origine"""
+        return [url for url in urls if self.allows(url)]
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.rejected)
+
+
+def default_filter() -> DomainFilter:
+    """Filtre des résultats de recherche : annuaires, réseaux sociaux, moteurs, pays étrangers"""
+    return DomainFilter(BLACKLIST + SEARCH_ENGINE_DOMAINS, FOREIGN_TLDS)
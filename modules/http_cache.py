@@ -0,0 +1,121 @@
+"""
+Cache HTTP conditionnel sur disque pour les sites d'entreprises
+Les pages d'accueil changent rarement d'un jour à l'autre : le corps est gardé
+compressé (zlib) avec son ETag / Last-Modified, la requête suivante envoie
+If-None-Match / If-Modified-Since et un 304 réutilise le corps stocké.
+La taille totale est bornée (éviction des entrées les moins récemment utilisées)
+"""
+
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPCache:
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        path: fichier SQLite (créé si besoin)
+        max_bytes: taille maximale des corps compressés stockés
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.revalidated = 0
+        self.stored = 0
+        self.evictions = 0
+
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute('CREATE INDEX IF NOT EXISTS http_cache_accessed ON http_cache (accessed_at)')
+        self.db.commit()
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Entrée stockée pour une URL (corps encore compressé), sinon None"""
+        row = self.db.execute(
+            'SELECT final_url, etag, last_modified, encoding, body FROM http_cache WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'final_url': row[0], 'etag': row[1], 'last_modified': row[2], 'encoding': row[3], 'body': row[4]}
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """En-têtes de revalidation pour une entrée stockée"""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidate(self, url: str, entry: Dict[str, Any]) -> bytes:
+        """Réponse 304 : marque l'entrée comme utilisée et retourne le corps décompressé"""
+        self.revalidated += 1
+        self.db.execute('UPDATE http_cache SET accessed_at = ? WHERE url = ?', (time.time(), url))
+        self.db.commit()
+        return zlib.decompress(entry['body'])
+
+    def store(self, url: str, final_url: str, body: bytes, etag: Optional[str],
+              last_modified: Optional[str], encoding: Optional[str] = None):
+        """Enregistre une réponse 200 (seulement si elle est revalidable)"""
+        if not etag and not last_modified:
+            return
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return
+
+        now = time.time()
+        self.db.execute(
+            'INSERT OR REPLACE INTO http_cache '
+            '(url, final_url, etag, last_modified, encoding, body, size, stored_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, final_url, etag, last_modified, encoding, compressed, len(compressed), now, now)
+        )
+        self.stored += 1
+        self._evict()
+        self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self.db.execute('SELECT url, size FROM http_cache ORDER BY accessed_at').fetchall():
+            self.db.execute('DELETE FROM http_cache WHERE url = ?', (url,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        entries, size = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache').fetchone()
+        return {
+            'revalidated': self.revalidated,
+            'stored': self.stored,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size
+        }
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,54 @@
+"""
+Pool de connexions HTTP partagé par tous les modules
+Un seul TCPConnector par processus (limites globales et par hôte, cache DNS,
+keep-alive) : chaque module garde sa propre ClientSession (en-têtes, timeouts)
+mais emprunte les connexions du pool commun
+"""
+
+import asyncio
+import logging
+from typing import Optional
+import aiohttp
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_connector: Optional[aiohttp.TCPConnector] = None
+_connector_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_connector() -> aiohttp.TCPConnector:
+    """Retourne le connecteur partagé, créé à la demande pour la boucle courante"""
+    global _connector, _connector_loop
+    loop = asyncio.get_running_loop()
+
+    if _connector is None or _connector.closed or _connector_loop is not loop:
+        config = Config()
+        _connector = aiohttp.TCPConnector(
+            limit=config.HTTP_POOL_LIMIT,
+            limit_per_host=config.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True
+        )
+        _connector_loop = loop
+        logger.info(
+            f"🔌 Pool HTTP créé (max {config.HTTP_POOL_LIMIT} connexions, "
+            f"{config.HTTP_POOL_LIMIT_PER_HOST} par hôte)"
+        )
+    return _connector
+
+
+def create_session(**kwargs) -> aiohttp.ClientSession:
+    """Crée une ClientSession qui emprunte le pool partagé sans en être propriétaire"""
+    return aiohttp.ClientSession(connector=get_connector(), connector_owner=False, **kwargs)
+
+
+async def close_http_pool():
+    """Ferme le pool partagé (fin d'exécution ou arrêt du serveur)"""
+    global _connector, _connector_loop
+    if _connector is not None and not _connector.closed:
+        await _connector.close()
+        logger.info("🔌 Pool HTTP fermé")
+    _connector = None
+    _connector_loop = None
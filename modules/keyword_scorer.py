@@ -0,0 +1,74 @@
+"""
+Recherche de mots-clés par groupes en un seul passage
+Tous les groupes (indicateurs français, commerciaux, étrangers, mots du nom de
+l'entreprise) sont compilés dans un seul automate Aho-Corasick : le texte est
+parcouru une fois et chaque groupe reçoit la liste des mots-clés trouvés.
+Sans pyahocorasick (installé par requirements.txt), repli sur une recherche
+de sous-chaînes qui saute les mots-clés déjà trouvés : plus rapide en Python
+qu'une expression régulière unique (alternative de tous les mots-clés)
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    import ahocorasick
+except ImportError:  # Installation sans requirements.txt
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('auto', 'ahocorasick', 'substring')
+
+
+class KeywordScorer:
+    def __init__(self, groups: Dict[str, Iterable[str]], backend: str = 'auto'):
+        """
+        groups: nom du groupe -> mots-clés (comparés en minuscules)
+        backend: 'ahocorasick' (automate), 'substring' (repli), 'auto' (automate si disponible)
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend inconnu: {backend}")
+        if backend == 'ahocorasick' and ahocorasick is None:
+            raise ValueError("pyahocorasick n'est pas installé")
+
+        self.groups: Dict[str, List[str]] = {
+            name: list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+            for name, keywords in groups.items()
+        }
+        self.keywords: List[str] = list(dict.fromkeys(
+            keyword for keywords in self.groups.values() for keyword in keywords
+        ))
+        # Longueur max : recouvrement nécessaire entre deux morceaux d'un texte lu en flux
+        self.max_length = max((len(keyword) for keyword in self.keywords), default=0)
+
+        self.backend = 'ahocorasick' if backend != 'substring' and ahocorasick is not None else 'substring'
+        self.automaton = None
+        if self.backend == 'ahocorasick' and self.keywords:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+
+    def find(self, text: str, skip: Optional[Set[str]] = None) -> Set[str]:
+        """Mots-clés présents dans `text` (déjà en minuscules)
+
+        skip : mots-clés déjà trouvés, inutile de les chercher à nouveau
+        """
+        if self.automaton is not None:
+            return {keyword for _, keyword in self.automaton.iter(text)}
+        if not self.keywords:
+            return set()
+        return {keyword for keyword in self.keywords if (not skip or keyword not in skip) and keyword in text}
+
+    def split(self, found: Set[str]) -> Dict[str, Set[str]]:
+        """Répartit des mots-clés trouvés entre les groupes"""
+        return {name: {keyword for keyword in keywords if keyword in found} for name, keywords in self.groups.items()}
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Mots-clés trouvés par groupe, en un passage sur le texte"""
+        return self.split(self.find(text.lower()))
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Nombre de mots-clés distincts trouvés par groupe"""
+        return {name: len(found) for name, found in self.scan(text).items()}
@@ -0,0 +1,216 @@
+"""
+Variantes du nom d'une entreprise pour la recherche de son site
+Chaque variante coûte des requêtes (URLs directes + Bing) : les variantes sont
+classées par vraisemblance (forme juridique retirée, accents retirés,
+découpage d'un sigle en mots fréquents, remplacements phonétiques),
+dédoublonnées par slug d'URL (deux variantes qui donnent le même domaine ne
+sont testées qu'une fois) et retournées dans un ordre stable d'une exécution
+à l'autre
+"""
+
+import logging
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LEGAL_FORMS = ['sarl', 'sas', 'sa', 'eurl', 'sasu', 'sci', 'association', 'ass']
+
+# Mots retirés du slug (domaine deviné)
+SLUG_STOP_WORDS = [
+    'sarl', 'sas', 'sa', 'eurl', 'sasu', 'sci',
+    'société', 'entreprise', 'ets', 'etablissements',
+    'groupe', 'compagnie', 'cie', 'et', 'de', 'la', 'le', 'les',
+    'du', 'des', 'au', 'aux', 'pour', 'avec', 'sans'
+]
+
+PHONETIC_REPLACEMENTS = {
+    'PH': 'F',
+    'C': 'K',
+    'QU': 'K',
+    'X': 'KS',
+    'Z': 'S',
+    'J': 'G',
+    'EMAT': 'EMAS'
+}
+
+# Fréquences indicatives (occurrences par million) de mots et racines courants
+# dans les noms d'entreprises françaises ; NAME_VARIANTS_WORDLIST permet de
+# fournir une vraie liste de fréquences
+BUILTIN_FREQUENCIES = {
+    'france': 400, 'groupe': 300, 'service': 250, 'services': 250, 'conseil': 200, 'gestion': 180,
+    'transport': 150, 'transports': 120, 'batiment': 120, 'construction': 120, 'immobilier': 150,
+    'immo': 90, 'habitat': 80, 'energie': 90, 'environnement': 90, 'industrie': 80, 'agri': 40,
+    'agro': 40, 'auto': 120, 'bio': 80, 'eco': 70, 'tech': 90, 'info': 120, 'informatique': 80,
+    'media': 70, 'com': 150, 'net': 60, 'pro': 150, 'plus': 200, 'sud': 150, 'nord': 150,
+    'est': 300, 'ouest': 150, 'centre': 150, 'ile': 60, 'paris': 300, 'lyon': 120, 'bretagne': 80,
+    'normandie': 60, 'alpes': 60, 'provence': 60, 'atlantique': 50, 'ocean': 40, 'mer': 150,
+    'terre': 150, 'bois': 120, 'pierre': 120, 'eau': 200, 'air': 150, 'sol': 80, 'soleil': 80,
+    'vert': 80, 'bleu': 80, 'maison': 250, 'jardin': 80, 'cuisine': 80, 'sante': 150, 'medical': 60,
+    'pharma': 30, 'care': 20, 'aide': 150, 'emploi': 100, 'formation': 120, 'education': 60,
+    'ecole': 120, 'sport': 120, 'loisirs': 60, 'voyage': 80, 'voyages': 60, 'travel': 20,
+    'hotel': 100, 'restaurant': 100, 'food': 20, 'boulangerie': 20, 'boucherie': 15, 'vin': 80,
+    'vins': 40, 'cave': 40, 'ferme': 60, 'elevage': 20, 'garage': 60, 'meca': 20, 'mecanique': 30,
+    'elec': 30, 'electricite': 40, 'plomberie': 15, 'chauffage': 30, 'clim': 10, 'toiture': 10,
+    'renov': 20, 'renovation': 30, 'peinture': 40, 'menuiserie': 20, 'metal': 40, 'acier': 30,
+    'beton': 20, 'travaux': 100, 'tp': 20, 'nettoyage': 30, 'proprete': 10, 'securite': 100,
+    'protection': 80, 'assurance': 80, 'assurances': 40, 'finance': 80, 'capital': 80,
+    'invest': 20, 'patrimoine': 50, 'expert': 60, 'expertise': 50, 'audit': 30, 'compta': 20,
+    'juridique': 30, 'avocat': 50, 'avocats': 30, 'notaire': 30, 'architecte': 30, 'archi': 10,
+    'design': 40, 'studio': 60, 'atelier': 80, 'creation': 80, 'communication': 80, 'digital': 40,
+    'web': 60, 'data': 40, 'logiciel': 30, 'systemes': 40, 'solutions': 80, 'reseau': 60,
+    'logistique': 40, 'distribution': 60, 'commerce': 100, 'negoce': 15, 'import': 40,
+    'export': 40, 'inter': 60, 'international': 100, 'euro': 80, 'europe': 120, 'national': 80,
+    'regional': 60, 'local': 100, 'gen': 30, 'general': 150, 'generale': 80, 'nouvelle': 150,
+    'nouveau': 150, 'avenir': 80, 'horizon': 40, 'concept': 50, 'projet': 120, 'projets': 60,
+    'ingenierie': 30, 'etudes': 60, 'recherche': 100, 'labo': 20, 'laboratoire': 40,
+    'art': 150, 'arts': 60, 'culture': 100, 'musique': 80, 'photo': 60, 'print': 15, 'impression': 30,
+    'edition': 60, 'editions': 50, 'presse': 60, 'radio': 60, 'tele': 40, 'cine': 20, 'animation': 40,
+    'social': 100, 'solidaire': 30, 'solidarite': 40, 'familles': 60, 'famille': 150, 'enfance': 40,
+    'jeunesse': 50, 'seniors': 20, 'amis': 80, 'club': 80, 'union': 100, 'action': 120,
+    'acces': 60, 'alliance': 40, 'ami': 80
+}
+
+
+@dataclass
+class NameVariant:
+    name: str
+    slug: str  # Domaine deviné (sans extension), clé de dédoublonnage
+    score: float  # Vraisemblance estimée, de 0 à 1
+    kind: str  # 'legal_form', 'ascii', 'split', 'phonetic'
+
+
+def slugify(company_name: str) -> str:
+    """Nettoie un nom d'entreprise pour créer une URL"""
+    name = company_name.lower()
+
+    # Supprimer les mots courants
+    for word in SLUG_STOP_WORDS:
+        name = name.replace(f' {word} ', ' ')
+        name = name.replace(f' {word}', '')
+        name = name.replace(f'{word} ', '')
+
+    # Nettoyer les caractères spéciaux
+    name = re.sub(r'[^a-zA-Z0-9\s-]', '', name)
+
+    # Remplacer espaces par tirets
+    name = re.sub(r'\s+', '-', name.strip())
+
+    # Supprimer les tirets multiples
+    name = re.sub(r'-+', '-', name)
+
+    return name.strip('-')
+
+
+def load_frequencies(path: str) -> Dict[str, float]:
+    """Liste de fréquences : un mot par ligne, suivi éventuellement de son nombre d'occurrences"""
+    frequencies = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            word = strip_accents(parts[0].lower())
+            try:
+                count = float(parts[1]) if len(parts) > 1 else 1.0
+            except ValueError:
+                continue
+            frequencies[word] = max(frequencies.get(word, 0.0), count)
+    return frequencies
+
+
+def strip_accents(text: str) -> str:
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+class NameVariants:
+    def __init__(self, wordlist_path: Optional[str] = None, max_splits: int = 3):
+        """
+        wordlist_path: liste de fréquences de mots français (sinon liste intégrée)
+        max_splits: nombre maximal de découpages d'un même sigle retenus
+        """
+        frequencies = BUILTIN_FREQUENCIES
+        if wordlist_path:
+            try:
+                frequencies = load_frequencies(wordlist_path)
+                logger.info(f"📚 Liste de fréquences chargée: {len(frequencies)} mots")
+            except OSError as e:
+                logger.warning(f"⚠️ Liste de fréquences illisible ({wordlist_path}): {str(e)}")
+        self.max_splits = max_splits
+
+        # Score d'un mot entre 0 et 1 (échelle logarithmique)
+        top = math.log10(max(frequencies.values(), default=1) + 1)
+        self.word_scores = {word: math.log10(count + 1) / top for word, count in frequencies.items()}
+
+    def rank(self, company_name: str) -> List[NameVariant]:
+        """Variantes classées par vraisemblance décroissante, une par slug (nom d'origine exclu)"""
+        candidates: List[NameVariant] = []
+
+        def add(name: str, score: float, kind: str):
+            name = re.sub(r'\s+', ' ', name).strip()
+            if name:
+                candidates.append(NameVariant(name, slugify(name), score, kind))
+
+        # Supprimer les formes juridiques (mots entiers)
+        words = company_name.split()
+        kept = [word for word in words if word.lower().strip('.,') not in LEGAL_FORMS]
+        if kept and len(kept) < len(words):
+            add(' '.join(kept), 0.9, 'legal_form')
+
+        # Accents retirés : le slug ignore les caractères accentués (é -> rien)
+        ascii_name = strip_accents(company_name)
+        if ascii_name != company_name:
+            add(ascii_name, 0.85, 'ascii')
+
+        # Sigles -> mots (ex: ACOGEMAS -> ACO GEMAS), découpages les plus probables
+        for name, score in self._split_acronym(company_name):
+            add(name, score, 'split')
+
+        # Remplacements phonétiques courants
+        upper = company_name.upper()
+        for old, new in PHONETIC_REPLACEMENTS.items():
+            if old in upper:
+                add(upper.replace(old, new), 0.15, 'phonetic')
+
+        # Tri stable : à score égal, l'ordre de génération est conservé
+        candidates.sort(key=lambda variant: -variant.score)
+        seen = {slugify(company_name)}
+        ranked = []
+        for variant in candidates:
+            if not variant.slug or variant.slug in seen:
+                continue
+            seen.add(variant.slug)
+            ranked.append(variant)
+        return ranked
+
+    def top(self, company_name: str, k: int) -> List[str]:
+        """Les k variantes les plus probables"""
+        return [variant.name for variant in self.rank(company_name)[:k]]
+
+    def _split_acronym(self, company_name: str) -> List[tuple]:
+        """Découpages d'un nom en un seul mot majuscule, notés par la fréquence des segments"""
+        name = company_name.strip()
+        if not (4 <= len(name) <= 20 and name.isalpha() and name.isupper()):
+            return []
+
+        lower = name.lower()
+        splits = []
+        for parts in (2, 3):
+            for cuts in combinations(range(2, len(name) - 1), parts - 1):
+                bounds = (0,) + cuts + (len(name),)
+                segments = [lower[a:b] for a, b in zip(bounds, bounds[1:])]
+                if any(len(segment) < 2 for segment in segments):
+                    continue
+                # Part du nom couverte par des mots connus, pondérée par leur fréquence
+                coverage = sum(len(s) * self.word_scores.get(s, 0.0) for s in segments) / len(name)
+                # À couverture égale, préférer peu de segments de longueurs équilibrées
+                balance = (max(map(len, segments)) - min(map(len, segments))) / len(name)
+                score = 0.2 + 0.6 * coverage - 0.02 * (parts - 2) - 0.01 * balance
+                splits.append((' '.join(name[a:b] for a, b in zip(bounds, bounds[1:])), score))
+
+        splits.sort(key=lambda split: -split[1])
+        return splits[:self.max_splits]
@@ -0,0 +1,266 @@
+"""
+Cache mémoire des pages téléchargées pendant une exécution
+Une même page d'accueil était téléchargée jusqu'à quatre fois par entreprise
+(test d'URL, vérification de pertinence, extraction des coordonnées, raison
+sociale) : chaque URL n'est plus téléchargée qu'une fois. Les pages sont
+indexées par URL finale (après redirections), la taille totale est bornée
+(éviction LRU) et les demandes simultanées d'une même URL partagent un seul
+téléchargement, annulé quand tous ses demandeurs l'ont été. Avec un
+HTTPCache, les pages des exécutions précédentes sont revalidées (requête
+conditionnelle) au lieu d'être retéléchargées.
+Avec une RelevanceCheck, la page est analysée pendant sa lecture et le
+téléchargement est abandonné dès qu'elle est jugée non pertinente
+"""
+
+import asyncio
+import codecs
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+import aiohttp
+import charset_normalizer
+from .rate_limiter import get_rate_limiter
+from .http_cache import HTTPCache
+from .relevance import RelevanceCheck
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Page:
+    url: str  # URL finale (après redirections)
+    status: int
+    text: str
+    size: int  # Taille du corps en octets
+    fetched_at: float
+    truncated: bool = False  # Lecture abandonnée (page non pertinente), jamais mise en cache
+
+
+def _key(url: str) -> str:
+    return url.split('#', 1)[0]
+
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+
+def _charset(name: Optional[str]) -> Optional[str]:
+    """Nom normalisé d'un encodage connu de Python, sinon None"""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def _sniff_charset(body: bytes) -> Optional[str]:
+    """Encodage déclaré par <meta charset> ou <meta http-equiv> dans le début de la page"""
+    match = _META_CHARSET.search(body[:4096])
+    return _charset(match.group(1).decode('ascii', errors='ignore')) if match else None
+
+
+def _body_encoding(response, body: bytes) -> str:
+    """Encodage d'une page comme response.get_encoding() : en-tête, <meta charset>, puis détection"""
+    encoding = _charset(response.charset) or _sniff_charset(body)
+    if encoding:
+        return encoding
+    if not body:
+        return 'utf-8'
+    best = charset_normalizer.from_bytes(body).best()
+    return (best and _charset(best.encoding)) or 'utf-8'
+
+
+class PageCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_age: float = 3600,
+                 http_cache: Optional[HTTPCache] = None, max_page_bytes: int = 2 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_page_bytes = max_page_bytes  # Lecture max d'une page jugée pertinente
+        self.max_age = max_age
+        self.http_cache = http_cache
+        self.pages: 'OrderedDict[str, Page]' = OrderedDict()
+        self.aliases: Dict[str, str] = {}  # URL demandée -> URL finale
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self.waiters: Dict[asyncio.Task, int] = {}  # Appelants en attente de chaque téléchargement
+        self.rate_limiter = get_rate_limiter()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[Page]:
+        """Page en cache pour une URL (demandée ou finale), sinon None"""
+        key = _key(url)
+        key = self.aliases.get(key, key)
+        page = self.pages.get(key)
+        if page is None:
+            return None
+        if time.time() - page.fetched_at > self.max_age:
+            self._remove(key)
+            return None
+        self.pages.move_to_end(key)
+        return page
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str,
+                    timeout: Optional[aiohttp.ClientTimeout] = None,
+                    check: Optional[RelevanceCheck] = None) -> Optional[Page]:
+        """Retourne la page (depuis le cache ou téléchargée) ; None si la requête a échoué
+
+        Avec `check`, check.decision est renseignée pour toute page 200 ; si la
+        décision est connue d'avance (négative), aucune requête n'est envoyée.
+        """
+        page = self.get(url)
+        if page is not None:
+            self.hits += 1
+            if check is not None and page.status == 200:
+                check.scan(page.text)
+            return page
+
+        if check is not None and check.decision is False:
+            return None
+
+        key = _key(url)
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            page = await self._join(task)
+            if page is not None and page.truncated:
+                # Lecture abandonnée pour un autre appelant : téléchargement complet
+                return await self._download(session, url, timeout, check)
+            if page is not None and check is not None and page.status == 200:
+                check.scan(page.text)
+            return page
+
+        self.misses += 1
+        task = self.in_flight[key] = asyncio.ensure_future(self._download(session, url, timeout, check))
+        task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return await self._join(task)
+
+    async def _join(self, task: asyncio.Task) -> Optional[Page]:
+        """Attend un téléchargement partagé
+        
+        L'annulation d'un appelant n'interrompt pas le téléchargement des autres ;
+        quand le dernier appelant est annulé (ex: URL moins prioritaire qu'une
+        autre déjà acceptée), le téléchargement est annulé et libère sa connexion.
+        """
+        self.waiters[task] = self.waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            remaining = self.waiters.pop(task) - 1
+            if remaining:
+                self.waiters[task] = remaining
+            elif not task.done():
+                task.cancel()
+
+    async def _read_checked(self, response, check: RelevanceCheck):
+        """Lit le corps par morceaux en l'analysant ; abandonne si la page est rejetée
+
+        Une page acceptée est lue jusqu'au bout (dans la limite de max_page_bytes) :
+        elle servira au scrapping. Retourne (corps, texte, encodage, complet).
+        """
+        chunks = []
+        size = 0
+        charset = 'utf-8'
+        decoder = None
+        async for chunk in response.content.iter_chunked(16384):
+            if decoder is None:
+                # Encodage provisoire pour l'analyse en flux : en-tête, sinon <meta charset>
+                charset = _charset(response.charset) or _sniff_charset(chunk) or 'utf-8'
+                decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+            chunks.append(chunk)
+            size += len(chunk)
+            if check.decision is None:
+                check.feed(decoder.decode(chunk), size=len(chunk))
+            if check.decision is False:
+                break
+            if size >= self.max_page_bytes:
+                logger.debug(f"Page {response.url} tronquée à {size // 1024} Ko")
+                break
+
+        body = b''.join(chunks)
+        if check.decision is False:
+            # Page rejetée, jamais mise en cache : l'encodage provisoire suffit
+            return body, body.decode(charset, errors='replace'), charset, False
+        check.finish()
+        encoding = _body_encoding(response, body)
+        return body, body.decode(encoding, errors='replace'), encoding, True
+
+    async def _download(self, session, url, timeout, check: Optional[RelevanceCheck] = None) -> Optional[Page]:
+        stored = self.http_cache.lookup(url) if self.http_cache else None
+        try:
+            await self.rate_limiter.acquire(url)
+            kwargs = {'timeout': timeout} if timeout else {}
+            headers = HTTPCache.conditional_headers(stored)
+            async with session.get(url, headers=headers, **kwargs) as response:
+                self.rate_limiter.observe(url, response)
+                if response.status == 304 and stored:
+                    # Page inchangée depuis l'exécution précédente
+                    body = self.http_cache.revalidate(url, stored)
+                    text = body.decode(stored['encoding'] or 'utf-8', errors='replace')
+                    page = Page(stored['final_url'], 200, text, len(body), time.time())
+                    if check is not None:
+                        check.scan(text)
+                elif response.status == 200:
+                    if check is None:
+                        body = await response.read()
+                        text = await response.text(errors='replace')
+                    else:
+                        body, text, encoding, complete = await self._read_checked(response, check)
+                        if not complete:
+                            return Page(str(response.url), 200, text, len(body), time.time(), truncated=True)
+                    page = Page(str(response.url), 200, text, len(body), time.time())
+                    if self.http_cache:
+                        self.http_cache.store(
+                            url, page.url, body,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified'),
+                            encoding=response.get_encoding() if check is None else encoding
+                        )
+                else:
+                    page = Page(str(response.url), response.status, '', 0, time.time())
+        except Exception as e:
+            logger.debug(f"Échec du téléchargement de {url}: {str(e)}")
+            return None
+
+        self._store(_key(url), page)
+        return page
+
+    def _store(self, requested: str, page: Page):
+        if page.size > self.max_bytes:
+            return
+        final = _key(page.url)
+        if final in self.pages:
+            self._remove(final)
+        self.pages[final] = page
+        self.size += page.size
+        if requested != final:
+            self.aliases[requested] = final
+
+        while self.size > self.max_bytes and self.pages:
+            oldest = next(iter(self.pages))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        page = self.pages.pop(key, None)
+        if page is not None:
+            self.size -= page.size
+            for alias in [a for a, target in self.aliases.items() if target == key]:
+                del self.aliases[alias]
+
+    def stats(self) -> Dict[str, int]:
+        stats = {
+            'hits': self.hits,
+            'coalesced': self.coalesced,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'pages': len(self.pages),
+            'bytes': self.size
+        }
+        if self.http_cache:
+            stats['disk'] = self.http_cache.stats()
+        return stats
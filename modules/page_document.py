@@ -0,0 +1,180 @@
+"""
+Document partagé par les extracteurs d'une page
+Chaque extracteur (adresse, code postal, ville, email, téléphones) recalculait
+soup.get_text() sur tout l'arbre et lançait ses propres requêtes CSS. Le
+PageDocument calcule une seule fois, à la première demande, le texte visible,
+les candidats de coordonnées trouvés dans ce texte (contact_scanner), les liens
+tel: / mailto: et les index itemprop / class / id (un seul parcours de l'arbre).
+En mode partiel, seules les régions utiles de la page (pied de page, adresse,
+contact, mentions légales, schema.org) sont analysées, avec lxml si installé
+"""
+
+import logging
+import re
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from . import contact_scanner
+from .contact_scanner import ContactMatches
+
+try:
+    import lxml  # noqa: F401
+except ImportError:  # Dépendance optionnelle
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+# Régions où se trouvent presque toujours les coordonnées et la raison sociale :
+# pied de page, <address>, microdonnées schema.org, liens tel: / mailto:,
+# blocs contact / mentions légales et classes visées par les extracteurs
+REGION_TAGS = {'footer', 'address', 'title'}
+REGION_PATTERN = re.compile(
+    r'footer|pied|bottom|contact|coordonn|adress|address|mentions|legal|légal|siege|siège|'
+    r'phone|tel|mail|postal|cp|city|ville',
+    re.IGNORECASE
+)
+
+
+def _is_region(name: str, attrs: Optional[dict]) -> bool:
+    if name in REGION_TAGS:
+        return True
+    attrs = attrs or {}
+    if 'itemprop' in attrs or 'itemscope' in attrs:
+        return True
+    if name == 'a' and str(attrs.get('href', '')).startswith(('tel:', 'mailto:')):
+        return True
+    for key in ('class', 'id'):
+        value = attrs.get(key)
+        if value and REGION_PATTERN.search(value if isinstance(value, str) else ' '.join(value)):
+            return True
+    return False
+
+
+class RegionStrainer(SoupStrainer):
+    """Ne construit l'arbre que pour les régions utiles (et tout leur contenu)
+
+    allow_*_creation : bs4 >= 4.13 ; search / search_tag : versions antérieures
+    """
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return _is_region(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if isinstance(markup_name, Tag):
+            return markup_name if _is_region(markup_name.name, markup_name.attrs) else None
+        return markup_name if _is_region(markup_name, markup_attrs) else None
+
+    def search(self, markup):
+        return self.search_tag(markup) if isinstance(markup, Tag) else None
+
+
+def parser_backend(parser: str) -> str:
+    """Analyseur demandé, ou html.parser si lxml n'est pas installé"""
+    if parser == 'lxml' and lxml is None:
+        return 'html.parser'
+    return parser
+
+
+class PageDocument:
+    def __init__(self, soup: BeautifulSoup, partial: bool = False):
+        self.soup = soup
+        self.partial = partial  # Arbre limité aux régions utiles (RegionStrainer)
+        self._class_matches: Dict[str, List[Tag]] = {}
+        self._id_matches: Dict[str, List[Tag]] = {}
+
+    @classmethod
+    def of(cls, page: Union['PageDocument', BeautifulSoup]) -> 'PageDocument':
+        """Accepte un PageDocument ou un arbre BeautifulSoup (document créé pour l'occasion)"""
+        return page if isinstance(page, PageDocument) else cls(page)
+
+    @classmethod
+    def parse(cls, html: str) -> 'PageDocument':
+        return cls(BeautifulSoup(html, 'html.parser'))
+
+    @classmethod
+    def parse_regions(cls, html: str, parser: str = 'lxml') -> 'PageDocument':
+        """Arbre partiel : pied de page, contact, mentions légales, schema.org, liens tel: / mailto:"""
+        return cls(BeautifulSoup(html, parser_backend(parser), parse_only=RegionStrainer()), partial=True)
+
+    @cached_property
+    def text(self) -> str:
+        """Texte de la page (soup.get_text())"""
+        if self.partial:
+            # Une ligne par région : le texte de deux régions voisines ne se colle pas
+            return '\n'.join(region.get_text() for region in self.soup.contents)
+        return self.soup.get_text()
+
+    @cached_property
+    def contacts(self) -> ContactMatches:
+        """Candidats adresse / code postal / ville / email / téléphones, en un passage sur le texte"""
+        return contact_scanner.scan(self.text)
+
+    @cached_property
+    def _index(self) -> Tuple[Dict[str, List[Tag]], List[Tuple[str, Tag]], List[Tuple[str, Tag]], List[str], List[str]]:
+        """Un seul parcours de l'arbre : itemprop, attributs class / id, liens tel: et mailto:"""
+        itemprops: Dict[str, List[Tag]] = {}
+        classes: List[Tuple[str, Tag]] = []
+        ids: List[Tuple[str, Tag]] = []
+        tel_links: List[str] = []
+        mailto_links: List[str] = []
+
+        for element in self.soup.find_all(True):
+            attrs = element.attrs
+            if not attrs:
+                continue
+            itemprop = attrs.get('itemprop')
+            if itemprop:
+                itemprops.setdefault(itemprop if isinstance(itemprop, str) else ' '.join(itemprop), []).append(element)
+            css_class = attrs.get('class')
+            if css_class:
+                classes.append((css_class if isinstance(css_class, str) else ' '.join(css_class), element))
+            element_id = attrs.get('id')
+            if element_id:
+                ids.append((element_id, element))
+            if element.name == 'a':
+                href = attrs.get('href')
+                if isinstance(href, str):
+                    if href.startswith('tel:'):
+                        tel_links.append(href)
+                    elif href.startswith('mailto:'):
+                        mailto_links.append(href)
+
+        return itemprops, classes, ids, tel_links, mailto_links
+
+    def itemprop(self, name: str) -> List[Tag]:
+        """Éléments [itemprop="name"], dans l'ordre du document"""
+        return self._index[0].get(name, [])
+
+    def class_contains(self, fragment: str) -> List[Tag]:
+        """Éléments [class*="fragment"]"""
+        if fragment not in self._class_matches:
+            self._class_matches[fragment] = [element for value, element in self._index[1] if fragment in value]
+        return self._class_matches[fragment]
+
+    def id_contains(self, fragment: str) -> List[Tag]:
+        """Éléments [id*="fragment"]"""
+        if fragment not in self._id_matches:
+            self._id_matches[fragment] = [element for value, element in self._index[2] if fragment in value]
+        return self._id_matches[fragment]
+
+    @property
+    def tel_links(self) -> List[str]:
+        """href des liens a[href^="tel:"]"""
+        return self._index[3]
+
+    @property
+    def mailto_links(self) -> List[str]:
+        """href des liens a[href^="mailto:"]"""
+        return self._index[4]
+
+    def lookup(self, itemprop: str, fragments: Tuple[str, ...] = (), id_fragments: Tuple[str, ...] = ()) -> List[Tag]:
+        """Éléments des sélecteurs [itemprop=...], [class*=...], [id*=...], dans cet ordre"""
+        elements = list(self.itemprop(itemprop))
+        for fragment in fragments:
+            elements.extend(self.class_contains(fragment))
+        for fragment in id_fragments:
+            elements.extend(self.id_contains(fragment))
+        return elements
@@ -0,0 +1,135 @@
+"""
+Moteur de pipeline asynchrone par étapes
+Chaque étape possède sa propre file asyncio et son propre nombre de workers,
+ce qui évite qu'une étape lente (recherche web) bloque les suivantes. Les
+files sont bornées : une étape saturée ralentit la précédente, et le flux
+d'entrée (pages Airtable) n'avance qu'au rythme des workers
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Un handler reçoit un élément et retourne l'élément à transmettre à l'étape
+# suivante, ou None pour arrêter son traitement (rien d'autre à faire)
+StageHandler = Callable[[Any], Awaitable[Optional[Any]]]
+ErrorHandler = Callable[[str, Any, Exception], None]
+
+
+async def iterate(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    """Parcourt indifféremment une liste ou un flux asynchrone (ex: pages Airtable)"""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class Stage:
+    """Une étape du pipeline : une file d'attente + N workers"""
+
+    def __init__(self, name: str, handler: StageHandler, workers: int = 1,
+                 queue_size: Optional[int] = None):
+        """queue_size: éléments en attente maximum (par défaut 2 par worker)"""
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or 2 * self.workers)
+        self.in_progress = 0
+        self.processed = 0
+        self.failed = 0
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage], on_error: Optional[ErrorHandler] = None,
+                 report_interval: float = 30.0):
+        if not stages:
+            raise ValueError("Le pipeline doit contenir au moins une étape")
+        self.stages = stages
+        self.on_error = on_error
+        self.report_interval = report_interval
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Nombre d'éléments en attente dans la file de chaque étape"""
+        return {stage.name: stage.queue.qsize() for stage in self.stages}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """État détaillé de chaque étape (attente, en cours, traités, échecs)"""
+        return {
+            stage.name: {
+                'queued': stage.queue.qsize(),
+                'in_progress': stage.in_progress,
+                'processed': stage.processed,
+                'failed': stage.failed
+            }
+            for stage in self.stages
+        }
+
+    def format_stats(self) -> str:
+        """Résumé d'une ligne de l'état des files"""
+        return " | ".join(
+            f"{name}: {s['queued']} en attente, {s['in_progress']} en cours, {s['processed']} traités"
+            for name, s in self.stats().items()
+        )
+
+    async def _worker(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = await stage.queue.get()
+            stage.in_progress += 1
+            try:
+                result = await stage.handler(item)
+                stage.processed += 1
+                if result is not None and next_stage:
+                    await next_stage.queue.put(result)
+            except Exception as e:
+                # Isolation des erreurs : l'élément est abandonné, le pipeline continue
+                stage.failed += 1
+                if self.on_error:
+                    self.on_error(stage.name, item, e)
+                else:
+                    logger.error(f"❌ Erreur étape {stage.name}: {str(e)}")
+            finally:
+                stage.in_progress -= 1
+                stage.queue.task_done()
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger.info(f"📊 Pipeline — {self.format_stats()}")
+
+    async def run(self, items: Union[Iterable[Any], AsyncIterable[Any]]):
+        """Injecte les éléments dans la première étape et attend la fin du traitement
+
+        Avec un flux asynchrone, les workers traitent les premiers éléments
+        pendant que les suivants arrivent ; le flux n'est lu que lorsque la
+        file de la première étape a de la place.
+        """
+        workers = [
+            asyncio.create_task(self._worker(index))
+            for index, stage in enumerate(self.stages)
+            for _ in range(stage.workers)
+        ]
+        reporter = asyncio.create_task(self._report()) if self.report_interval else None
+
+        try:
+            async for item in iterate(items):
+                await self.stages[0].queue.put(item)
+
+            # Une étape est terminée quand sa file est vide et que tous ses workers
+            # ont transmis leurs résultats : on peut alors attendre la suivante
+            for stage in self.stages:
+                await stage.queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            if reporter:
+                reporter.cancel()
+            await asyncio.gather(*workers, *([reporter] if reporter else []), return_exceptions=True)
+
+        logger.info(f"🏁 Pipeline terminé — {self.format_stats()}")
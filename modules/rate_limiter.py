@@ -0,0 +1,138 @@
+"""
+Limiteur de débit par hôte (token bucket) partagé par tous les clients HTTP
+Remplace les pauses codées en dur : chaque module réserve un jeton auprès du
+même limiteur avant d'appeler un hôte, avec une capacité de rafale configurable
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Seau à jetons : `rate` jetons par seconde, au plus `burst` en réserve
+
+    Les jetons sont réservés de façon synchrone (pas de verrou asyncio, donc
+    utilisable d'une boucle d'évènements à l'autre) : un appelant qui trouve le
+    seau vide prend un jeton « à crédit » et dort le temps de le rembourser.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Réserve un jeton et retourne le délai d'attente avant de l'utiliser"""
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    async def acquire(self):
+        """Attend qu'un jeton soit disponible
+
+        Un appelant annulé pendant l'attente (recherche perdante d'une course)
+        rend son jeton : il n'a envoyé aucune requête.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.tokens += 1
+                raise
+
+    def penalize(self, seconds: float):
+        """Vide le seau pour que personne n'appelle l'hôte pendant `seconds` secondes"""
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    def __init__(self, limits: Dict[str, Tuple[float, int]], default: Optional[Tuple[float, int]] = None):
+        # Les clés sont des suffixes de nom d'hôte : 'bing.com' couvre 'www.bing.com'
+        self.limits = {host.lower(): limit for host, limit in limits.items()}
+        self.default = default
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket_key(self, host: str) -> Optional[str]:
+        labels = host.split('.')
+        for i in range(len(labels)):
+            suffix = '.'.join(labels[i:])
+            if suffix in self.limits:
+                return suffix
+        return host if self.default else None
+
+    def bucket_for(self, url: str) -> Optional[TokenBucket]:
+        """Retourne le seau associé à l'hôte d'une URL (ou à un nom d'hôte)"""
+        host = (urlparse(url).hostname if '://' in url else url) or ''
+        key = self._bucket_key(host.lower())
+        if key is None:
+            return None
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            rate, burst = self.limits.get(key, self.default)
+            bucket = self.buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+    async def acquire(self, url: str):
+        """Attend l'autorisation d'envoyer une requête vers l'hôte de `url`"""
+        bucket = self.bucket_for(url)
+        if bucket:
+            await bucket.acquire()
+
+    def penalize(self, url: str, seconds: float):
+        """Suspend les appels vers l'hôte de `url` (après un 429 par exemple)"""
+        bucket = self.bucket_for(url)
+        if bucket:
+            bucket.penalize(seconds)
+            logger.warning(f"⏳ Limite atteinte pour {urlparse(url).hostname or url}, pause de {seconds:.1f}s")
+
+    def observe(self, url: str, response) -> None:
+        """Tient compte d'une réponse HTTP : un 429 suspend l'hôte selon Retry-After"""
+        if response.status != 429:
+            return
+        try:
+            retry_after = float(response.headers.get('Retry-After', 1))
+        except (TypeError, ValueError):
+            retry_after = 1.0
+        self.penalize(url, retry_after)
+
+
+def _parse_limits(value: str) -> Dict[str, Tuple[float, int]]:
+    """Parse 'hote=debit:rafale,hote2=debit' (ex: 'bing.com=0.5:2')"""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        host, _, spec = entry.partition('=')
+        rate, _, burst = spec.partition(':')
+        limits[host.strip()] = (float(rate), int(burst or 1))
+    return limits
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Limiteur unique pour tout le processus"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        config = Config()
+        limits = dict(config.RATE_LIMITS)
+        limits.update(_parse_limits(config.RATE_LIMITS_OVERRIDE))
+        default = limits.pop('*', None)
+        _rate_limiter = RateLimiter(limits, default)
+    return _rate_limiter
@@ -0,0 +1,147 @@
+"""
+Vérification de pertinence d'un site, au fil de la lecture de la page
+Le texte est analysé morceau par morceau (dans la limite de max_bytes octets
+lus) : la décision tombe dès que le seuil est atteint ou ne peut plus l'être,
+sans télécharger ni parcourir le reste d'une page de plusieurs Mo. En mode
+strict, un indicateur étranger rejette la page où qu'il soit : elle n'est
+acceptée qu'une fois lue en entier (ou jusqu'à max_bytes). Tous les groupes
+de mots-clés sont cherchés en un passage par morceau (KeywordScorer)
+"""
+
+import logging
+from typing import Optional, Set
+from .keyword_scorer import KeywordScorer
+
+logger = logging.getLogger(__name__)
+
+# Vérification rapide (URLs directes)
+FAST_FRENCH_INDICATORS = ['france', 'français', 'fr', 'siret', 'siren', 'tva']
+
+# Vérification complète
+FRENCH_INDICATORS = [
+    'france', 'français', 'francais', 'fr',
+    'mentions légales', 'mentions legales',
+    'siret', 'siren', 'tva', 'intracom',
+    'adresse', 'téléphone', 'telephone'
+]
+BUSINESS_INDICATORS = [
+    'contact', 'services', 'produits', 'société', 'entreprise',
+    'accueil', 'à propos', 'qui sommes-nous', 'notre équipe'
+]
+FOREIGN_INDICATORS = [
+    'united states', 'usa', 'america', 'uk', 'england',
+    'germany', 'deutschland', 'spain', 'espana', 'italy'
+]
+
+
+class RelevanceCheck:
+    def __init__(self, url: str, company_name: str, strict: bool = False, max_bytes: int = 256 * 1024,
+                 backend: str = 'auto'):
+        """
+        strict=False : critères de la vérification rapide (30% des mots du nom,
+        un indicateur français, domaine .fr). strict=True : score complet
+        (indicateurs français/commerciaux, 50% des mots, aucun indicateur étranger)
+        max_bytes: octets du corps de la page lus au plus
+        """
+        self.url = url
+        self.strict = strict
+        self.max_bytes = max_bytes
+        self.company_words = list(dict.fromkeys(word.lower() for word in company_name.split() if len(word) > 2))
+        self.scorer = KeywordScorer({
+            'company': self.company_words,
+            'french': FRENCH_INDICATORS if strict else FAST_FRENCH_INDICATORS,
+            'business': BUSINESS_INDICATORS if strict else [],
+            'foreign': FOREIGN_INDICATORS if strict else [],
+        }, backend=backend)
+        self.found = {name: set() for name in self.scorer.groups}
+        self._found_all: Set[str] = set()
+        self.bytes_read = 0
+        self.decision: Optional[bool] = None
+
+        self._overlap = max(self.scorer.max_length - 1, 0)
+        self._tail = ''
+
+        # Critère connu sans lire la page : la vérification rapide exige un domaine .fr
+        if not strict and '.fr' not in url:
+            self.decision = False
+
+    @property
+    def found_words(self) -> Set[str]:
+        return self.found['company']
+
+    @property
+    def found_french(self) -> Set[str]:
+        return self.found['french']
+
+    @property
+    def found_business(self) -> Set[str]:
+        return self.found['business']
+
+    @property
+    def has_foreign(self) -> bool:
+        return bool(self.found['foreign'])
+
+    @property
+    def domain_score(self) -> int:
+        return 2 if '.fr' in self.url else (1 if '.com' in self.url else 0)
+
+    @property
+    def score(self) -> int:
+        return len(self.found_french) + len(self.found_words) * 2 + len(self.found_business) + self.domain_score
+
+    def _threshold_reached(self) -> bool:
+        if self.strict:
+            return (
+                self.score >= 5 and
+                len(self.found_words) >= len(self.company_words) * 0.5 and
+                len(self.found_french) >= 1
+            )
+        return len(self.found_words) >= len(self.company_words) * 0.3 and len(self.found_french) >= 1
+
+    def feed(self, text: str, size: Optional[int] = None) -> Optional[bool]:
+        """Analyse un morceau de page ; retourne la décision si elle est prise
+
+        size: taille du morceau en octets avant décodage (sinon, taille en UTF-8)
+        """
+        if self.decision is not None:
+            return self.decision
+
+        self.bytes_read += len(text.encode('utf-8', errors='replace')) if size is None else size
+        # Le recouvrement avec le morceau précédent capte les termes coupés en deux
+        window = self._tail + text.lower()
+        self._tail = window[-self._overlap:] if self._overlap else ''
+
+        new = self.scorer.find(window, skip=self._found_all) - self._found_all
+        if new:
+            self._found_all |= new
+            for name, keywords in self.scorer.split(new).items():
+                self.found[name] |= keywords
+
+        # Un indicateur étranger rend le seuil inatteignable
+        if self.has_foreign:
+            self.decision = False
+        elif self.bytes_read >= self.max_bytes:
+            self.decision = self._threshold_reached()
+        elif not self.strict and self._threshold_reached():
+            # Mode strict : pas d'acceptation anticipée, un indicateur étranger peut suivre
+            self.decision = True
+        return self.decision
+
+    def finish(self) -> bool:
+        """Décision finale avec ce qui a été lu"""
+        if self.decision is None:
+            self.decision = self._threshold_reached() and not self.has_foreign
+        return self.decision
+
+    def scan(self, text: str, chunk_size: int = 16384) -> bool:
+        """Analyse un texte déjà disponible, en s'arrêtant dès que la décision est prise"""
+        for start in range(0, len(text), chunk_size):
+            if self.feed(text[start:start + chunk_size]) is not None:
+                break
+        return self.finish()
+
+    def summary(self) -> str:
+        return (
+            f"score={self.score}, entreprise={len(self.found_words)}/{len(self.company_words)}, "
+            f"français={len(self.found_french)}, étranger={self.has_foreign}, lu={self.bytes_read // 1024}Ko"
+        )
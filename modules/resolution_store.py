@@ -0,0 +1,79 @@
+"""
+Mémoire des sites web déjà trouvés (entreprise -> site)
+Une fois le site d'une entreprise trouvé, les exécutions suivantes se
+contentent de vérifier qu'il répond toujours au lieu de relancer toute la
+recherche (URLs directes, Bing, variantes, OpenAI)
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from .ttl_cache import PersistentTTLCache, normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+# Confiance accordée au site selon la stratégie qui l'a trouvé
+STRATEGY_CONFIDENCE = {
+    'direct': 0.9,
+    'bing': 0.8,
+    'variant_direct': 0.7,
+    'variant_bing': 0.6,
+    'openai': 0.4,
+}
+
+
+class ResolutionStore:
+    def __init__(self, path: str, ttl: float, min_confidence: float = 0.5, max_entries: int = 100000):
+        """
+        path: fichier SQLite
+        ttl: durée de vie d'une résolution sans nouvelle vérification (secondes)
+        min_confidence: en dessous, la résolution stockée est ignorée (nouvelle recherche)
+        """
+        self.cache = PersistentTTLCache(path, table='websites', ttl=ttl, max_entries=max_entries)
+        self.min_confidence = min_confidence
+        self.reused = 0
+        self.stale = 0
+
+    @staticmethod
+    def _key(company_name: str, record_id: Optional[str] = None) -> str:
+        return f"record:{record_id}" if record_id else f"name:{normalize_company_name(company_name)}"
+
+    def get(self, company_name: str, record_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Résolution stockée utilisable, sinon None
+
+        Une résolution par record ID est ignorée si le nom a changé depuis dans Airtable.
+        """
+        entry = self.cache.get(self._key(company_name, record_id))
+        if not entry:
+            return None
+        if entry.get('name') != normalize_company_name(company_name):
+            return None
+        if entry.get('confidence', 0) < self.min_confidence:
+            return None
+        return entry
+
+    def save(self, company_name: str, url: str, strategy: str, record_id: Optional[str] = None,
+             confidence: Optional[float] = None):
+        """Enregistre (ou confirme) le site trouvé pour une entreprise"""
+        if confidence is None:
+            confidence = STRATEGY_CONFIDENCE.get(strategy, 0.5)
+        self.cache.set(self._key(company_name, record_id), {
+            'name': normalize_company_name(company_name),
+            'url': url,
+            'strategy': strategy,
+            'confidence': confidence,
+            'verified_at': datetime.now(timezone.utc).isoformat()
+        })
+
+    def confirm(self, company_name: str, entry: Dict[str, Any], record_id: Optional[str] = None):
+        """Le site stocké répond toujours : nouvelle date de vérification"""
+        self.reused += 1
+        self.save(company_name, entry['url'], entry['strategy'], record_id, entry['confidence'])
+
+    def forget(self, company_name: str, record_id: Optional[str] = None):
+        """Le site stocké ne répond plus : la prochaine recherche repart de zéro"""
+        self.stale += 1
+        self.cache.delete(self._key(company_name, record_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {'reused': self.reused, 'stale': self.stale, 'entries': len(self.cache)}
@@ -0,0 +1,159 @@
+"""
+Journal de progression d'une exécution (reprise après crash)
+Chaque étape terminée pour un enregistrement est ajoutée à un fichier JSONL
+(une ligne par évènement) : une exécution relancée avec --resume <run-id>
+saute le travail déjà fait et reprend les enregistrements incomplets à la
+première étape manquante
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Étapes journalisées, dans l'ordre du traitement
+STAGES = ('web', 'legal', 'solvability', 'written')
+
+
+class RunJournal:
+    def __init__(self, directory: str, run_id: Optional[str] = None, sync_interval: float = 1.0):
+        """
+        sync_interval: secondes minimum entre deux fsync. Chaque ligne est écrite
+        (flush) immédiatement et survit à l'arrêt du processus ; le fsync, qui
+        bloque la boucle asyncio, ne protège que d'une coupure de la machine
+        """
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.path = os.path.join(directory, f"{self.run_id}.jsonl")
+        self.meta: Dict[str, Any] = {}
+        # record_id -> {'company': ..., 'index': int, 'stages': {stage: data}, 'done': bool}
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self._last_sync = 0.0
+
+    @staticmethod
+    def latest_run_id(directory: str) -> Optional[str]:
+        """Identifiant de la dernière exécution journalisée"""
+        if not os.path.isdir(directory):
+            return None
+        runs = sorted(name[:-len('.jsonl')] for name in os.listdir(directory) if name.endswith('.jsonl'))
+        return runs[-1] if runs else None
+
+    @classmethod
+    def unfinished_run_id(cls, directory: str) -> Optional[str]:
+        """Dernière exécution journalisée si elle ne s'est pas terminée (à reprendre)"""
+        run_id = cls.latest_run_id(directory)
+        if run_id is None:
+            return None
+        journal = cls(directory, run_id)
+        journal.load()
+        return None if journal.meta.get('finished') else run_id
+
+    @staticmethod
+    def prune(directory: str, keep: int):
+        """Supprime les journaux les plus anciens pour n'en garder que `keep`"""
+        if not os.path.isdir(directory):
+            return
+        journals = sorted(name for name in os.listdir(directory) if name.endswith('.jsonl'))
+        for name in journals[:-keep] if keep > 0 else journals:
+            os.remove(os.path.join(directory, name))
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Rejoue le journal existant (une dernière ligne tronquée par un crash est ignorée)"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"⚠️ Ligne {line_number} du journal {self.run_id} illisible, ignorée")
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry: Dict[str, Any]):
+        event = entry.get('event')
+        if event == 'start':
+            self.meta = {k: v for k, v in entry.items() if k != 'event'}
+        elif event == 'company':
+            company = entry['company']
+            self.records.setdefault(company['id'], {
+                'company': company, 'index': entry.get('index'), 'stages': {}, 'done': False
+            })
+        elif event == 'stage':
+            record = self.records.get(entry['record_id'])
+            if record is not None:
+                record['stages'][entry['stage']] = entry.get('data') or {}
+        elif event == 'done':
+            record = self.records.get(entry['record_id'])
+            if record is not None:
+                record['done'] = True
+        elif event == 'fetch_complete':
+            self.meta['fetch_complete'] = True
+        elif event == 'finished':
+            self.meta['finished'] = True
+
+    def _write(self, entry: Dict[str, Any]):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._last_sync >= self.sync_interval:
+            self._sync(now)
+        self._apply(entry)
+
+    def _sync(self, now: Optional[float] = None):
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic() if now is None else now
+
+    def start(self, **meta):
+        """Enregistre les paramètres de l'exécution (ex: heure de début, mode incrémental)"""
+        self._write({'event': 'start', 'run_id': self.run_id, **meta})
+
+    def add_company(self, company: Dict[str, Any], index: int):
+        """Enregistre une entreprise à traiter dans cette exécution"""
+        if company.get('id') in self.records:
+            return
+        self._write({'event': 'company', 'index': index, 'company': {
+            'id': company.get('id'), 'name': company.get('name'), 'airtable_record_id': company.get('id')
+        }})
+
+    def record_fetch_complete(self):
+        """Toutes les pages Airtable ont été lues : la liste des entreprises est complète"""
+        self._write({'event': 'fetch_complete'})
+
+    def record_stage(self, record_id: str, stage: str, data: Optional[Dict[str, Any]] = None):
+        """Marque une étape comme terminée, avec les données nécessaires à la reprise"""
+        self._write({'event': 'stage', 'record_id': record_id, 'stage': stage, 'data': data or {}})
+
+    def record_done(self, record_id: str):
+        """Marque un enregistrement comme entièrement traité"""
+        self._write({'event': 'done', 'record_id': record_id})
+
+    def finish(self):
+        self._write({'event': 'finished'})
+        self._sync()
+
+    def completed_stages(self, record_id: str) -> Dict[str, Dict[str, Any]]:
+        record = self.records.get(record_id)
+        return record['stages'] if record else {}
+
+    def pending_companies(self) -> List[Dict[str, Any]]:
+        """Entreprises à (re)traiter, dans leur ordre d'origine"""
+        pending = [record for record in self.records.values() if not record['done']]
+        pending.sort(key=lambda record: record.get('index') or 0)
+        return [record['company'] for record in pending]
+
+    def close(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,44 @@
+"""
+État persistant entre deux exécutions (high-water mark des exécutions incrémentales)
+Fichier JSON écrit de façon atomique pour survivre à un arrêt brutal
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def utc_now_iso() -> str:
+    """Horodatage UTC au format attendu par les formules Airtable"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class RunState:
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ État d'exécution illisible ({path}), réinitialisé: {e}")
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        return self.data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Met à jour une valeur et réécrit le fichier"""
+        self.data[key] = value
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,110 @@
+"""
+Extraction des résultats naturels d'une page de résultats Bing
+Au lieu de construire l'arbre BeautifulSoup de toute la page (plusieurs
+centaines de Ko) et de parcourir chaque <a>, seuls les blocs de résultats
+naturels (li.b_algo) sont repérés par expressions régulières et seul le lien
+du titre (h2 > a) est lu : les liens de navigation, de publicité et des
+encarts sont ignorés. Les liens de suivi Bing (bing.com/ck/a?...&u=a1...)
+sont décodés et les résultats sont dédoublonnés par nom de domaine, dans
+l'ordre de classement
+"""
+
+import base64
+import html as html_lib
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+_RESULT_BLOCK = re.compile(r'<li\b[^>]*\bclass="[^"]*\bb_algo\b[^"]*"', re.IGNORECASE)
+_TITLE_LINK = re.compile(
+    r'<h2\b[^>]*>\s*<a\b[^>]*?\bhref="([^"]+)"[^>]*>(.*?)</a>',
+    re.IGNORECASE | re.DOTALL
+)
+_ANY_LINK = re.compile(r'<a\b[^>]*?\bhref="(https?://[^"]+)"', re.IGNORECASE)
+_TAGS = re.compile(r'<[^>]+>')
+
+# Taille maximale d'un bloc de résultat analysé (le dernier bloc n'a pas de suivant)
+_MAX_BLOCK = 20000
+
+EXCLUDED_HOSTS = ('bing.com', 'microsoft.com', 'msn.com', 'live.com')
+
+
+@dataclass
+class SerpResult:
+    rank: int  # Position parmi les résultats naturels retenus (1 = premier)
+    url: str
+    host: str  # Domaine sans www., clé de dédoublonnage
+    title: str = ''
+
+
+def decode_bing_link(href: str) -> Optional[str]:
+    """URL de destination d'un lien Bing (suivi /ck/a décodé) ; None si inexploitable"""
+    href = html_lib.unescape(href)
+    parsed = urlparse(href)
+    host = (parsed.hostname or '').lower()
+    if host.endswith('bing.com') and parsed.path.startswith('/ck/a'):
+        target = parse_qs(parsed.query).get('u', [''])[0]
+        if not target.startswith('a1'):
+            return None
+        encoded = target[2:]
+        try:
+            href = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            return None
+    return href if href.startswith(('http://', 'https://')) else None
+
+
+def _host(url: str) -> str:
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _is_excluded(host: str) -> bool:
+    return not host or any(host == excluded or host.endswith('.' + excluded) for excluded in EXCLUDED_HOSTS)
+
+
+def parse_bing(html: str, limit: Optional[int] = None) -> List[SerpResult]:
+    """Résultats naturels d'une page Bing, classés et dédoublonnés par domaine
+
+    Si aucun bloc de résultat n'est trouvé (mise en page modifiée), repli sur
+    tous les liens sortants de la page, comme l'ancienne extraction.
+    """
+    results: List[SerpResult] = []
+    seen = set()
+
+    def add(url: Optional[str], title: str = '') -> bool:
+        if not url:
+            return False
+        host = _host(url)
+        if _is_excluded(host) or host in seen:
+            return False
+        seen.add(host)
+        results.append(SerpResult(len(results) + 1, url, host, title))
+        return limit is not None and len(results) >= limit
+
+    starts = [match.start() for match in _RESULT_BLOCK.finditer(html)]
+    for index, start in enumerate(starts):
+        end = starts[index + 1] if index + 1 < len(starts) else start + _MAX_BLOCK
+        link = _TITLE_LINK.search(html, start, min(end, start + _MAX_BLOCK))
+        if link is None:
+            continue
+        title = html_lib.unescape(_TAGS.sub('', link.group(2))).strip()
+        if add(decode_bing_link(link.group(1)), title):
+            break
+
+    if not starts:
+        logger.debug("Aucun bloc b_algo dans la page Bing, extraction de tous les liens")
+        for match in _ANY_LINK.finditer(html):
+            if add(decode_bing_link(match.group(1))):
+                break
+
+    return results
+
+
+def extract_urls(html: str, limit: Optional[int] = None) -> List[str]:
+    """URLs des résultats naturels d'une page Bing, dans l'ordre de classement"""
+    return [result.url for result in parse_bing(html, limit)]
@@ -3,13 +3,14 @@ Module de vérification de la solvabilité des entreprises françaises
 Utilise plusieurs sources pour déterminer l'état d'une entreprise
 """
 
-import asyncio
 import aiohttp
 import logging
 from typing import Dict, Any, Optional
 from config import Config
 import urllib.parse
 from datetime import datetime, timedelta
+from .rate_limiter import get_rate_limiter
+from .http_client import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class SolvabilityChecker:
     def __init__(self):
         self.config = Config()
         self.session = None
+        self.rate_limiter = get_rate_limiter()
         
         # URLs des APIs pour vérifier la solvabilité
         self.apis = {
@@ -28,7 +30,7 @@ class SolvabilityChecker:
     async def get_session(self):
         """Crée ou retourne la session HTTP"""
         if not self.session:
-            self.session = aiohttp.ClientSession(
+            self.session = create_session(
                 timeout=aiohttp.ClientTimeout(total=self.config.TIMEOUT),
                 headers={'User-Agent': self.config.USER_AGENT}
             )
@@ -140,7 +142,9 @@ class SolvabilityChecker:
                 }
                 
                 try:
+                    await self.rate_limiter.acquire(self.apis['bodacc'])
                     async with session.get(self.apis['bodacc'], params=params) as response:
+                        self.rate_limiter.observe(self.apis['bodacc'], response)
                         if response.status == 200:
                             data = await response.json()
                             records = data.get('records', [])
@@ -172,8 +176,6 @@ class SolvabilityChecker:
                                     'latest_procedure': latest_procedure
                                 }
                         
-                        await asyncio.sleep(0.5)  # Respecter les limites de l'API
-                        
                 except Exception as e:
                     logger.warning(f"⚠️ Erreur BODACC pour {search_term}: {e}")
                     continue
@@ -205,7 +207,9 @@ class SolvabilityChecker:
                 }
                 
                 try:
+                    await self.rate_limiter.acquire(self.apis['entreprise_api'])
                     async with session.get(self.apis['entreprise_api'], params=params) as response:
+                        self.rate_limiter.observe(self.apis['entreprise_api'], response)
                         if response.status == 200:
                             data = await response.json()
                             results = data.get('results', [])
@@ -225,8 +229,6 @@ class SolvabilityChecker:
                                             'etat_administratif': etat
                                         }
                         
-                        await asyncio.sleep(0.5)
-                        
                 except Exception as e:
                     logger.warning(f"⚠️ Erreur statut entreprise pour {term}: {e}")
                     continue
@@ -256,7 +258,9 @@ class SolvabilityChecker:
                 }
                 
                 try:
+                    await self.rate_limiter.acquire(self.apis['infogreffe'])
                     async with session.get(self.apis['infogreffe'], params=params) as response:
+                        self.rate_limiter.observe(self.apis['infogreffe'], response)
                         if response.status == 200:
                             data = await response.json()
                             records = data.get('records', [])
@@ -282,8 +286,6 @@ class SolvabilityChecker:
                                     'alerts': alerts
                                 }
                         
-                        await asyncio.sleep(0.5)
-                        
                 except Exception as e:
                     logger.warning(f"⚠️ InfoGreffe non accessible pour {term}: {e}")
                     # Ne pas considérer comme une erreur bloquante
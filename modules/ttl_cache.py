@@ -0,0 +1,138 @@
+"""
+Cache persistant sur disque (SQLite) avec durée de vie par entrée
+Conserve aussi les résultats négatifs (avec une durée de vie propre),
+compte les hits/misses et borne la taille en évinçant les entrées les moins
+récemment utilisées
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_company_name(name: str) -> str:
+    """Normalise un nom d'entreprise pour servir de clé de cache
+
+    Minuscules, accents et ponctuation supprimés, espaces normalisés :
+    « Société Générale » et « SOCIETE  GENERALE. » donnent la même clé.
+    """
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r'[^a-z0-9]+', ' ', name.lower())
+    return name.strip()
+
+
+class PersistentTTLCache:
+    def __init__(self, path: str, table: str, ttl: float, negative_ttl: Optional[float] = None,
+                 max_entries: int = 10000):
+        """
+        path: fichier SQLite (créé si besoin, plusieurs caches peuvent le partager)
+        table: nom de la table propre à ce cache
+        ttl / negative_ttl: durées de vie en secondes des résultats positifs / négatifs
+        max_entries: au-delà, les entrées les moins récemment lues sont évincées
+        """
+        if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', table):
+            raise ValueError(f"Nom de table invalide: {table}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.table = table
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                negative INTEGER NOT NULL DEFAULT 0,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute(f'CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)')
+        self.db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la valeur en cache, ou None si absente ou expirée"""
+        now = time.time()
+        row = self.db.execute(
+            f'SELECT value, negative, expires_at FROM {self.table} WHERE key = ?', (key,)
+        ).fetchone()
+
+        if row is None or row[2] < now:
+            self.misses += 1
+            return None
+
+        self.db.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+        self.db.commit()
+        if row[1]:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, negative: bool = False, ttl: Optional[float] = None):
+        """Enregistre une valeur (sérialisable en JSON)"""
+        now = time.time()
+        if ttl is None:
+            ttl = self.negative_ttl if negative else self.ttl
+        self.db.execute(
+            f'INSERT OR REPLACE INTO {self.table} (key, value, negative, stored_at, expires_at, accessed_at) '
+            f'VALUES (?, ?, ?, ?, ?, ?)',
+            (key, json.dumps(value, ensure_ascii=False), int(negative), now, now + ttl, now)
+        )
+        self._evict(now)
+        self.db.commit()
+
+    def delete(self, key: str):
+        """Supprime une entrée"""
+        self.db.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+        self.db.commit()
+
+    def _evict(self, now: float):
+        self.db.execute(f'DELETE FROM {self.table} WHERE expires_at < ?', (now,))
+        count = self.db.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.db.execute(
+                f'DELETE FROM {self.table} WHERE key IN '
+                f'(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)', (excess,)
+            )
+            self.evictions += excess
+
+    def __len__(self) -> int:
+        return self.db.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def __bool__(self) -> bool:
+        # Un cache vide reste « vrai » : `if self.cache:` teste sa présence, pas son contenu
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs d'utilisation du cache depuis son ouverture"""
+        return {
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self)
+        }
+
+    def close(self):
+        self.db.close()
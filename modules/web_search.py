@@ -6,18 +6,56 @@ Utilise plusieurs méthodes et moteurs de recherche
 import aiohttp
 import asyncio
 import logging
+import os
 import random
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import urlparse
 from config import Config
-import difflib
+from .rate_limiter import get_rate_limiter
+from .http_client import create_session
+from .concurrency import first_by_priority
+from .dns_cache import get_dns_cache
+from .page_cache import PageCache
+from .relevance import RelevanceCheck
+from . import serp_parser
+from .name_variants import NameVariants, slugify
+from .domain_filter import default_filter, hostname
+from .ttl_cache import PersistentTTLCache
 
 logger = logging.getLogger(__name__)
 
 class WebSearcher:
-    def __init__(self):
+    def __init__(self, page_cache: Optional[PageCache] = None):
         self.config = Config()
         self.session = None
+        self.rate_limiter = get_rate_limiter()
+        self.dns = get_dns_cache()
+        # Pages partagées avec le CompanyScraper (une seule requête par URL)
+        self.page_cache = page_cache or PageCache(int(self.config.PAGE_CACHE_MAX_MB * 1024 * 1024),
+                                                max_page_bytes=self.config.PAGE_MAX_KB * 1024)
+        
+        # Résultats des moteurs de recherche gardés d'une exécution à l'autre
+        self.serp_cache = None
+        if self.config.SERP_CACHE_ENABLED:
+            self.serp_cache = PersistentTTLCache(
+                os.path.join(self.config.CACHE_DIR, 'serp_cache.sqlite'),
+                table='serp',
+                ttl=self.config.SERP_CACHE_TTL_DAYS * 86400,
+                negative_ttl=self.config.SERP_CACHE_NEGATIVE_TTL_DAYS * 86400,
+                max_entries=self.config.SERP_CACHE_MAX_ENTRIES
+            )
+        
+        # Domaines exclus des résultats (partagé par toutes les extractions)
+        self.domain_filter = default_filter()
+        
+        # Variantes du nom classées par vraisemblance
+        self.name_variants = NameVariants(self.config.NAME_VARIANTS_WORDLIST or None)
+        
+        # Stratégie gagnante par recherche (pour régler SEARCH_HEDGE_DELAY)
+        self.strategy_stats: Dict[str, Dict[str, float]] = {}
+        # Bing lancé en parallèle des URLs directes / gagnant avant leur fin
+        self.hedge_stats = {'started': 0, 'won': 0}
         
         # Configuration Google Custom Search (à ajouter dans config.py)
         self.google_api_key = getattr(self.config, 'GOOGLE_API_KEY', None)
@@ -44,7 +82,7 @@ class WebSearcher:
                 'Upgrade-Insecure-Requests': '1'
             }
             
-            self.session = aiohttp.ClientSession(
+            self.session = create_session(
                 timeout=aiohttp.ClientTimeout(total=30),
                 headers=headers
             )
@@ -57,53 +95,8 @@ class WebSearcher:
             self.session = None
     
     def _generate_name_variants(self, company_name: str) -> List[str]:
-        """Génère des variantes du nom d'entreprise pour la recherche"""
-        variants = [company_name]
-        
-        # Variantes courantes
-        name_lower = company_name.lower()
-        
-        # Supprimer les formes juridiques
-        legal_forms = ['sarl', 'sas', 'sa', 'eurl', 'sasu', 'sci', 'association', 'ass']
-        for form in legal_forms:
-            if form in name_lower:
-                variants.append(company_name.replace(form, '').replace(form.upper(), '').strip())
-        
-        # Acronymes -> mots complets (ex: ACOGEMAS -> ACO GEMAS)
-        if len(company_name) > 3 and company_name.isupper():
-            # Diviser l'acronyme en parties
-            for i in range(2, len(company_name)-1):
-                variant = company_name[:i] + ' ' + company_name[i:]
-                variants.append(variant)
-        
-        # Mots similaires phonétiquement
-        variants.extend(self._get_phonetic_variants(company_name))
-        
-        return list(set(variants))
-    
-    def _get_phonetic_variants(self, name: str) -> List[str]:
-        """Génère des variantes phonétiques communes"""
-        variants = []
-        
-        # Remplacements phonétiques courants
-        phonetic_replacements = {
-            'PH': 'F',
-            'C': 'K',
-            'QU': 'K',
-            'X': 'KS',
-            'Z': 'S',
-            'J': 'G',
-            'EMAS': 'EMAS',
-            'EMAT': 'EMAS',
-            'EGON': 'EGON',
-            'EGOMA': 'EGOMA'
-        }
-        
-        for old, new in phonetic_replacements.items():
-            if old in name.upper():
-                variants.append(name.upper().replace(old, new))
-        
-        return variants
+        """Variantes du nom les plus probables, une par domaine deviné (nom d'origine exclu)"""
+        return self.name_variants.top(company_name, self.config.NAME_VARIANTS_TOP_K)
     
     def _detect_organization_type(self, company_name: str) -> str:
         """Détecte le type d'organisation (entreprise, association, etc.)"""
@@ -130,49 +123,138 @@ class WebSearcher:
         Recherche optimisée du site web d'une entreprise
         Version accélérée : URL directe + Bing uniquement
         """
+        url, _ = await self.search_company_website_with_strategy(company_name)
+        return url
+    
+    async def search_company_website_with_strategy(self, company_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """Comme search_company_website, en indiquant la stratégie qui a trouvé le site
+        
+        Stratégies : 'direct', 'bing', 'variant_direct', 'variant_bing'
+        """
         logger.info(f"🔍 Recherche du site web pour: {company_name}")
+        started = time.monotonic()
         
-        # ÉTAPE 1: Test direct des URLs probables (le plus rapide)
+        # ÉTAPES 1-2: URL directe (la plus rapide), puis Bing ; en mode hedged,
+        # Bing démarre pendant que les URLs directes sont encore testées
         logger.info(f"🎯 Recherche du nom exact: {company_name}")
-        result = await self._try_direct_url_variants(company_name)
+        result, strategy = await self._search_direct_then_bing(company_name)
         if result:
-            return result
-        
-        # ÉTAPE 2: Bing uniquement (plus rapide que DuckDuckGo)
-        result = await self._search_via_bing(company_name)
-        if result:
-            return result
+            self._record_win(strategy, started)
+            return result, strategy
         
         # ÉTAPE 3: Test des variantes du nom (URL directe + Bing)
         logger.info(f"⚠️ Nom exact non trouvé, test des variantes...")
         name_variants = self._generate_name_variants(company_name)
-        name_variants = [v for v in name_variants if v != company_name]
         
         if name_variants:
-            logger.info(f"🔄 Variantes à tester: {name_variants[:2]}...")
+            logger.info(f"🔄 Variantes à tester: {name_variants}")
             
-            # Tester seulement les 2 premières variantes
-            for i, variant in enumerate(name_variants[:2]):
+            # Seulement les variantes les plus probables (NAME_VARIANTS_TOP_K)
+            for i, variant in enumerate(name_variants):
                 logger.info(f"🔍 Test variante {i+1}: {variant}")
                 
-                # Test direct URL uniquement pour les variantes
-                result = await self._try_direct_url_variants(variant)
+                result, strategy = await self._search_direct_then_bing(variant)
                 if result:
-                    return result
-                
-                # Test Bing pour les variantes
-                result = await self._search_via_bing(variant)
-                if result:
-                    return result
-                
-                # Pause minimale entre les variantes
-                await asyncio.sleep(0.5)
+                    self._record_win(f"variant_{strategy}", started)
+                    return result, f"variant_{strategy}"
         
+        self._record_win(None, started)
         logger.warning(f"⚠️ Aucun site trouvé pour {company_name}")
-        return None
+        return None, None
+    
+    async def _search_direct_then_bing(self, company_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """URL directe puis Bing pour un nom ; retourne (url, 'direct' | 'bing')
+        
+        Si les URLs directes n'ont pas abouti après SEARCH_HEDGE_DELAY secondes,
+        Bing est lancé en parallèle. Une URL directe ou un résultat Bing sur le
+        domaine exact du nom l'emporte dès qu'il est validé ; un autre résultat
+        Bing n'est retenu qu'une fois les URLs directes écartées.
+        """
+        direct = asyncio.create_task(self._try_direct_url_variants(company_name))
+        bing = None
+        try:
+            delay = self.config.SEARCH_HEDGE_DELAY if self.config.SEARCH_HEDGE_ENABLED else None
+            await asyncio.wait({direct}, timeout=delay)
+            if direct.done():
+                result = self._task_result(direct)
+                if result:
+                    return result, 'direct'
+                result = await self._search_via_bing(company_name)
+                return (result, 'bing') if result else (None, None)
+            
+            # Les URLs directes tardent : Bing démarre en parallèle
+            self.hedge_stats['started'] += 1
+            logger.info(f"⏱️ URLs directes en cours après {delay}s, lancement de Bing en parallèle")
+            bing = asyncio.create_task(self._search_via_bing(company_name))
+            bing_result = None
+            pending = {direct, bing}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if direct in done:
+                    result = self._task_result(direct)
+                    if result:
+                        return result, 'direct'
+                    if bing_result:
+                        return bing_result, 'bing'
+                if bing in done:
+                    bing_result = self._task_result(bing)
+                    if bing_result and (direct.done() or self._is_exact_domain(bing_result, company_name)):
+                        if not direct.done():
+                            self.hedge_stats['won'] += 1
+                        return bing_result, 'bing'
+            return None, None
+        finally:
+            for task in (direct, bing):
+                if task is not None and not task.done():
+                    task.cancel()
+            await asyncio.gather(*(task for task in (direct, bing) if task is not None), return_exceptions=True)
+    
+    @staticmethod
+    def _task_result(task: asyncio.Task) -> Optional[str]:
+        if task.cancelled() or task.exception() is not None:
+            if not task.cancelled():
+                logger.debug(f"Recherche en erreur: {str(task.exception())}")
+            return None
+        return task.result()
+    
+    def _is_exact_domain(self, url: str, company_name: str) -> bool:
+        """Le domaine de l'URL est-il exactement le nom de l'entreprise (ex: acme.fr pour ACME) ?"""
+        clean_name = self._clean_name_for_url(company_name)
+        host = (urlparse(url).hostname or '').lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        label = host.split('.', 1)[0]
+        return bool(clean_name) and label in (clean_name, clean_name.replace('-', ''))
+    
+    def _record_win(self, strategy: Optional[str], started: float):
+        """Compte la stratégie gagnante et le temps mis pour trouver le site"""
+        elapsed = time.monotonic() - started
+        stats = self.strategy_stats.setdefault(strategy or 'none', {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Stratégies gagnantes (nombre, temps moyen et max), lancements anticipés de Bing, domaines écartés"""
+        return {
+            'strategies': {
+                strategy: {
+                    'count': stats['count'],
+                    'avg_seconds': round(stats['seconds'] / stats['count'], 2),
+                    'max_seconds': round(stats['max_seconds'], 2)
+                }
+                for strategy, stats in self.strategy_stats.items()
+            },
+            'hedge': dict(self.hedge_stats),
+            'rejected_domains': self.domain_filter.stats()
+        }
     
     async def _try_direct_url_variants(self, company_name: str) -> Optional[str]:
-        """Teste directement des variantes d'URL probables"""
+        """Teste directement des variantes d'URL probables
+        
+        Les variantes sont testées en parallèle ; la première pertinente dans
+        l'ordre de la liste (.fr avant .com) l'emporte et les autres sont annulées.
+        """
         logger.info(f"🎯 Test des variantes d'URL directes pour: {company_name}")
         
         # Nettoyer le nom pour créer des URLs
@@ -188,64 +270,69 @@ class WebSearcher:
             f"https://www.{clean_name}.org"
         ]
         
-        for url in url_variants:
-            try:
-                session = await self.get_session()
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=3)) as response:
-                    if response.status == 200:
-                        # Vérification rapide de pertinence
-                        if await self._verify_website_relevance_fast(url, company_name):
-                            logger.info(f"✅ URL directe trouvée: {url}")
-                            return url
-                        else:
-                            logger.info(f"❌ URL trouvée mais non pertinente: {url}")
-            except:
-                continue
+        async def probe(url):
+            # Vérification rapide de pertinence pendant la lecture de la page
+            check = self._relevance_check(url, company_name)
+            session = await self.get_session()
+            page = await self.page_cache.fetch(session, url, timeout=aiohttp.ClientTimeout(total=3), check=check)
+            if not page or page.status != 200:
+                return None
             
-            # Pause minimale
-            await asyncio.sleep(0.2)
+            if check.decision:
+                return url
+            logger.info(f"❌ URL trouvée mais non pertinente: {url}")
+            return None
+        
+        # Les domaines inexistants sont écartés par DNS, sans tentative de connexion
+        url_variants = await self.dns.filter_urls(url_variants)
+        result = await first_by_priority(url_variants, probe, concurrency=self.config.DIRECT_URL_CONCURRENCY)
+        if result:
+            logger.info(f"✅ URL directe trouvée: {result}")
+            return result
         
         logger.info(f"❌ Aucune URL directe trouvée pour: {company_name}")
         return None
     
     def _clean_name_for_url(self, company_name: str) -> str:
         """Nettoie un nom d'entreprise pour créer une URL"""
-        # Supprimer les mots courants
-        words_to_remove = [
-            'sarl', 'sas', 'sa', 'eurl', 'sasu', 'sci',
-            'société', 'entreprise', 'ets', 'etablissements',
-            'groupe', 'compagnie', 'cie', 'et', 'de', 'la', 'le', 'les',
-            'du', 'des', 'au', 'aux', 'pour', 'avec', 'sans'
-        ]
-        
-        name = company_name.lower()
-        
-        # Supprimer les mots courants
-        for word in words_to_remove:
-            name = name.replace(f' {word} ', ' ')
-            name = name.replace(f' {word}', '')
-            name = name.replace(f'{word} ', '')
-        
-        # Nettoyer les caractères spéciaux
-        import re
-        name = re.sub(r'[^a-zA-Z0-9\s-]', '', name)
-        
-        # Remplacer espaces par tirets
-        name = re.sub(r'\s+', '-', name.strip())
+        return slugify(company_name)
+    
+    async def _search_via_bing(self, company_name: str) -> Optional[str]:
+        """Recherche via Bing (optimisée pour la vitesse)
         
-        # Supprimer les tirets multiples
-        name = re.sub(r'-+', '-', name)
+        Les URLs extraites sont gardées en cache disque par (moteur, requête, langue) :
+        Bing n'est réinterrogé que pour un nom inconnu, une entrée expirée ou des
+        candidats en cache qui ne passent plus la validation. Un nom sans aucun
+        candidat valide est gardé en cache négatif (liste vide).
+        """
+        logger.info(f"🔍 Recherche Bing pour: {company_name}")
+        query = f'"{company_name}" site officiel'
+        cache_key = f"bing|fr-FR|{query}"
+        
+        if self.serp_cache:
+            urls = self.serp_cache.get(cache_key)
+            if urls is not None:
+                logger.info(f"💾 Résultats Bing en cache pour {company_name} ({len(urls)} URLs)")
+                result = await self._pick_bing_result(urls, company_name)
+                if result or not urls:
+                    return result
+                # Candidats en cache périmés : nouvelle recherche
+                self.serp_cache.delete(cache_key)
         
-        return name.strip('-')
+        urls = await self._fetch_bing_results(query)
+        if urls is None:
+            return None
+        result = await self._pick_bing_result(urls, company_name)
+        if self.serp_cache:
+            # Aucun candidat valide : entrée vide (TTL négatif), pas de nouvelle
+            # recherche Bing pour ce nom avant son expiration
+            self.serp_cache.set(cache_key, urls[:10] if result else [], negative=not result)
+        return result
     
-    async def _search_via_bing(self, company_name: str) -> Optional[str]:
-        """Recherche via Bing (optimisée pour la vitesse)"""
+    async def _fetch_bing_results(self, query: str) -> Optional[List[str]]:
+        """Interroge Bing et retourne les URLs des résultats (None en cas d'erreur)"""
         try:
-            logger.info(f"🔍 Recherche Bing pour: {company_name}")
             session = await self.get_session()
-            
-            # Construire la requête
-            query = f'"{company_name}" site officiel'
             url = f"https://www.bing.com/search"
             
             params = {
@@ -254,47 +341,49 @@ class WebSearcher:
                 'cc': 'FR'
             }
             
-            # Délai minimal pour éviter la détection
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            # Débit contrôlé par le limiteur partagé (évite la détection et les 429)
+            await self.rate_limiter.acquire(url)
             
             async with session.get(url, params=params) as response:
+                self.rate_limiter.observe(url, response)
                 if response.status == 200:
                     html = await response.text()
                     
                     # Parser les résultats Bing
-                    urls = self._extract_urls_from_bing_html(html)
-                    
-                    for url in urls[:5]:  # Tester les 5 premiers
-                        if self._is_relevant_website(url, "", company_name):
-                            if await self._test_website_access(url):
-                                logger.info(f"✅ Site trouvé via Bing: {url}")
-                                return url
-                    
-                    logger.info(f"❌ Aucun site pertinent trouvé via Bing pour {company_name}")
-                    return None
+                    return self._extract_urls_from_bing_html(html)
                 else:
                     logger.error(f"❌ Erreur Bing: {response.status}")
                     return None
                     
         except Exception as e:
-            logger.error(f"❌ Erreur recherche Bing pour {company_name}: {str(e)}")
+            logger.error(f"❌ Erreur recherche Bing pour {query}: {str(e)}")
             return None
     
-    def _extract_urls_from_bing_html(self, html: str) -> List[str]:
-        """Extrait les URLs des résultats Bing"""
-        from bs4 import BeautifulSoup
-        import re
+    async def _pick_bing_result(self, urls: List[str], company_name: str) -> Optional[str]:
+        """Premier résultat Bing pertinent et accessible
         
-        soup = BeautifulSoup(html, 'html.parser')
-        urls = []
+        Les 5 premiers résultats sont testés en parallèle ; le mieux classé qui
+        répond l'emporte et les autres tests sont annulés. La page téléchargée
+        reste dans le cache de pages pour les étapes suivantes.
+        """
+        # Tester les 5 premiers (domaines pertinents et existants)
+        candidates = [u for u in urls[:5] if self._is_relevant_website(u, "", company_name)]
+        candidates = await self.dns.filter_urls(candidates)
         
-        # Chercher les liens dans les résultats Bing
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            if href and href.startswith('http') and 'bing.com' not in href and 'microsoft.com' not in href:
-                urls.append(href)
+        async def validate(url):
+            return url if await self._test_website_access(url) else None
         
-        return urls
+        result = await first_by_priority(candidates, validate, concurrency=self.config.BING_CANDIDATE_CONCURRENCY)
+        if result:
+            logger.info(f"✅ Site trouvé via Bing: {result}")
+            return result
+        
+        logger.info(f"❌ Aucun site pertinent trouvé via Bing pour {company_name}")
+        return None
+    
+    def _extract_urls_from_bing_html(self, html: str) -> List[str]:
+        """Extrait les URLs des résultats naturels Bing (classées, un résultat par domaine)"""
+        return serp_parser.extract_urls(html)
     
     async def _search_via_duckduckgo_improved(self, company_name: str) -> Optional[str]:
         """Recherche via DuckDuckGo avec gestion améliorée des erreurs et proxies"""
@@ -378,97 +467,9 @@ class WebSearcher:
         # Pour l'instant, on retourne None (à implémenter si besoin)
         return None
     
-    async def _verify_website_relevance_fast(self, url: str, company_name: str) -> bool:
-        """Vérification rapide de pertinence (version optimisée)"""
-        try:
-            session = await self.get_session()
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    html_lower = html.lower()
-                    
-                    # Vérification rapide : nom de l'entreprise + indicateurs français
-                    company_words = [word.lower() for word in company_name.split() if len(word) > 2]
-                    company_matches = sum(1 for word in company_words if word in html_lower)
-                    
-                    french_indicators = ['france', 'français', 'fr', 'siret', 'siren', 'tva']
-                    french_score = sum(1 for indicator in french_indicators if indicator in html_lower)
-                    
-                    # Validation rapide
-                    is_relevant = (
-                        company_matches >= len(company_words) * 0.3 and  # Au moins 30% des mots
-                        french_score >= 1 and  # Au moins un indicateur français
-                        '.fr' in url  # Domaine français
-                    )
-                    
-                    return is_relevant
-                else:
-                    return False
-        except Exception as e:
-            logger.error(f"❌ Erreur validation rapide {url}: {str(e)}")
-            return False
-    
-    async def _verify_website_relevance(self, url: str, company_name: str) -> bool:
-        """Vérifie si un site web contient bien des informations sur l'entreprise française"""
-        try:
-            session = await self.get_session()
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    html_lower = html.lower()
-                    
-                    # 1. Vérifier que c'est un site français
-                    french_indicators = [
-                        'france', 'français', 'francais', 'fr', 
-                        'mentions légales', 'mentions legales',
-                        'siret', 'siren', 'tva', 'intracom',
-                        'adresse', 'téléphone', 'telephone'
-                    ]
-                    
-                    french_score = sum(1 for indicator in french_indicators if indicator in html_lower)
-                    
-                    # 2. Vérifier la présence du nom de l'entreprise
-                    company_words = [word.lower() for word in company_name.split() if len(word) > 2]
-                    company_matches = sum(1 for word in company_words if word in html_lower)
-                    
-                    # 3. Vérifier des éléments commerciaux français
-                    business_indicators = [
-                        'contact', 'services', 'produits', 'société', 'entreprise',
-                        'accueil', 'à propos', 'qui sommes-nous', 'notre équipe'
-                    ]
-                    
-                    business_score = sum(1 for indicator in business_indicators if indicator in html_lower)
-                    
-                    # 4. Exclure les sites étrangers évidents
-                    foreign_indicators = [
-                        'united states', 'usa', 'america', 'uk', 'england',
-                        'germany', 'deutschland', 'spain', 'espana', 'italy'
-                    ]
-                    
-                    has_foreign = any(indicator in html_lower for indicator in foreign_indicators)
-                    
-                    # 5. Vérifier l'extension du domaine
-                    domain_score = 2 if '.fr' in url else (1 if '.com' in url else 0)
-                    
-                    # Calcul du score de pertinence
-                    total_score = french_score + (company_matches * 2) + business_score + domain_score
-                    
-                    # Conditions pour valider le site
-                    is_relevant = (
-                        total_score >= 5 and  # Score minimum
-                        company_matches >= len(company_words) * 0.5 and  # Au moins 50% des mots de l'entreprise
-                        not has_foreign and  # Pas d'indicateurs étrangers
-                        french_score >= 1  # Au moins un indicateur français
-                    )
-                    
-                    logger.info(f"🔍 Pertinence {url}: score={total_score}, entreprise={company_matches}/{len(company_words)}, français={french_score}, étranger={has_foreign} → {'✅' if is_relevant else '❌'}")
-                    
-                    return is_relevant
-                else:
-                    return False
-        except Exception as e:
-            logger.error(f"❌ Erreur validation pertinence {url}: {str(e)}")
-            return False
+    def _relevance_check(self, url: str, company_name: str, strict: bool = False) -> RelevanceCheck:
+        return RelevanceCheck(url, company_name, strict=strict, max_bytes=self.config.RELEVANCE_MAX_KB * 1024,
+                              backend=self.config.KEYWORD_BACKEND)
     
     async def _search_via_google(self, company_name: str) -> Optional[str]:
         """Recherche via Google Custom Search API"""
@@ -532,35 +533,17 @@ class WebSearcher:
     
     def _is_relevant_website(self, url: str, title: str, company_name: str) -> bool:
         """Vérifie si un site web est pertinent pour l'entreprise (version rapide)"""
-        # Filtrer les sites non pertinents
-        blacklist = [
-            'facebook.com', 'linkedin.com', 'twitter.com', 'instagram.com',
-            'youtube.com', 'google.com', 'wikipedia.org', 'pages-jaunes.fr',
-            'societe.com', 'verif.com', 'infogreffe.fr', 'company.com',
-            'glassdoor.com', 'indeed.com', 'jobijoba.com', 'monster.fr'
-        ]
-        
-        # Exclure les domaines étrangers évidents
-        foreign_domains = [
-            '.us', '.uk', '.de', '.es', '.it', '.ca', '.au', '.be', '.nl'
-        ]
+        # Annuaires, réseaux sociaux et domaines étrangers (d'après le nom d'hôte)
+        if not self.domain_filter.allows(url):
+            return False
         
         url_lower = url.lower()
         
-        # Vérifier blacklist
-        for blocked in blacklist:
-            if blocked in url_lower:
-                return False
-        
-        # Vérifier domaines étrangers
-        for foreign in foreign_domains:
-            if foreign in url_lower:
-                return False
-        
         # Privilégier les domaines français
-        if '.fr' in url_lower:
+        tld = hostname(url).rsplit('.', 1)[-1]
+        if tld == 'fr':
             preference_bonus = 2
-        elif '.com' in url_lower:
+        elif tld == 'com':
             preference_bonus = 1
         else:
             preference_bonus = 0
@@ -589,13 +572,10 @@ class WebSearcher:
         return matches >= len(company_words) * required_match_ratio
     
     async def _test_website_access(self, url: str) -> bool:
-        """Teste si un site web est accessible"""
-        try:
-            session = await self.get_session()
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                return response.status == 200
-        except:
-            return False
+        """Teste si un site web est accessible (la page reste en cache pour le scrapping)"""
+        session = await self.get_session()
+        page = await self.page_cache.fetch(session, url, timeout=aiohttp.ClientTimeout(total=10))
+        return bool(page) and page.status == 200
     
     async def _search_via_alternative_engines(self, company_name: str) -> Optional[str]:
         """Recherche via des moteurs alternatifs quand les principaux échouent"""
@@ -657,18 +637,8 @@ class WebSearcher:
             matches = re.findall(pattern, html, re.IGNORECASE)
             urls.extend(matches)
         
-        # Nettoyer et filtrer les URLs
-        clean_urls = []
-        for url in urls:
-            # Supprimer les URLs internes aux moteurs de recherche
-            skip_domains = [
-                'google.com', 'bing.com', 'duckduckgo.com', 'yahoo.com',
-                'startpage.com', 'searx.be', 'yandex.com', 'wikipedia.org',
-                'facebook.com', 'twitter.com', 'linkedin.com', 'youtube.com'
-            ]
-            
-            if not any(domain in url.lower() for domain in skip_domains):
-                if url.startswith(('http://', 'https://')):
-                    clean_urls.append(url)
+        # Supprimer les URLs internes aux moteurs de recherche, annuaires et réseaux sociaux
+        urls = [url for url in urls if url.startswith(('http://', 'https://'))]
+        clean_urls = self.domain_filter.filter(dict.fromkeys(urls))
         
-        return list(set(clean_urls))[:10]  # Retourner max 10 URLs uniques 
\ No newline at end of file
+        return clean_urls[:10]  # Retourner max 10 URLs uniques 
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Tampon d'écritures différées (write-behind)
+Les mises à jour sont accumulées puis envoyées par lots : dès qu'un lot est
+plein, ou après un court délai pour un lot incomplet, et à la fermeture.
+Chaque appelant attend le résultat de son propre enregistrement
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# send_batch([(clé, champs), ...]) -> {clé: succès}
+SendBatch = Callable[[List[Tuple[str, Dict[str, Any]]]], Awaitable[Dict[str, bool]]]
+
+
+class WriteBehindBuffer:
+    def __init__(self, send_batch: SendBatch, batch_size: int = 10, delay: float = 0.5):
+        self.send_batch = send_batch
+        self.batch_size = max(1, batch_size)
+        self.delay = delay
+        # clé -> (champs fusionnés, futures des appelants), dans l'ordre d'arrivée
+        self.pending: Dict[str, Tuple[Dict[str, Any], List[asyncio.Future]]] = {}
+        self.batches = 0
+        self.records = 0
+        self.failures = 0
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks = set()
+
+    async def submit(self, key: str, fields: Dict[str, Any]) -> bool:
+        """Ajoute une mise à jour au tampon et attend son envoi"""
+        future = asyncio.get_running_loop().create_future()
+        if key in self.pending:
+            # Deux mises à jour du même enregistrement partent dans la même requête
+            self.pending[key][0].update(fields)
+            self.pending[key][1].append(future)
+        else:
+            self.pending[key] = (dict(fields), [future])
+
+        if len(self.pending) >= self.batch_size:
+            self._spawn(self._send(self._take()))
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_after_delay())
+        return await future
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _take(self) -> List[Tuple[str, Dict[str, Any], List[asyncio.Future]]]:
+        keys = list(self.pending)[:self.batch_size]
+        return [(key, *self.pending.pop(key)) for key in keys]
+
+    async def _flush_after_delay(self):
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._timer = None
+        await self.flush()
+
+    async def _send(self, batch):
+        try:
+            results = await self.send_batch([(key, fields) for key, fields, _ in batch])
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'envoi d'un lot d'écritures: {str(e)}")
+            results = {}
+
+        self.batches += 1
+        self.records += len(batch)
+        for key, _, futures in batch:
+            success = bool(results.get(key))
+            if not success:
+                self.failures += 1
+            for future in futures:
+                if not future.done():
+                    future.set_result(success)
+
+    async def flush(self):
+        """Envoie tout ce qui est en attente"""
+        while self.pending:
+            await self._send(self._take())
+
+    async def close(self):
+        """Vide le tampon et attend les envois en cours (arrêt)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        current = asyncio.current_task()
+        in_flight = [task for task in self._tasks if task is not current]
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {'batches': self.batches, 'records': self.records, 'failures': self.failures}
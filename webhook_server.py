@@ -15,6 +15,7 @@ from modules.airtable_client import AirtableClient
 from modules.company_scraper import CompanyScraper
 from modules.api_legal_scraper import APILegalScraper
 from modules.solvability_checker import SolvabilityChecker
+from modules.http_client import close_http_pool
 
 # Configuration du logging
 logging.basicConfig(
@@ -151,6 +152,7 @@ async def main():
         logger.info("🛑 Arrêt du serveur webhook")
     finally:
         await runner.cleanup()
+        await close_http_pool()
 
 if __name__ == '__main__':
     asyncio.run(main())
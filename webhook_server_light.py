@@ -14,6 +14,7 @@ from config import Config
 from modules.airtable_client import AirtableClient
 from modules.api_legal_scraper import APILegalScraper
 from modules.solvability_checker import SolvabilityChecker
+from modules.http_client import close_http_pool, create_session
 
 # Configuration du logging
 logging.basicConfig(
@@ -146,7 +147,7 @@ class WebhookServerLight:
             # Envoyer vers chaque webhook
             for i, url in enumerate(webhook_urls, 1):
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with create_session() as session:
                         async with session.post(url, json=notification_data, timeout=aiohttp.ClientTimeout(total=10)) as response:
                             if response.status == 200:
                                 logger.info(f"✅ Notification {i} envoyée avec succès vers Make.com")
@@ -199,6 +200,7 @@ async def main():
         logger.info("🛑 Arrêt du serveur webhook léger")
     finally:
         await runner.cleanup()
+        await close_http_pool()
 
 if __name__ == '__main__':
     asyncio.run(main())